@@ -7,8 +7,9 @@ import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parents[1]))
 
-from src.generator.cli import build_graph, generate_velocities
-from src.heuristics.greedy import run_greedy_heuristic
+from src.generator.cli import build_edge_list, generate_velocities
+from src.heuristics.greedy import run_greedy_arrays
+from src.heuristics.objectives import evaluate_solutions
 
 DELTA_V = 5.0
 
@@ -18,15 +19,16 @@ def run_calibration_scenario(nodes, density, cv_vel, seed):
     print(f"\n--- Cenário: Nós={nodes}, Densidade={density}, CV={cv_vel} ---")
     rng = np.random.default_rng(seed)
 
-    graph, actual_density = build_graph(rng, num_nodes=nodes, requested_density=density)
+    edges = build_edge_list(rng, nodes, density, verbose=False)
+    velocities = generate_velocities(rng, nodes, cv_vel)
 
-    actual_nodes = graph.number_of_nodes()
-    velocities = generate_velocities(rng, actual_nodes, cv_vel)
-
-    for i, node in enumerate(graph.nodes()):
-        graph.nodes[node]["velocity"] = velocities[i]
-
-    metrics = run_greedy_heuristic(graph, DELTA_V)
+    labels = run_greedy_arrays(nodes, edges, velocities, DELTA_V, rng.permutation(nodes))
+    ev = evaluate_solutions(labels, velocities, delta_v=DELTA_V)
+    metrics = {
+        "fo1": float(-ev.f1[0]),
+        "num_clusters": int(ev.num_clusters[0]),
+        "avg_std_dev": float(ev.avg_std_dev[0]),
+    }
 
     print(f"FO1: {metrics['fo1']:.2f}")
     print(f"Número de Clusters: {metrics['num_clusters']}")
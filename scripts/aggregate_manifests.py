@@ -10,6 +10,8 @@ import json
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 # Colunas padrão (você pode ampliar sem quebrar nada)
 FIELDS = [
     "timestamp",
@@ -23,6 +25,7 @@ FIELDS = [
     "returncode",
     "elapsed_ms",
     "metrics.cutsize_best",
+    "metrics.modularity",
     "metrics.imbalance_raw",
     "paths.workdir",
     "paths.graph_path",
@@ -51,6 +54,46 @@ def _get(d: dict[str, Any], dotted: str) -> Any:
     return cur
 
 
+# Colunas recomputadas a partir dos arquivos de partição (apenas com --instance)
+EVAL_FIELDS = ["eval.cutsize", "eval.max_imbalance", "eval.feasible", "eval.modularity"]
+
+
+def _attach_partition_eval(rows: list[dict[str, Any]], instance_path: Path) -> int:
+    """Recalcula cutsize/balanceamento/modularidade de todas as partições num passe vetorizado.
+
+    Agrupa as linhas por (k, β), empilha os rótulos em uma matriz (R, n) e chama
+    `evaluate_partitions` uma vez por grupo. Retorna quantas linhas foram avaliadas.
+    """
+    from generator.modularity import modularity
+    from hpc_framework.runner import evaluate_partitions, load_instance
+    from hpc_framework.solvers.common import read_partition_labels
+
+    inst = load_instance(instance_path)
+    n, edges = inst.n, inst.edges
+    groups: dict[tuple[int, float], list[tuple[dict[str, Any], np.ndarray]]] = {}
+    for row in rows:
+        part = row.get("paths.part_path")
+        k, beta = row.get("k"), row.get("beta")
+        if not part or k is None or beta is None or not Path(part).exists():
+            continue
+        labels = read_partition_labels(Path(part))
+        if labels.size != n:
+            print(f"[WARN] {part}: {labels.size} labels, expected {n}")
+            continue
+        groups.setdefault((int(k), float(beta)), []).append((row, labels))
+
+    done = 0
+    for (k, beta), items in groups.items():
+        res = evaluate_partitions(edges, np.stack([lab for _, lab in items]), k=k, beta=beta)
+        for i, (row, _) in enumerate(items):
+            row["eval.cutsize"] = int(res.cutsize[i])
+            row["eval.max_imbalance"] = float(res.max_imbalance[i])
+            row["eval.feasible"] = bool(res.feasible[i])
+            row["eval.modularity"] = modularity(edges, items[i][1])
+        done += len(items)
+    return done
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Aggregate v1 manifests into CSV")
     ap.add_argument(
@@ -59,6 +102,11 @@ def main() -> None:
     ap.add_argument("--out", required=True, help="Output CSV path")
     # opcional: permitir adicionar colunas extras via linha de comando
     ap.add_argument("--extra-fields", default="", help="Comma-separated dotted fields to append")
+    ap.add_argument(
+        "--instance",
+        default=None,
+        help="Instance (.json/.json.gz/.npyd) to recompute cutsize/balance/modularity from part files",
+    )
     args = ap.parse_args()
 
     files = sorted(glob.glob(args.in_glob))
@@ -82,6 +130,11 @@ def main() -> None:
         row["_file"] = f
         rows.append(row)
 
+    if args.instance:
+        fields += [c for c in EVAL_FIELDS if c not in fields]
+        done = _attach_partition_eval(rows, Path(args.instance))
+        print(f"Evaluated {done} partitions against {args.instance}")
+
     outp = Path(args.out)
     outp.parent.mkdir(parents=True, exist_ok=True)
     with outp.open("w", encoding="utf-8", newline="") as fo:
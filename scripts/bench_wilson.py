@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""Benchmark de escala do Wilson UST (`generator.cli.random_tree_wilson`) até n=10^6."""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from generator.cli import random_tree_wilson
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Wilson UST scaling benchmark on K_n")
+    ap.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10**3, 10**4, 10**5, 10**6],
+        help="Valores de n a medir",
+    )
+    ap.add_argument("--repeats", type=int, default=3, help="Repetições por n (melhor tempo)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    print(f"{'n':>10} {'best_s':>9} {'us/node':>9} {'slope':>6}")
+    prev: tuple[int, float] | None = None
+    for n in args.sizes:
+        best = math.inf
+        for r in range(args.repeats):
+            rng = np.random.default_rng([args.seed, r])
+            t0 = time.perf_counter()
+            edges = random_tree_wilson(rng, n)
+            best = min(best, time.perf_counter() - t0)
+        assert edges.shape == (max(n - 1, 0), 2)
+        # expoente empírico entre tamanhos consecutivos (≈1 ⇒ linear)
+        slope = math.log(best / prev[1]) / math.log(n / prev[0]) if prev else float("nan")
+        print(f"{n:>10} {best:>9.3f} {1e6 * best / n:>9.2f} {slope:>6.2f}")
+        prev = (n, best)
+
+
+if __name__ == "__main__":
+    main()
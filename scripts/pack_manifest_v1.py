@@ -80,6 +80,7 @@ def main():
         "stderr": obj.get("stderr", ""),
         "metrics": {
             "cutsize_best": obj.get("cutsize_best"),
+            "modularity": obj.get("modularity"),
             "n_nodes": None,  # pode preencher no futuro
             "balance_tolerance": beta,
             "imbalance_raw": imb_raw,
@@ -35,12 +35,24 @@ def main() -> None:
         default=Path("results/raw"),
         help="Diretório para salvar os resultados brutos",
     )
+    parser.add_argument(
+        "--anytime",
+        action="store_true",
+        help=(
+            "Uma execução por (instância, heurística, seed) no maior orçamento, com checkpoints "
+            "nos menores; os resultados de todos os orçamentos saem dela"
+        ),
+    )
     args = parser.parse_args()
 
     # Carrega o plano experimental
     with open(args.plan) as f:
         plan = yaml.safe_load(f)["parameters"]
 
+    if args.anytime:
+        run_anytime(plan, args.results_dir)
+        return
+
     # Gera todas as combinações de experimentos
     all_combinations = list(
         itertools.product(plan["instances"], plan["heuristics"], plan["budgets"], plan["seeds"])
@@ -86,5 +98,53 @@ def main() -> None:
     logging.info("Pipeline concluído.")
 
 
+# Heurísticas com CLI de orçamentos aninhados (`--nfe-levels`)
+ANYTIME_HEURISTICS = ("sa", "ga")
+
+
+def run_anytime(plan: dict, results_dir: Path) -> None:
+    """Orçamentos aninhados: uma execução no maior orçamento por (instância, heurística, seed).
+
+    Chama `python -m heuristics.{sa,ga} --nfe-levels ...`, que grava um checkpoint ao cruzar
+    cada orçamento menor e materializa os resultados de cada um em
+    `<instância>_<heurística>_s<seed>/nfe<orçamento>/`. Com E ∈ {1e4, 5e4, 1e5, 2e5}
+    (protocolo §4.3), o custo cai de 3,6e5 para 2e5 avaliações por seed (~44%).
+    """
+    levels = sorted({int(b) for b in plan["budgets"]})
+    heuristics = [h for h in plan["heuristics"] if h in ANYTIME_HEURISTICS]
+    skipped = sorted(set(plan["heuristics"]) - set(heuristics))
+    if skipped:
+        logging.warning(f"Sem suporte a orçamentos aninhados (ignoradas): {skipped}")
+    groups = list(itertools.product(plan["instances"], heuristics, plan["seeds"]))
+    logging.info(
+        f"Plano carregado (anytime). {len(groups)} execuções cobrem "
+        f"{len(groups) * len(levels)} resultados."
+    )
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    for instance, heuristic, seed in tqdm(groups, desc="Progresso do Pipeline"):
+        instance_name = Path(instance).stem
+        run_dir = f"{instance_name}_{heuristic}_s{seed}"
+        budget_dirs = {b: results_dir / run_dir / f"nfe{b}" for b in levels}
+        missing = [b for b, d in budget_dirs.items() if not (d.is_dir() and any(d.glob("*.json")))]
+        if not missing:
+            logging.info(f"Resultados de {run_dir} já existem para todos os orçamentos. Pulando.")
+            continue
+
+        logging.info(f"Executando: {run_dir} (orçamentos {levels})")
+        params = {
+            "instance_path": f"data/instances/synthetic/{instance}",
+            "heuristic": heuristic,
+            "budget": levels[-1],
+            "nfe_levels": levels,
+            "seed": seed,
+            "out_dir": f"results/raw/{run_dir}",  # grava nfe<orçamento>/ para cada nível
+        }
+        if not execute_remote_experiment(params):
+            logging.error(f"A execução de {run_dir} falhou. Verifique os logs.")
+
+    logging.info("Pipeline concluído.")
+
+
 if __name__ == "__main__":
     main()
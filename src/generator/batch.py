@@ -0,0 +1,234 @@
+"""Geração em lote de instâncias a partir do manifesto YAML (pool de processos).
+
+Substitui o laço de `scripts/master_pipeline.py` que chamava um interpretador novo por
+instância: aqui o pool usa `forkserver` com `generator.cli` pré-carregado, então cada
+instância roda num processo próprio (pico de RSS isolado e medido) sem repagar a
+importação de NumPy/jsonschema.
+
+Sementes: instâncias com `params.seed` usam `SeedSequence(seed)` — o mesmo fluxo de
+`instance-generator --seed`; as demais recebem filhos independentes de
+`SeedSequence(<seed do manifesto>).spawn(...)`, indexados pela posição no manifesto; o
+cabeçalho delas grava `seed` (entropia da mestre) e `seed_spawn_key` para reprodução.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from generator import cli as gen_cli
+
+SUMMARY_COLUMNS = ("filename", "status", "nodes", "edges", "mode", "seconds", "peak_rss_mb")
+
+
+@dataclass(frozen=True)
+class InstanceSpec:
+    """Uma entrada de `instances` do manifesto (já com o `epsilon` global)."""
+
+    filename: str
+    nodes: int
+    density: float
+    cv_vel: float
+    epsilon: float
+    seed: int | None = None
+
+
+def load_manifest(path: Path) -> tuple[list[InstanceSpec], int | None]:
+    """Lê `configs/instances_to_generate.yaml` → (specs, semente-mestre opcional)."""
+    import yaml  # pyyaml só é necessário para o manifesto
+
+    with Path(path).open(encoding="utf-8") as f:
+        manifest = yaml.safe_load(f)
+    epsilon = float(manifest["epsilon"])
+    specs = []
+    for item in manifest["instances"]:
+        params = item["params"]
+        specs.append(
+            InstanceSpec(
+                filename=str(item["filename"]),
+                nodes=int(params["nodes"]),
+                density=float(params["density"]),
+                cv_vel=float(params["cv_vel"]),
+                epsilon=float(params.get("epsilon", epsilon)),
+                seed=None if params.get("seed") is None else int(params["seed"]),
+            )
+        )
+    return specs, manifest.get("seed")
+
+
+def instance_seeds(
+    specs: list[InstanceSpec], master_seed: int | None = None
+) -> list[np.random.SeedSequence]:
+    """Um `SeedSequence` por spec (explícito ou filho da semente-mestre)."""
+    children = np.random.SeedSequence(master_seed).spawn(len(specs))
+    return [
+        np.random.SeedSequence(spec.seed) if spec.seed is not None else child
+        for spec, child in zip(specs, children, strict=True)
+    ]
+
+
+def _peak_rss_mb() -> float | None:
+    """Pico de RSS do processo corrente (MiB), ou None sem `resource` (Windows)."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB; macOS, bytes
+    return peak / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+def _generate_one(task: tuple[InstanceSpec, np.random.SeedSequence, Path, int, str]) -> dict:
+    """Worker: gera uma instância e devolve a linha do sumário (nunca levanta)."""
+    spec, seed_seq, output, gzip_level, validate_mode = task
+    row: dict[str, Any] = {"filename": spec.filename, "nodes": spec.nodes}
+    t0 = time.perf_counter()
+    try:
+        if spec.nodes < 2 or not 0.0 < spec.density < 1.0 or not 0.0 <= spec.cv_vel <= 1.0:
+            raise ValueError("parâmetros fora do domínio (nodes>=2, 0<density<1, 0<=cv<=1)")
+        m = gen_cli.generate_instance(
+            nodes=spec.nodes,
+            density=spec.density,
+            cv_vel=spec.cv_vel,
+            epsilon=spec.epsilon,
+            output=output,
+            seed=spec.seed if spec.seed is not None else seed_seq,
+            gzip_level=gzip_level,
+            validate_mode=validate_mode,
+        )
+        telemetry = gen_cli._TELEMETRY
+        row.update(
+            status="ok",
+            edges=m,
+            mode=getattr(telemetry, "density_mode", None),
+        )
+    except Exception as ex:  # falha de uma instância não derruba o lote
+        row.update(status="failed", error=f"{ex.__class__.__name__}: {ex}")
+    row["seconds"] = round(time.perf_counter() - t0, 3)
+    row["peak_rss_mb"] = _peak_rss_mb()
+    return row
+
+
+def _mp_context() -> mp.context.BaseContext:
+    """`forkserver` com o gerador pré-importado; `spawn` onde não houver."""
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(["generator.cli"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+def generate_batch(
+    specs: list[InstanceSpec],
+    out_dir: Path,
+    *,
+    workers: int | None = None,
+    master_seed: int | None = None,
+    overwrite: bool = False,
+    gzip_level: int = gen_cli.GZIP_LEVEL_DEFAULT,
+    validate_mode: str = gen_cli.VALIDATE_DEFAULT,
+) -> list[dict]:
+    """Gera as instâncias ausentes de `specs` em `out_dir`, em paralelo.
+
+    Cada instância roda num processo novo do pool (`max_tasks_per_child=1`), então
+    `peak_rss_mb` é o pico daquela instância. Retorna uma linha de sumário por spec,
+    na ordem do manifesto (`status` ∈ {ok, skipped, failed}).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    seeds = instance_seeds(specs, master_seed)
+
+    rows: list[dict | None] = [None] * len(specs)
+    pending = []
+    for i, (spec, seed_seq) in enumerate(zip(specs, seeds, strict=True)):
+        output = out_dir / spec.filename
+        if output.exists() and not overwrite:
+            rows[i] = {"filename": spec.filename, "status": "skipped", "nodes": spec.nodes}
+            continue
+        pending.append((i, (spec, seed_seq, output, gzip_level, validate_mode)))
+
+    if pending:
+        n_workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+        logging.info("Gerando %d instância(s) com %d worker(s)...", len(pending), n_workers)
+        with ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=_mp_context(), max_tasks_per_child=1
+        ) as ex:
+            futs = {ex.submit(_generate_one, task): i for i, task in pending}
+            for fut in as_completed(futs):
+                row = fut.result()
+                logging.info("%s: %s (%.2fs)", row["filename"], row["status"], row["seconds"])
+                rows[futs[fut]] = row
+    return [r for r in rows if r is not None]
+
+
+def format_summary(rows: list[dict]) -> str:
+    """Tabela de texto alinhada (uma linha por instância) para o terminal."""
+
+    def cell(v: Any) -> str:
+        if v is None:
+            return "-"
+        return f"{v:.1f}" if isinstance(v, float) else str(v)
+
+    table = [list(SUMMARY_COLUMNS)] + [[cell(r.get(c)) for c in SUMMARY_COLUMNS] for r in rows]
+    widths = [max(len(line[j]) for line in table) for j in range(len(SUMMARY_COLUMNS))]
+    # nome alinhado à esquerda, números à direita
+    return "\n".join(
+        "  ".join(
+            [line[0].ljust(widths[0])]
+            + [v.rjust(w) for v, w in zip(line[1:], widths[1:], strict=True)]
+        )
+        for line in table
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entrypoint: `instance-generator batch --manifest ... --out-dir ...`."""
+    ap = argparse.ArgumentParser(
+        prog="instance-generator batch",
+        description="Gera em paralelo as instâncias ausentes de um manifesto YAML.",
+    )
+    ap.add_argument("--manifest", type=Path, default=Path("configs/instances_to_generate.yaml"))
+    ap.add_argument("--out-dir", type=Path, default=Path("data/instances/synthetic"))
+    ap.add_argument("--workers", type=int, default=None, help="Padrão: nº de CPUs")
+    ap.add_argument("--seed", type=int, default=None, help="Semente-mestre (specs sem seed)")
+    ap.add_argument("--overwrite", action="store_true", help="Regera instâncias existentes")
+    ap.add_argument(
+        "--gzip-level", type=int, default=gen_cli.GZIP_LEVEL_DEFAULT, choices=range(0, 10)
+    )
+    ap.add_argument("--validate", choices=gen_cli.VALIDATE_MODES, default=gen_cli.VALIDATE_DEFAULT)
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+    specs, manifest_seed = load_manifest(args.manifest)
+    rows = generate_batch(
+        specs,
+        args.out_dir,
+        workers=args.workers,
+        master_seed=args.seed if args.seed is not None else manifest_seed,
+        overwrite=args.overwrite,
+        gzip_level=args.gzip_level,
+        validate_mode=args.validate,
+    )
+    print(format_summary(rows))
+    failed = [r for r in rows if r["status"] == "failed"]
+    for r in failed:
+        print(f"[ERRO] {r['filename']}: {r['error']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,7 +14,10 @@ from types import SimpleNamespace
 from typing import Any
 
 import numpy as np
-from jsonschema import validate
+from jsonschema import ValidationError, validate
+
+# Bundle binário `.npyd`: sufixo/formato vêm do leitor, para escrita e leitura não divergirem
+from hpc_framework.instance_io import BUNDLE_FORMAT, is_bundle
 
 # Telemetria leve para auditoria (preenchida em build_edge_list / generate_velocities)
 _TELEMETRY: SimpleNamespace | None = None
@@ -26,6 +29,16 @@ POS_MIN, POS_MAX = 0.0, 1000.0
 # Gate de modularidade por memória (evita picos de RSS com NetworkX)
 MOD_GREEDY_EDGE_LIMIT_ABS = 1_200_000  # teto absoluto de arestas
 MOD_GREEDY_EDGE_LIMIT_FRAC = 0.30  # ou 30% de M = n(n-1)/2
+# Acima do gate: Louvain vetorizado (generator.modularity) com teto de tempo
+MOD_LOUVAIN_TIME_BUDGET_S = 60.0
+
+
+# Modo 'sparse' (memória O(m)): só quando a máscara de M = n(n-1)/2 bytes pesaria
+# (M > SPARSE_PAIRS_MIN) e guardar índices int64 custa menos que ela (densidade ≤ 1/8)
+SPARSE_PAIRS_MIN = 1 << 26
+SPARSE_DENSITY_MAX = 0.125
+# Modo 'complement': a partir desta densidade sorteia as arestas AUSENTES
+COMPLEMENT_DENSITY_MIN = 0.5
 
 
 def _m_crit(n: int) -> int:
@@ -111,59 +124,109 @@ def _edge_to_linear_index(u: np.ndarray, v: np.ndarray, n: int) -> np.ndarray:
 # -------------------------- Árvore de Wilson (UST) --------------------------
 
 
+# Sorteios de passo por lote no Wilson (o excedente é devolvido ao final)
+WILSON_DRAW_BATCH = 1 << 16
+
+
 def random_tree_wilson(rng: np.random.Generator, n: int) -> np.ndarray:
     """Gera uma UST em K_n via Wilson (loop-erased random walks).
 
+    Formulação original de Wilson com ponteiros de sucessor: cada passo grava
+    `nxt[u] = v` (sobrescrevendo visitas anteriores, o que apaga os laços) e, ao tocar a
+    árvore, o caminho apagado é o percurso de `nxt` a partir do início. Memória O(n) e
+    custo O(1) por passo.
+
     - Passo evita auto-laço (não existe aresta (u,u) em K_n).
-    - Loop-erasure mantém o nó revisitado (truncamento em cut+1).
-    - Caminho é conectado “de trás pra frente” ao primeiro nó já em árvore.
+    - Sorteios vêm em lotes de `WILSON_DRAW_BATCH`; o estado do `rng` é rebobinado
+      para consumir exatamente um sorteio por passo, então a árvore e os sorteios
+      seguintes são idênticos à versão passo a passo para a mesma semente.
     Retorna (n-1,2) com pares (i,j), i<j, ordenados lexicograficamente.
     """
     if n < 2:
         return np.zeros((0, 2), dtype=np.int64)
 
-    parent = np.full(n, -1, dtype=np.int64)
-    in_tree = np.zeros(n, dtype=bool)
-
     root = int(rng.integers(0, n))
-    in_tree[root] = True
-
+    in_tree = bytearray(n)
+    in_tree[root] = 1
+    nxt = [-1] * n
+
+    span = n - 1  # r uniforme em {0..n-2}, mapeado para {0..n-1}\{u}
+    batch = min(WILSON_DRAW_BATCH, 2 * n + 64)
+    batch_state = rng.bit_generator.state
+    buf: list[int] = []
+    j = 0
     for start in range(n):
         if in_tree[start]:
             continue
-
-        path: list[int] = []
-        pos: dict[int, int] = {}
         u = start
         while not in_tree[u]:
-            if u in pos:
-                cut = pos[u]
-                path = path[: cut + 1]
-                pos = {node: i for i, node in enumerate(path)}
-            else:
-                pos[u] = len(path)
-                path.append(u)
-
-            r = int(rng.integers(0, n - 1))
-            u = r + (r >= u)  # uniforme em {0..n-1}\{u}
-
-        prev = u
-        for v in reversed(path):
-            parent[v] = prev
-            in_tree[v] = True
-            prev = v
-
-    edges = np.array([(i, p) for i, p in enumerate(parent) if p != -1], dtype=np.int64)
+            if j == len(buf):
+                batch_state = rng.bit_generator.state
+                buf = rng.integers(0, span, size=batch).tolist()
+                j = 0
+            r = buf[j]
+            j += 1
+            v = r + (r >= u)
+            nxt[u] = v
+            u = v
+        u = start
+        while not in_tree[u]:
+            in_tree[u] = 1
+            u = nxt[u]
+
+    # devolve os sorteios não usados do último lote
+    rng.bit_generator.state = batch_state
+    if j:
+        rng.integers(0, span, size=j)
+
+    parent = np.asarray(nxt, dtype=np.int64)
+    child = np.flatnonzero(parent >= 0)
+    edges = np.column_stack((child, parent[child]))
     return _canonicalize_and_sort_edges(edges)
 
 
-# ---------------- Construtor de arestas (constructive × dense-fast) ----------------
+# ------- Construtor de arestas (constructive × dense-fast × sparse × complement) -------
+
+
+def _sample_pairs_sparse(
+    rng: np.random.Generator, m_max: int, taken: np.ndarray, needed: int
+) -> tuple[np.ndarray, float]:
+    """Sorteia `needed` índices lineares distintos fora de `taken` sem máscara O(M).
+
+    `taken` (ordenado) cresce a cada rodada; os candidatos são deduplicados mantendo
+    a ordem de sorteio, então o corte final em `needed` não favorece índices baixos.
+    Retorna (índices novos, aceitação da última rodada).
+    """
+    chosen: list[np.ndarray] = []
+    acceptance = 0.0
+    while needed > 0:
+        batch_size = max(1024, int(needed * 1.1))
+        cand = rng.integers(0, m_max, batch_size, dtype=np.int64)
+        order = np.argsort(cand, kind="stable")
+        sc = cand[order]
+        keep = np.ones(batch_size, dtype=bool)
+        keep[1:] = sc[1:] != sc[:-1]
+        if taken.size:
+            pos = np.minimum(np.searchsorted(taken, sc), taken.size - 1)
+            keep &= taken[pos] != sc
+        use = cand[np.sort(order[keep])[:needed]]
+        acceptance = float(np.count_nonzero(keep)) / float(batch_size)
+        chosen.append(use)
+        taken = np.sort(np.concatenate((taken, use)))
+        needed -= int(use.size)
+    return np.concatenate(chosen) if chosen else np.zeros(0, dtype=np.int64), acceptance
 
 
 def build_edge_list(
     rng: np.random.Generator, num_nodes: int, target_density: float, verbose: bool
 ) -> np.ndarray:
-    """Constrói arestas conforme densidade alvo (dispatcher constructive × dense-fast)."""
+    """Constrói arestas conforme densidade alvo (constructive × dense-fast × sparse × complement).
+
+    `sparse` (M grande e densidade baixa) guarda só os índices sorteados, evitando a
+    máscara booleana de M = n(n-1)/2 posições. `complement` (densidade ≥
+    `COMPLEMENT_DENSITY_MIN`) sorteia as M - m arestas ausentes fora da árvore e
+    materializa o restante numa passada, com custo ~constante por aresta de saída.
+    """
     logging.info("Iniciando construção da lista de arestas...")
     tree_edges = random_tree_wilson(rng, num_nodes)
 
@@ -173,17 +236,36 @@ def build_edge_list(
     if needed <= 0:
         return tree_edges
 
-    mode = "dense-fast" if m_target > _m_crit(num_nodes) else "constructive"
+    if target_density >= COMPLEMENT_DENSITY_MIN:
+        mode = "complement"
+    elif m_max > SPARSE_PAIRS_MIN and target_density <= SPARSE_DENSITY_MAX:
+        mode = "sparse"
+    else:
+        mode = "dense-fast" if m_target > _m_crit(num_nodes) else "constructive"
     logging.info("Árvore criada; adicionando %s arestas... (mode=%s)", f"{needed:,}", mode)
 
-    mask = np.ones(m_max, dtype=bool)
     u, v = tree_edges.T
-    mask[_edge_to_linear_index(u, v, num_nodes)] = False
-
+    tree_idx = _edge_to_linear_index(u, v, num_nodes)
     new_edges: list[np.ndarray] = []
     stall = 0
     acceptance_last = 0.0
 
+    if mode == "complement":
+        # ausentes nunca tocam a árvore (entra como "já sorteada"), logo ela é preservada
+        missing, acceptance_last = _sample_pairs_sparse(
+            rng, m_max, np.sort(tree_idx), m_max - m_target
+        )
+        mask = np.ones(m_max, dtype=bool)
+        mask[missing] = False
+        # índice linear cresce em ordem lexicográfica (i, j): saída já canônica
+        edges = _linear_index_to_edge(np.flatnonzero(mask), num_nodes)
+    elif mode == "sparse":
+        use, acceptance_last = _sample_pairs_sparse(rng, m_max, np.sort(tree_idx), needed)
+        new_edges.append(_linear_index_to_edge(use, num_nodes))
+    else:
+        mask = np.ones(m_max, dtype=bool)
+        mask[tree_idx] = False
+
     if mode == "constructive":
         factor = 1.3
         with tqdm(
@@ -218,7 +300,7 @@ def build_edge_list(
                         )
                     needed -= int(use.size)
                     stall = 0
-    else:
+    elif mode == "dense-fast":
         factor = 3.8
         with tqdm(
             total=needed,
@@ -253,8 +335,9 @@ def build_edge_list(
                     needed -= int(use.size)
                     stall = 0
 
-    edges = np.vstack([tree_edges] + new_edges)
-    edges = _canonicalize_and_sort_edges(edges)
+    if mode != "complement":
+        edges = np.vstack([tree_edges] + new_edges)
+        edges = _canonicalize_and_sort_edges(edges)
 
     # Telemetria leve (consumida no save)
     global _TELEMETRY  # noqa: PLW0603
@@ -391,29 +474,58 @@ def _compute_modularity_greedy_if_small(edges: np.ndarray, n_nodes: int) -> floa
     G.add_nodes_from(range(n_nodes))
     G.add_edges_from(edges.tolist())
     comms = nx.community.greedy_modularity_communities(G)
-    return float(nx.community.modularity(G, comms))
+    try:
+        from generator.modularity import modularity
+    except ImportError:  # pragma: no cover - execução como script (src/generator no path)
+        from modularity import modularity  # type: ignore[no-redef]
+
+    labels = np.empty(n_nodes, dtype=np.int64)
+    for c, members in enumerate(comms):
+        labels[list(members)] = c
+    return modularity(edges, labels)
+
+
+def _compute_modularity(
+    edges: np.ndarray, n_nodes: int, budget_s: float = MOD_LOUVAIN_TIME_BUDGET_S
+) -> tuple[float | None, str | None]:
+    """Modularidade + tag do método: CNM dentro do gate; acima dele, Louvain em O(m).
+
+    Tags: `cnm`, `louvain` ou `louvain-truncated` (orçamento `budget_s` esgotado; Q da
+    melhor partição até o corte). `budget_s <= 0` desliga o Louvain (modularidade null).
+    """
+    M = n_nodes * (n_nodes - 1) // 2
+    limit = min(MOD_GREEDY_EDGE_LIMIT_ABS, int(MOD_GREEDY_EDGE_LIMIT_FRAC * M))
+    if int(edges.shape[0]) <= limit:
+        q = _compute_modularity_greedy_if_small(edges, n_nodes)
+        if q is not None:
+            return q, "cnm"
+    if budget_s <= 0:
+        return None, None
+
+    try:
+        from generator.modularity import louvain
+    except ImportError:  # pragma: no cover - execução como script (src/generator no path)
+        from modularity import louvain  # type: ignore[no-redef]
+
+    q, _, truncated = louvain(n_nodes, edges, time_budget_s=budget_s)
+    if truncated:
+        logging.warning("Louvain interrompido após %.0fs; modularidade parcial.", budget_s)
+    return q, "louvain-truncated" if truncated else "louvain"
 
 
 # ------------------------- Serialização / wrappers -------------------------
 
 
-def _save_instance_core(
+def _instance_header(
     edges: np.ndarray,
     velocities: np.ndarray,
-    output_path: Path,
-    rng: np.random.Generator,
-    schema: dict | None,
+    modularity: float | None,
     params: dict,
-) -> None:
-    """Serializa JSON (respeita a extensão: .json ou .json.gz)."""
+    modularity_method: str | None = None,
+) -> dict:
+    """Cabeçalho comum (schema v1.1) a todos os formatos de saída."""
     n = int(velocities.size)
-    modularity = _compute_modularity_greedy_if_small(edges, n)
-
-    # Loga telemetria (não entra no JSON para não quebrar schema)
-    if isinstance(_TELEMETRY, SimpleNamespace):
-        logging.info("telemetry: %s", _TELEMETRY.__dict__)
-
-    instance = {
+    return {
         "schema_version": "1.1",
         "epsilon": params["epsilon"],
         "instance_metrics": {
@@ -424,32 +536,258 @@ def _save_instance_core(
             "cv_vel_requested": params["cv_vel_requested"],
             "cv_vel_final": float(velocities.std() / (velocities.mean() + 1e-12)),
             "modularity": modularity,
+            "modularity_method": modularity_method,
             "seed": params["seed"],
+            **({"seed_spawn_key": params["seed_spawn_key"]} if "seed_spawn_key" in params else {}),
         },
+    }
+
+
+# Escrita JSON em streaming (layout idêntico a json.dump(..., indent=2))
+JSON_CHUNK_ROWS = 65_536
+GZIP_LEVEL_DEFAULT = 9  # mesmo default de gzip.open
+_NODE_TPL = '    {\n      "id": %d,\n      "velocity": %r,\n      "pos": [\n        %r,\n        %r\n      ]\n    }'
+_EDGE_TPL = "    [\n      %d,\n      %d\n    ]"
+
+
+def _rows_json(tpl: str, flat: list, rows: int) -> str:
+    """Formata `rows` itens de um bloco com um único `%` (sem json.dumps por item)."""
+    return ",\n".join([tpl] * rows) % tuple(flat)
+
+
+def _iter_instance_json(
+    header: dict,
+    edges: np.ndarray,
+    velocities: np.ndarray,
+    positions: np.ndarray,
+    chunk_rows: int = JSON_CHUNK_ROWS,
+):
+    """Gera o documento JSON v1.1 em blocos de texto, direto dos arrays NumPy.
+
+    A saída é byte a byte igual a `json.dump(instance, f, indent=2)`; floats usam
+    `repr` (mesma regra do encoder do stdlib) e nunca há lista/dict por nó ou aresta.
+    """
+    n = int(velocities.size)
+    m = int(edges.shape[0])
+    head = json.dumps(header, indent=2)
+    yield head[: head.rindex("\n}")]
+
+    yield ',\n  "nodes": ['
+    for a in range(0, n, chunk_rows):
+        b = min(a + chunk_rows, n)
+        block = np.empty((b - a, 4), dtype=object)
+        block[:, 0] = range(a, b)
+        block[:, 1] = velocities[a:b].tolist()
+        block[:, 2:] = positions[a:b].tolist()
+        yield ("\n" if a == 0 else ",\n") + _rows_json(_NODE_TPL, block.ravel().tolist(), b - a)
+    yield "\n  ]" if n else "]"
+
+    yield ',\n  "edges": ['
+    for a in range(0, m, chunk_rows):
+        b = min(a + chunk_rows, m)
+        flat = edges[a:b].ravel().tolist()
+        yield ("\n" if a == 0 else ",\n") + _rows_json(_EDGE_TPL, flat, b - a)
+    yield "\n  ]\n}" if m else "]\n}"
+
+
+# Validação da saída: full = JSONSchema no documento inteiro; fast = JSONSchema no
+# cabeçalho + 1º nó e checagens NumPy no resto; off = nenhuma
+VALIDATE_MODES = ("full", "fast", "off")
+VALIDATE_DEFAULT = "fast"
+
+
+def _validate_instance_full(
+    header: dict,
+    edges: np.ndarray,
+    velocities: np.ndarray,
+    positions: np.ndarray,
+    schema: dict,
+) -> None:
+    """Validação JSONSchema completa (materializa o documento só durante a checagem)."""
+    instance = {
+        **header,
         "nodes": [
-            {
-                "id": i,
-                "velocity": float(velocities[i]),
-                "pos": rng.uniform(POS_MIN, POS_MAX, 2).tolist(),
-            }
-            for i in range(n)
+            {"id": i, "velocity": v, "pos": p}
+            for i, (v, p) in enumerate(zip(velocities.tolist(), positions.tolist(), strict=True))
         ],
-        "edges": [[int(u), int(v)] for u, v in edges],
+        "edges": edges.tolist(),
     }
+    validate(instance=instance, schema=schema)
+    logging.info("Validação JSONSchema concluída.")
+
+
+def _check_bounds(name: str, values: np.ndarray, spec: dict) -> None:
+    """Aplica `minimum`/`maximum` de um sub-schema numérico a um array inteiro."""
+    if not np.isfinite(values).all():
+        raise ValidationError(f"{name}: valores não finitos")
+    lo, hi = spec.get("minimum"), spec.get("maximum")
+    if lo is not None and values.size and float(values.min()) < lo:
+        raise ValidationError(f"{name}: {float(values.min())!r} < minimum {lo!r}")
+    if hi is not None and values.size and float(values.max()) > hi:
+        raise ValidationError(f"{name}: {float(values.max())!r} > maximum {hi!r}")
+
+
+def _validate_instance_fast(
+    header: dict,
+    edges: np.ndarray,
+    velocities: np.ndarray,
+    positions: np.ndarray,
+    schema: dict,
+) -> None:
+    """Validação vetorizada, equivalente à completa para a saída do gerador.
+
+    O JSONSchema cobre o cabeçalho e a estrutura de um nó (tipos, chaves, aridade de
+    `pos`); os limites numéricos dos nós saem do próprio schema e são checados nos
+    arrays. As arestas são verificadas em O(m) no array: inteiras, dentro de [0, n),
+    canônicas (i<j) e estritamente crescentes em ordem lexicográfica — o que implica
+    `uniqueItems` sem o teste par-a-par do jsonschema.
+    """
+    n = int(velocities.size)
+    node0 = [{"id": 0, "velocity": float(velocities[0]), "pos": positions[0].tolist()}] if n else []
+    validate(instance={**header, "nodes": node0, "edges": []}, schema=schema)
+
+    item = schema["properties"]["nodes"]["items"]["properties"]
+    _check_bounds("nodes[].velocity", velocities, item["velocity"])
+    if positions.shape != (n, 2):
+        raise ValidationError(f"nodes[].pos: shape {positions.shape} != ({n}, 2)")
+    _check_bounds("nodes[].pos", positions, item["pos"]["items"])
+
+    if edges.size == 0:
+        logging.info("Validação rápida concluída.")
+        return
+    if edges.ndim != 2 or edges.shape[1] != 2 or not np.issubdtype(edges.dtype, np.integer):
+        raise ValidationError(f"edges: esperado (m,2) inteiro, obtido {edges.shape} {edges.dtype}")
+    u = edges[:, 0].astype(np.int64)
+    v = edges[:, 1].astype(np.int64)
+    if int(u.min()) < 0 or int(v.max()) >= n:
+        raise ValidationError(f"edges: vértice fora de [0, {n})")
+    if not (u < v).all():
+        raise ValidationError("edges: par não canônico (esperado i < j, sem laços)")
+    key = u * n + v
+    if not (key[1:] > key[:-1]).all():
+        raise ValidationError("edges: fora da ordem lexicográfica ou duplicadas")
+    logging.info("Validação rápida concluída.")
+
+
+def _validate_instance(
+    header: dict,
+    edges: np.ndarray,
+    velocities: np.ndarray,
+    positions: np.ndarray,
+    schema: dict | None,
+    mode: str,
+) -> None:
+    """Despacha a validação conforme `mode` (ver `VALIDATE_MODES`); sem schema, não valida."""
+    if mode not in VALIDATE_MODES:
+        raise ValueError(f"validate deve ser um de {VALIDATE_MODES}, não {mode!r}")
+    if schema is None or mode == "off":
+        return
+    if mode == "full":
+        _validate_instance_full(header, edges, velocities, positions, schema)
+    else:
+        _validate_instance_fast(header, edges, velocities, positions, schema)
 
-    if schema is not None:
-        validate(instance=instance, schema=schema)
-        logging.info("Validação JSONSchema concluída.")
 
+def _write_instance_json(
+    header: dict,
+    edges: np.ndarray,
+    velocities: np.ndarray,
+    positions: np.ndarray,
+    output_path: Path,
+    gzip_level: int = GZIP_LEVEL_DEFAULT,
+) -> None:
+    """Serializa JSON v1.1 em streaming (respeita a extensão: .json ou .json.gz)."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    chunks = _iter_instance_json(header, edges, velocities, positions)
     if str(output_path).endswith(".gz"):
-        with gzip.open(str(output_path), "wt", encoding="utf-8") as f:
-            json.dump(instance, f, indent=2)
+        with gzip.open(str(output_path), "wt", encoding="utf-8", compresslevel=gzip_level) as f:
+            f.writelines(chunks)
     else:
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(instance, f, indent=2)
+            f.writelines(chunks)
+
+
+def _write_instance_bundle(
+    header: dict,
+    edges: np.ndarray,
+    velocities: np.ndarray,
+    positions: np.ndarray,
+    output_path: Path,
+) -> None:
+    """Serializa o bundle binário `<nome>.npyd/` (colunar, carregável via mmap).
+
+    Layout:
+      - `header.json`: cabeçalho v1.1 + `format`, `n`, `m`, dtypes;
+      - `edges.npy`: (m,2) int32 (int64 se n não couber), pares (i<j) ordenados;
+      - `velocities.npy`: (n,) float64;
+      - `positions.npy`: (n,2) float64.
+    """
+    n = int(velocities.size)
+    edge_dtype = np.int32 if n <= np.iinfo(np.int32).max else np.int64
+    meta = {
+        "format": BUNDLE_FORMAT,
+        **header,
+        "n": n,
+        "m": int(edges.shape[0]),
+        "dtypes": {"edges": np.dtype(edge_dtype).name, "velocities": "float64"},
+    }
+
+    output_path.mkdir(parents=True, exist_ok=True)
+    np.save(output_path / "edges.npy", np.ascontiguousarray(edges, dtype=edge_dtype))
+    np.save(output_path / "velocities.npy", np.ascontiguousarray(velocities, dtype=np.float64))
+    np.save(output_path / "positions.npy", np.ascontiguousarray(positions, dtype=np.float64))
+    # header por último: bundle incompleto (sem header) é rejeitado pelo leitor
+    with open(output_path / "header.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _save_instance_core(
+    edges: np.ndarray,
+    velocities: np.ndarray,
+    output_path: Path,
+    rng: np.random.Generator,
+    schema: dict | None,
+    params: dict,
+    export_json: Path | None = None,
+    gzip_level: int = GZIP_LEVEL_DEFAULT,
+    modularity_budget_s: float = MOD_LOUVAIN_TIME_BUDGET_S,
+    validate_mode: str = VALIDATE_DEFAULT,
+) -> None:
+    """Serializa a instância conforme a extensão (.json, .json.gz ou bundle .npyd).
+
+    `export_json` grava, além do destino principal, uma cópia JSON v1.1 de intercâmbio;
+    `gzip_level` (0–9) vale para qualquer saída `.json.gz`; `modularity_budget_s` limita
+    o Louvain usado acima do gate do CNM. A validação (`validate_mode`) roda uma vez,
+    antes de qualquer escrita; no bundle, `full` equivale a `fast` (não há documento JSON).
+    """
+    n = int(velocities.size)
+    modularity, modularity_method = _compute_modularity(edges, n, modularity_budget_s)
+
+    # Loga telemetria (não entra no JSON para não quebrar schema)
+    if isinstance(_TELEMETRY, SimpleNamespace):
+        logging.info("telemetry: %s", _TELEMETRY.__dict__)
+
+    header = _instance_header(edges, velocities, modularity, params, modularity_method)
+    # Mesmo fluxo do RNG que o sorteio por nó (2 uniformes por vértice, em ordem)
+    positions = rng.uniform(POS_MIN, POS_MAX, (n, 2))
+
+    bundle = is_bundle(output_path)
+    mode = "fast" if bundle and validate_mode == "full" else validate_mode
+    _validate_instance(header, edges, velocities, positions, schema, mode)
+    if bundle:
+        _write_instance_bundle(header, edges, velocities, positions, output_path)
+    else:
+        _write_instance_json(
+            header, edges, velocities, positions, output_path, gzip_level=gzip_level
+        )
     logging.info("Instância salva em %s", output_path)
 
+    if export_json is not None:
+        _write_instance_json(
+            header, edges, velocities, positions, export_json, gzip_level=gzip_level
+        )
+        logging.info("Cópia JSON (intercâmbio) salva em %s", export_json)
+
 
 def build_graph(rng: np.random.Generator, num_nodes: int, density: float) -> Any:
     """Materializa um nx.Graph (uso em testes; n pequenos)."""
@@ -487,18 +825,75 @@ def save_instance(
     _save_instance_core(edges, velocities, output_path, rng, schema, params)
 
 
+def generate_instance(
+    *,
+    nodes: int,
+    density: float,
+    cv_vel: float,
+    epsilon: float,
+    output: Path,
+    seed: int | np.random.SeedSequence | None = None,
+    export_json: Path | None = None,
+    gzip_level: int = GZIP_LEVEL_DEFAULT,
+    verbose: bool = False,
+    schema: dict | None = None,
+    modularity_budget_s: float = MOD_LOUVAIN_TIME_BUDGET_S,
+    validate_mode: str = VALIDATE_DEFAULT,
+) -> int:
+    """Gera e grava uma instância completa (arestas, velocidades, posições); retorna m.
+
+    `seed` aceita int (como `--seed`) ou um `SeedSequence` já derivado (geração em lote);
+    `default_rng(s)` e `default_rng(SeedSequence(s))` produzem o mesmo fluxo.
+    """
+    rng = np.random.default_rng(seed)
+    edges = build_edge_list(rng, nodes, density, verbose)
+    velocities = generate_velocities(rng, nodes, cv_vel)
+
+    params: dict[str, Any] = {
+        "nodes_requested": nodes,
+        "density_requested": density,
+        "cv_vel_requested": cv_vel,
+        "seed": seed if isinstance(seed, int) else None,
+        "epsilon": epsilon,
+    }
+    if isinstance(seed, np.random.SeedSequence) and isinstance(seed.entropy, int):
+        # proveniência: SeedSequence(seed, spawn_key=seed_spawn_key) refaz o fluxo
+        params["seed"] = int(seed.entropy)
+        if seed.spawn_key:
+            params["seed_spawn_key"] = [int(k) for k in seed.spawn_key]
+    _save_instance_core(
+        edges,
+        velocities,
+        output,
+        rng,
+        schema if schema is not None else _load_schema(),
+        params,
+        export_json=export_json,
+        gzip_level=gzip_level,
+        modularity_budget_s=modularity_budget_s,
+        validate_mode=validate_mode,
+    )
+    return int(edges.shape[0])
+
+
 # ---------------------------------- CLI ----------------------------------
 
 
 def main() -> None:
     """Entrypoint do gerador (v6.1.0)."""
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from generator.batch import main as batch_main
+
+        sys.exit(batch_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description=(
             "Gerador de Instâncias HPC (v6.1.0)\n"
             "Notas:\n"
             " - Árvore base por Wilson (UST) + complemento via índices.\n"
             " - CV teórico máximo com média no centro é (Vmax-Vmin)/(Vmax+Vmin) = 1/3 ≈ 0.333.\n"
-            " - Modularidade greedy só em grafos pequenos (gate por memória)."
+            " - Modularidade: CNM em grafos pequenos (gate por memória), Louvain O(m) acima.\n"
+            " - --output *.npyd grava bundle binário colunar (edges/velocities/positions .npy)."
         ),
         formatter_class=argparse.RawTextHelpFormatter,
     )
@@ -511,7 +906,41 @@ def main() -> None:
         help="Coeficiente de variação alvo (0..1). Máx efetivo ≈ 0.333 com média no centro.",
     )
     parser.add_argument("--epsilon", type=float, required=True)
-    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="Destino: .json / .json.gz (JSON v1.1) ou diretório .npyd (bundle binário/mmap).",
+    )
+    parser.add_argument(
+        "--export-json",
+        type=Path,
+        default=None,
+        help="Grava também uma cópia JSON v1.1 (intercâmbio), útil com --output .npyd.",
+    )
+    parser.add_argument(
+        "--gzip-level",
+        type=int,
+        default=GZIP_LEVEL_DEFAULT,
+        choices=range(0, 10),
+        metavar="{0..9}",
+        help="Nível de compressão para saídas .json.gz (1 = rápido, 9 = menor arquivo).",
+    )
+    parser.add_argument(
+        "--modularity-budget-s",
+        type=float,
+        default=MOD_LOUVAIN_TIME_BUDGET_S,
+        help="Teto (s) do Louvain usado acima do gate do CNM; 0 desliga (modularity = null).",
+    )
+    parser.add_argument(
+        "--validate",
+        choices=VALIDATE_MODES,
+        default=VALIDATE_DEFAULT,
+        help=(
+            "Validação da saída: full = JSONSchema no documento inteiro (lento p/ milhões de"
+            " arestas); fast = JSONSchema no cabeçalho + checagens NumPy; off = nenhuma."
+        ),
+    )
     parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("--verbose", action="store_true")
     args = parser.parse_args()
@@ -526,19 +955,19 @@ def main() -> None:
         format="[%(levelname)s] %(message)s",
     )
 
-    rng = np.random.default_rng(args.seed)
-    edges = build_edge_list(rng, args.nodes, args.density, args.verbose)
-    velocities = generate_velocities(rng, args.nodes, args.cv_vel)
-
-    params = {
-        "nodes_requested": args.nodes,
-        "density_requested": args.density,
-        "cv_vel_requested": args.cv_vel,
-        "seed": args.seed,
-        "epsilon": args.epsilon,
-    }
-    schema = _load_schema()
-    _save_instance_core(edges, velocities, args.output, rng, schema, params)
+    generate_instance(
+        nodes=args.nodes,
+        density=args.density,
+        cv_vel=args.cv_vel,
+        epsilon=args.epsilon,
+        output=args.output,
+        seed=args.seed,
+        export_json=args.export_json,
+        gzip_level=args.gzip_level,
+        verbose=args.verbose,
+        modularity_budget_s=args.modularity_budget_s,
+        validate_mode=args.validate,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,277 @@
+"""Modularidade em CSR/NumPy para instâncias acima do gate de memória do CNM.
+
+Louvain com movimento local *síncrono e randomizado*: a cada rodada, o melhor ganho
+ΔQ de todos os vértices é calculado de uma vez (ordenação das chaves
+`vértice·n + comunidade-do-vizinho` + `reduceat`) e só uma fração aleatória dos
+vértices que melhoram se move — o que evita oscilações de trocas simultâneas. Uma
+rodada que piora Q é desfeita e a fração cai pela metade. Ao estabilizar, as
+comunidades viram supervértices (arestas somadas, laços internos em `self_w`) e o
+processo se repete. Memória O(m); nenhum grafo NetworkX é construído.
+
+`modularity` pontua uma rotulação qualquer (Louvain, CNM, partições METIS/KaHIP) direto
+da lista de arestas; `modularity_contributions` dá o termo de cada comunidade.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+# Orçamento padrão de tempo (s); rodada com ganho de Q abaixo de LOUVAIN_TOL encerra o nível
+LOUVAIN_TIME_BUDGET_S = 60.0
+LOUVAIN_TOL = 1e-5
+_MIN_MOVE_FRACTION = 1.0 / 64
+
+
+def modularity(edges: np.ndarray, labels: np.ndarray) -> float:
+    """Modularidade Q de `labels` sobre um grafo simples não ponderado.
+
+    Q = Σ_c [e_c/m − (d_c/2m)²], com e_c = arestas internas de c e d_c = soma dos
+    graus de c — ambos via `np.bincount`, sem materializar grafo.
+
+    Args:
+        edges: (m,2) pares de vértices (cada aresta uma vez, sem laços).
+        labels: (n,) rótulos inteiros não-negativos, um por vértice.
+
+    Returns:
+        Q (0.0 para grafo sem arestas).
+    """
+    return float(modularity_contributions(edges, labels).sum())
+
+
+def modularity_contributions(edges: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Termos por comunidade de Q: vetor (C,), C = max(labels) + 1, com soma == Q.
+
+    Rótulos sem vértices (e grafos sem arestas) contribuem 0. Mesmos argumentos de
+    `modularity`.
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    e = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    n = labels.size
+    c = int(labels.max()) + 1 if n else 0
+    m = e.shape[0]
+    if m == 0:
+        return np.zeros(c)
+    lu = labels[e[:, 0]]
+    intra = lu == labels[e[:, 1]]
+    e_c = np.bincount(lu[intra], minlength=c)
+    deg = np.bincount(e.ravel(), minlength=n)
+    d_c = np.bincount(labels, weights=deg, minlength=c)
+    return e_c / m - (d_c / (2.0 * m)) ** 2
+
+
+def _csr_ranges(indptr: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Índices dos arcos (CSR) de `nodes`, concatenados, sem laço Python."""
+    starts = indptr[nodes]
+    lens = indptr[nodes + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(lens) - lens), lens)
+    return offsets + np.arange(int(lens.sum()), dtype=np.int64)
+
+
+def _best_moves(
+    arcs: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    ww: np.ndarray | None,
+    k: np.ndarray,
+    tot: np.ndarray,
+    labels: np.ndarray,
+    two_m: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Melhor comunidade de cada vértice de `arcs` → (vértices que melhoram, destinos)."""
+    n = k.size
+    a_src = src[arcs]
+    a_lab = labels[dst[arcs]]
+    order = np.argsort(a_src * n + a_lab)
+    a_src, a_lab = a_src[order], a_lab[order]
+    first = np.empty(order.size, dtype=bool)
+    first[0] = True
+    first[1:] = (a_src[1:] != a_src[:-1]) | (a_lab[1:] != a_lab[:-1])
+    starts = np.flatnonzero(first)
+    if ww is None:  # nível 1 (não ponderado): peso = multiplicidade do par
+        w_ic = np.diff(np.append(starts, order.size)).astype(np.float64)
+    else:
+        w_ic = np.add.reduceat(ww[arcs[order]], starts)
+    pi = a_src[starts]
+    pc = a_lab[starts]
+
+    own = labels[pi] == pc
+    w_own = np.zeros(n)
+    w_own[pi[own]] = w_ic[own]
+    # ganho (×1/m) de inserir i em c, com i já fora da própria comunidade
+    k_pi = k[pi]
+    gain = w_ic - k_pi * (tot[pc] - np.where(own, k_pi, 0.0)) / two_m
+
+    # melhor comunidade por vértice: pares já ordenados por vértice
+    node_first = np.empty(pi.size, dtype=bool)
+    node_first[0] = True
+    node_first[1:] = pi[1:] != pi[:-1]
+    best = np.maximum.reduceat(gain, np.flatnonzero(node_first))
+    gid = np.cumsum(node_first) - 1
+    cand = np.flatnonzero(gain >= best[gid])
+    cand = cand[np.r_[True, gid[cand[1:]] != gid[cand[:-1]]]]
+    node, target = pi[cand], pc[cand]
+    stay = w_own[node] - k[node] * (tot[labels[node]] - k[node]) / two_m
+    improve = (best > stay + 1e-12) & (target != labels[node])
+    # regra do rótulo mínimo: singleton → singleton só para rótulo menor (sem trocas)
+    single = np.bincount(labels, minlength=n) == 1
+    improve &= ~(single[labels[node]] & single[target] & (target > labels[node]))
+    return node[improve], target[improve]
+
+
+def _local_moving(
+    indptr: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    ww: np.ndarray,
+    k: np.ndarray,
+    two_m: float,
+    rng: np.random.Generator,
+    deadline: float,
+) -> tuple[np.ndarray, bool]:
+    """Fase 1 do Louvain (vetorizada sobre CSR). Retorna (rótulos, estourou_o_tempo).
+
+    Cada rodada só toca os arcos dos vértices ativos (vizinhos de quem mudou na rodada
+    anterior) e avalia ΔQ incrementalmente, então rodadas tardias custam O(arcos ativos).
+    Se o movimento simultâneo piora Q, os mesmos candidatos são re-sorteados com
+    metade da fração (sem recalcular os ganhos).
+    """
+    n = k.size
+    level_weighted = bool(np.any(ww != 1.0))
+    labels = np.arange(n, dtype=np.int64)
+    tot = k.copy()
+    frac = 1.0
+    active = np.ones(n, dtype=bool)
+    while True:
+        if time.perf_counter() > deadline:
+            return labels, True
+        arcs = _csr_ranges(indptr, np.flatnonzero(active))
+        if arcs.size == 0:
+            break
+        node, target = _best_moves(
+            arcs, src, dst, ww if level_weighted else None, k, tot, labels, two_m
+        )
+        if node.size == 0:
+            break
+
+        dq = 0.0
+        while frac >= _MIN_MOVE_FRACTION:
+            pick = rng.random(node.size) < frac
+            mv, tg = node[pick], target[pick]
+            trial = labels.copy()
+            trial[mv] = tg
+            # ΔQ exato do movimento simultâneo: arco entre dois movidos conta 1×
+            marc = _csr_ranges(indptr, mv)
+            s_, d_ = src[marc], dst[marc]
+            moved = np.zeros(n, dtype=bool)
+            moved[mv] = True
+            same_new = (trial[s_] == trial[d_]).astype(np.float64)
+            same_old = (labels[s_] == labels[d_]).astype(np.float64)
+            d_inside = float(np.dot(ww[marc] * np.where(moved[d_], 1.0, 2.0), same_new - same_old))
+            tot_new = tot - np.bincount(labels[mv], k[mv], minlength=n)
+            tot_new += np.bincount(tg, k[mv], minlength=n)
+            touched = np.zeros(n, dtype=bool)
+            touched[labels[mv]] = True
+            touched[tg] = True
+            t = np.flatnonzero(touched)
+            d_sq = float(np.dot(tot_new[t], tot_new[t]) - np.dot(tot[t], tot[t]))
+            dq = d_inside / two_m - d_sq / two_m**2
+            if dq > 0.0:
+                break
+            frac /= 2.0
+        if dq <= 0.0:
+            break
+
+        active = np.zeros(n, dtype=bool)
+        active[d_] = True
+        active[mv] = True
+        # quem queria mover e não foi sorteado continua candidato
+        active[node[~pick]] = True
+        labels, tot = trial, tot_new
+        frac = min(1.0, 2.0 * frac)
+        if dq < LOUVAIN_TOL:
+            break
+    return labels, False
+
+
+def louvain(
+    n: int,
+    edges: np.ndarray,
+    *,
+    time_budget_s: float = LOUVAIN_TIME_BUDGET_S,
+    seed: int = 0,
+    max_levels: int = 32,
+) -> tuple[float, np.ndarray, bool]:
+    """Louvain vetorizado sobre a lista de arestas (não ponderada).
+
+    Args:
+        n: Número de vértices.
+        edges: (m,2) pares i<j sem duplicatas (formato do gerador).
+        time_budget_s: Teto de tempo; ao estourar, devolve a melhor partição até ali.
+        seed: Semente do sorteio de vértices que se movem (não usa o RNG da instância).
+        max_levels: Máximo de agregações.
+
+    Returns:
+        (Q, rótulos (n,) int64, truncado_pelo_orçamento).
+    """
+    deadline = time.perf_counter() + time_budget_s
+    rng = np.random.default_rng(seed)
+    e = np.asarray(edges, dtype=np.int64)
+    e = e[e[:, 0] != e[:, 1]]
+    u, v = e[:, 0], e[:, 1]
+    w = np.ones(u.size, dtype=np.float64)
+    self_w = np.zeros(n, dtype=np.float64)
+    membership = np.arange(n, dtype=np.int64)
+    truncated = False
+
+    for _ in range(max_levels):
+        nl = self_w.size
+        if u.size == 0:
+            break
+        # CSR simétrico do nível (arcos nos dois sentidos, agrupados por origem)
+        src = np.concatenate((u, v))
+        csr = np.argsort(src, kind="stable")
+        src = src[csr]
+        dst = np.concatenate((v, u))[csr]
+        ww = np.concatenate((w, w))[csr]
+        indptr = np.zeros(nl + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=nl), out=indptr[1:])
+        k = np.bincount(src, ww, minlength=nl) + 2.0 * self_w
+        two_m = float(k.sum())
+
+        labels, truncated = _local_moving(indptr, src, dst, ww, k, two_m, rng, deadline)
+        # compacta rótulos para 0..c-1
+        used = np.zeros(nl, dtype=bool)
+        used[labels] = True
+        remap = np.cumsum(used) - 1
+        labels = remap[labels]
+        c = int(used.sum())
+        membership = labels[membership]
+        if truncated or c == nl:
+            break
+
+        # agrega: arestas internas viram laço; externas somadas por par de comunidades
+        cu, cv = labels[u], labels[v]
+        intra = cu == cv
+        # pesos de laço ficam float64 (bincount ponderado; o stub tipa como inteiro)
+        self_w = (
+            np.bincount(labels, self_w, minlength=c) + np.bincount(cu[intra], w[intra], minlength=c)
+        ).astype(np.float64, copy=False)
+        a = np.minimum(cu[~intra], cv[~intra])
+        b = np.maximum(cu[~intra], cv[~intra])
+        key = a * c + b
+        order = np.argsort(key, kind="stable")
+        sk = key[order]
+        if sk.size:
+            first = np.empty(sk.size, dtype=bool)
+            first[0] = True
+            first[1:] = sk[1:] != sk[:-1]
+            starts = np.flatnonzero(first)
+            w = np.add.reduceat(w[~intra][order], starts)
+            u, v = sk[starts] // c, sk[starts] % c
+        else:
+            u = v = np.zeros(0, dtype=np.int64)
+            w = np.zeros(0, dtype=np.float64)
+
+    return modularity(e, membership), membership, truncated
@@ -0,0 +1,61 @@
+"""Leitura de `specs/budgets.yml`: orçamentos (NFE/tempo) e grades de hiperparâmetros."""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+BUDGETS_PATH = Path(__file__).resolve().parents[2] / "specs" / "budgets.yml"
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Um preset de `budgets:` (`type: nfe` limita avaliações; `type: time_s`, segundos)."""
+
+    name: str
+    type: str
+    value: float
+    checkpoint_every_nfe: int | None = None
+    time_cap_s: float | None = None
+
+    @property
+    def nfe_limit(self) -> int | None:
+        """Máximo de avaliações (None em orçamentos por tempo)."""
+        return int(self.value) if self.type == "nfe" else None
+
+    @property
+    def time_limit_s(self) -> float | None:
+        """Teto de parede: o próprio `value` (time_s) ou `time_cap_s` (nfe)."""
+        return float(self.value) if self.type == "time_s" else self.time_cap_s
+
+
+def load_budgets(path: Path = BUDGETS_PATH) -> dict[str, Any]:
+    """Carrega o YAML de orçamentos como dict."""
+    import yaml  # só aqui: `run_sa`/`run_ga` importam sem pyyaml
+
+    with Path(path).open(encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def get_budget(spec: dict[str, Any], name: str | None = None) -> Budget:
+    """Preset `name` (padrão: `defaults.budget_preset`) de um spec já carregado."""
+    name = name or spec.get("defaults", {}).get("budget_preset", "medium")
+    raw = spec["budgets"][name]
+    if raw["type"] not in ("nfe", "time_s"):
+        raise ValueError(f"budget {name!r}: type deve ser 'nfe' ou 'time_s'")
+    return Budget(
+        name=name,
+        type=raw["type"],
+        value=float(raw["value"]),
+        checkpoint_every_nfe=raw.get("checkpoint_every_nfe"),
+        time_cap_s=raw.get("time_cap_s"),
+    )
+
+
+def hyperparam_grid(spec: dict[str, Any], algo: str) -> list[dict[str, Any]]:
+    """Produto cartesiano de `algorithms.<algo>.hyperparams_grid`, na ordem declarada."""
+    grid = spec["algorithms"][algo].get("hyperparams_grid", {})
+    keys = list(grid)
+    return [dict(zip(keys, vals, strict=True)) for vals in itertools.product(*grid.values())]
@@ -0,0 +1,367 @@
+"""Algoritmo genético sobre uma população matricial (pop_size, n) de rótulos.
+
+Uma geração inteira é operada de uma vez com NumPy:
+
+- seleção: torneio binário pela energia (`objectives.energy`), sorteado em bloco;
+- cruzamento por grupos: cada cluster do pai A é herdado inteiro com prob. 1/2 e os
+  vértices restantes ficam com os clusters do pai B (restritos a eles). Todo cluster do
+  filho é subconjunto de um cluster de um pai, então a viabilidade Δv é preservada;
+- mutação (por gene, `mut_prob`): fusão do cluster de `u` com o de um vizinho e
+  movimento de `u` para o cluster de um vizinho, aceitos só se a amplitude resultante
+  ≤ Δv. No máximo um movimento/fusão chega a cada cluster por rodada, o que torna as
+  checagens feitas contra as estatísticas do início da rodada exatas;
+- avaliação: `evaluate_solutions` sobre a matriz de filhos (1 NFE por indivíduo).
+
+A população inicial vem da gulosa com Δv/2 (amplitude ≤ Δv) em ordens aleatórias.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+
+from heuristics.budgets import BUDGETS_PATH, get_budget, hyperparam_grid, load_budgets
+from heuristics.greedy import run_greedy_csr
+from heuristics.objectives import DELTA_V, energy, evaluate_solutions
+from heuristics.results import Checkpoint, write_budget_results, write_results
+from heuristics.trace import TraceRecorder
+
+
+@dataclass(frozen=True)
+class GAParams:
+    """Hiperparâmetros do GA (nomes de `specs/budgets.yml`)."""
+
+    pop_size: int = 50
+    cx_prob: float = 0.8
+    mut_prob: float = 0.1
+    elitism: int = 1
+
+
+@dataclass
+class GAResult:
+    """Melhor indivíduo de um run do GA."""
+
+    algo: ClassVar[str] = "ga"
+    params: GAParams
+    seed: int
+    labels: np.ndarray
+    objectives: tuple[float, float, float]
+    energy: float
+    nfe: int
+    generations: int
+    elapsed_s: float
+    status: str  # "ok" (orçamento de NFE cumprido) | "timeout" (teto de tempo)
+    checkpoints: list[Checkpoint] = field(default_factory=list)  # orçamentos menores
+
+    @property
+    def run_name(self) -> str:
+        """Nome estável do run (arquivos JSON/partição)."""
+        p = self.params
+        return f"ga_p{p.pop_size}_cx{p.cx_prob:g}_m{p.mut_prob:g}_e{p.elitism}_s{self.seed}"
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Contadores específicos do GA (vão para o JSON)."""
+        return {"generations": self.generations}
+
+
+def _compact(L: np.ndarray, span: int) -> np.ndarray:
+    """Renumera cada linha de `L` (rótulos em [0, span)) para 0..C-1, sem ordenação."""
+    P = L.shape[0]
+    key = np.arange(P, dtype=np.int64)[:, None] * span + L
+    present = np.zeros(P * span, dtype=bool)
+    present[key] = True
+    rank = np.cumsum(present) - 1
+    base = rank.reshape(P, span)[:, 0] + ~present.reshape(P, span)[:, 0]
+    return rank[key] - base[:, None]
+
+
+def _cluster_range(L: np.ndarray, vel: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Velocidade mín./máx. por (linha, rótulo), como matrizes (P, n)."""
+    P, n = L.shape
+    key = (np.arange(P, dtype=np.int64)[:, None] * n + L).ravel()
+    vv = np.broadcast_to(vel, (P, n)).ravel()
+    lo = np.full(P * n, np.inf)
+    np.minimum.at(lo, key, vv)
+    hi = np.full(P * n, -np.inf)
+    np.maximum.at(hi, key, vv)
+    return lo.reshape(P, n), hi.reshape(P, n)
+
+
+def _first_per_key(key: np.ndarray) -> np.ndarray:
+    """Máscara da 1ª ocorrência de cada valor de `key` (ordem preservada)."""
+    order = np.argsort(key, kind="stable")
+    first = np.ones(key.size, dtype=bool)
+    first[order[1:]] = key[order[1:]] != key[order[:-1]]
+    return first
+
+
+def _random_neighbor(
+    rng: np.random.Generator, indptr: np.ndarray, indices: np.ndarray, u: np.ndarray
+) -> np.ndarray:
+    """Um vizinho uniforme de cada vértice de `u` (o próprio vértice se isolado)."""
+    d = indptr[u + 1] - indptr[u]
+    off = np.minimum((rng.random(u.size) * d).astype(np.int64), np.maximum(d - 1, 0))
+    return np.where(d > 0, indices[np.minimum(indptr[u] + off, indices.size - 1)], u)
+
+
+def _mutate(
+    L: np.ndarray,
+    vel: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    rng: np.random.Generator,
+    mut_prob: float,
+    delta_v: float,
+) -> None:
+    """Fusões e movimentos viáveis in-place (uma rodada de cada) sobre a matriz `L`."""
+    P, n = L.shape
+    for phase in ("merge", "move"):
+        row, u = np.nonzero(rng.random((P, n)) < mut_prob)
+        if row.size == 0:
+            continue
+        j = _random_neighbor(rng, indptr, indices, u)
+        src, dst = L[row, u], L[row, j]
+        lo, hi = _cluster_range(L, vel)
+        if phase == "merge":
+            span = np.maximum(hi[row, src], hi[row, dst]) - np.minimum(lo[row, src], lo[row, dst])
+        else:
+            span = np.maximum(hi[row, dst], vel[u]) - np.minimum(lo[row, dst], vel[u])
+        ok = (src != dst) & (span <= delta_v)
+        row, u, src, dst = row[ok], u[ok], src[ok], dst[ok]
+        # um evento por cluster de destino (e, na fusão, por origem; origem ≠ destino alheio)
+        keep = _first_per_key(row * n + dst)
+        if phase == "merge":
+            keep &= _first_per_key(row * n + src)
+            is_dst = np.zeros(P * n, dtype=bool)
+            is_dst[(row * n + dst)[keep]] = True
+            keep &= ~is_dst[row * n + src]
+        row, u, src, dst = row[keep], u[keep], src[keep], dst[keep]
+        if phase == "merge":
+            remap = np.tile(np.arange(n), (P, 1))
+            remap[row, src] = dst
+            L[:] = np.take_along_axis(remap, L, axis=1)
+        else:
+            L[row, u] = dst
+
+
+def run_ga(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    velocities: np.ndarray,
+    params: GAParams,
+    seed: int,
+    *,
+    nfe_budget: int | None = None,
+    time_cap_s: float | None = None,
+    delta_v: float = DELTA_V,
+    weights: tuple[float, float, float] = (1.0, 1.0, 1.0),
+    trace: TraceRecorder | None = None,
+    trace_chain: int = 0,
+    checkpoints: Sequence[int] = (),
+) -> GAResult:
+    """Roda o GA até esgotar `nfe_budget` (indivíduos avaliados) ou `time_cap_s`.
+
+    Args:
+        indptr: (n+1,) ponteiros CSR da adjacência simétrica.
+        indices: Vizinhos concatenados.
+        velocities: (n,) velocidades.
+        params: Hiperparâmetros (pop_size, cx_prob, mut_prob, elitism).
+        seed: Semente do `default_rng` do run.
+        nfe_budget: Máximo de avaliações (a população inicial conta pop_size).
+        time_cap_s: Teto de parede (checado a cada geração).
+        delta_v: Tolerância de velocidade intra-cluster.
+        weights: Pesos de (f1, f2, f3) na energia.
+        trace: Recebe (nfe, f1, f2, f3) do melhor inicial e de cada melhora.
+        trace_chain: Valor do campo `chain` nos registros do traço.
+        checkpoints: NFEs (< `nfe_budget`) em que o melhor das avaliações feitas até ali é
+            guardado em `GAResult.checkpoints` (a fronteira pode cair no meio de uma
+            geração); igual ao run com esse orçamento se ele for ≥ pop_size.
+
+    Returns:
+        `GAResult` com o melhor indivíduo já avaliado.
+    """
+    if nfe_budget is None and time_cap_s is None:
+        raise ValueError("informe nfe_budget e/ou time_cap_s")
+    if not 0 <= params.elitism < params.pop_size:
+        raise ValueError("elitism deve estar em [0, pop_size)")
+    t0 = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    vel = np.asarray(velocities, dtype=np.float64)
+    n = vel.size
+    P = params.pop_size
+
+    def score(L: np.ndarray) -> tuple[np.ndarray, Any]:
+        ev = evaluate_solutions(L, vel, delta_v=delta_v)
+        return energy(ev.f1, ev.f2, ev.f3, n, weights), ev
+
+    cps = sorted(c for c in set(checkpoints) if c > 0 and (nfe_budget is None or c < nfe_budget))
+    snaps: list[Checkpoint] = []
+
+    def snapshot(nfe0: int, E_new: np.ndarray, L_new: np.ndarray, ev_new: Any) -> None:
+        # fronteiras em (nfe0, nfe0 + len(E_new)]: melhor do prefixo avaliado até cada uma
+        while cps and cps[0] <= nfe0 + E_new.size:
+            c = cps.pop(0)
+            j = int(np.argmin(E_new[: c - nfe0]))
+            if E_new[j] < best_E:
+                obj = (float(ev_new.f1[j]), float(ev_new.f2[j]), float(ev_new.f3[j]))
+                lab, e = L_new[j].copy(), float(E_new[j])
+            else:
+                obj, lab, e = best_obj, best_labels, best_E
+            t = time.perf_counter() - t0
+            snaps.append(Checkpoint(c, lab, obj, e, t, {"generations": generations}))
+
+    if nfe_budget is not None:
+        P = min(P, nfe_budget)
+    pop = np.stack(
+        [run_greedy_csr(indptr, indices, vel, delta_v / 2, rng.permutation(n)) for _ in range(P)]
+    )
+    E, ev = score(pop)
+    best_E, best_obj, best_labels = np.inf, (0.0, 0.0, 0.0), pop[0]
+    generations = 0
+    snapshot(0, E, pop, ev)
+    nfe = P
+    best = int(np.argmin(E))
+    best_E, best_labels = float(E[best]), pop[best].copy()
+    best_obj = (float(ev.f1[best]), float(ev.f2[best]), float(ev.f3[best]))
+    if trace is not None:
+        trace.begin_run()
+        trace.record(nfe, *best_obj, chain=trace_chain)
+    status = "ok"
+
+    while nfe_budget is None or nfe < nfe_budget:
+        if time_cap_s is not None and time.perf_counter() - t0 >= time_cap_s:
+            status = "timeout"
+            break
+        n_gen = P - params.elitism
+        # a última geração é gerada inteira (mesmos sorteios) e avaliada só no que cabe no
+        # orçamento: o run com orçamento menor é prefixo exato do maior (checkpoints)
+        n_off = n_gen if nfe_budget is None else min(n_gen, nfe_budget - nfe)
+        # torneio binário
+        cand = rng.integers(0, P, size=(2, n_gen, 2))
+        win = np.where(E[cand[..., 0]] <= E[cand[..., 1]], cand[..., 0], cand[..., 1])
+        A, B = pop[win[0]], pop[win[1]]
+        # cruzamento por grupos: clusters de A herdados inteiros, resto com clusters de B
+        coin = rng.random((n_gen, n)) < 0.5
+        inherit = np.take_along_axis(coin, A, axis=1)
+        inherit |= (rng.random(n_gen) >= params.cx_prob)[:, None]
+        child = _compact(np.where(inherit, A, B + n), 2 * n)
+        _mutate(child, vel, indptr, indices, rng, params.mut_prob, delta_v)
+        child = child[:n_off]
+
+        E_child, ev = score(child)
+        generations += 1
+        snapshot(nfe, E_child, child, ev)
+        nfe += n_off
+        i = int(np.argmin(E_child))
+        if E_child[i] < best_E:
+            best_E, best_labels = float(E_child[i]), child[i].copy()
+            best_obj = (float(ev.f1[i]), float(ev.f2[i]), float(ev.f3[i]))
+            if trace is not None:
+                trace.record(nfe, *best_obj, chain=trace_chain)
+
+        elite = np.argsort(E, kind="stable")[: P - n_off]
+        pop = np.concatenate((pop[elite], child))
+        E = np.concatenate((E[elite], E_child))
+
+    return GAResult(
+        params=params,
+        seed=int(seed),
+        labels=best_labels,
+        objectives=best_obj,
+        energy=best_E,
+        nfe=nfe,
+        generations=generations,
+        elapsed_s=time.perf_counter() - t0,
+        status=status,
+        checkpoints=snaps,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entrypoint: `python -m heuristics.ga --instance X --out-dir D [--budget small]`."""
+    ap = argparse.ArgumentParser(
+        prog="python -m heuristics.ga",
+        description="GA: cada ponto da grade `ga` de budgets.yml × sementes.",
+    )
+    ap.add_argument("--instance", type=Path, required=True, help=".json|.json.gz|.npyd")
+    ap.add_argument("--out-dir", type=Path, required=True)
+    ap.add_argument("--budgets", type=Path, default=BUDGETS_PATH)
+    ap.add_argument("--budget", default=None, help="Preset (padrão: defaults.budget_preset)")
+    ap.add_argument("--seeds", type=int, nargs="+", default=None)
+    ap.add_argument("--delta-v", type=float, default=DELTA_V)
+    ap.add_argument(
+        "--nfe-levels",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Orçamentos aninhados: um run no maior, resultados de todos em <out-dir>/nfe<N>/",
+    )
+    ap.add_argument("--no-trace", action="store_true", help="Não grava <out-dir>/ga.trace")
+    args = ap.parse_args(argv)
+
+    from hpc_framework.runner import load_instance
+    from hpc_framework.solvers.common import build_csr
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    spec = load_budgets(args.budgets)
+    budget = get_budget(spec, args.budget)
+    seeds: Sequence[int] = args.seeds if args.seeds is not None else spec["seeds"]["stochastic"]
+    inst = load_instance(args.instance, need_nodes=True)
+    if inst.velocities is None:
+        raise SystemExit("instância sem velocidades")
+    indptr, indices, _ = build_csr(inst.n, np.asarray(inst.edges))
+    trace_path = None if args.no_trace else args.out_dir / "ga.trace"
+    if trace_path is not None:
+        args.out_dir.mkdir(parents=True, exist_ok=True)
+    trace = TraceRecorder.from_budget(trace_path, spec, budget) if trace_path else None
+
+    runs = [(GAParams(**hp), seed) for hp in hyperparam_grid(spec, "ga") for seed in seeds]
+    results = [
+        run_ga(
+            indptr,
+            indices,
+            inst.velocities,
+            params,
+            seed,
+            nfe_budget=max(args.nfe_levels) if args.nfe_levels else budget.nfe_limit,
+            time_cap_s=budget.time_limit_s,
+            delta_v=args.delta_v,
+            trace=trace,
+            trace_chain=idx,
+            checkpoints=args.nfe_levels or (),
+        )
+        for idx, (params, seed) in enumerate(runs)
+    ]
+    if trace is not None:
+        trace.close()
+    if args.nfe_levels:
+        paths = write_budget_results(
+            results,
+            args.out_dir,
+            args.nfe_levels,
+            instance_id=inst.instance_id,
+            budget=budget,
+            trace_path=trace_path,
+        )
+    else:
+        paths = write_results(
+            results,
+            args.out_dir,
+            instance_id=inst.instance_id,
+            budget=budget,
+            trace_path=trace_path,
+        )
+    logging.info("%d runs (%s) gravados em %s", len(paths), budget.name, args.out_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,23 @@
-"""Heurística gulosa simples (demo/smoke) com barra de progresso."""
+"""Heurística gulosa de clusterização por velocidade.
+
+Dois motores com o mesmo resultado para a mesma ordem de sementes:
+
+- `run_greedy_heuristic`: sobre `nx.Graph` (demo/smoke, com barra de progresso);
+- `run_greedy_csr`: sobre adjacência CSR + array de velocidades, devolvendo um vetor de
+  rótulos. Cada cluster é a componente da semente no subgrafo dos vértices livres com
+  |v − v_semente| ≤ Δv, então a ordem de visita não altera o conjunto e a expansão é
+  feita por níveis (BFS vetorizada, bitmap de atribuídos, fronteira sem duplicatas).
+
+A ordem das sementes vem sempre de um `np.random.Generator` explícito (nunca do estado
+global do NumPy): `rng.permutation(n)` é a ordem da 1ª execução nos dois motores, e
+`run_greedy_restarts` avalia várias ordens numa chamada, ficando com a melhor.
+"""
 
 from __future__ import annotations
 
-# from typing import Iterable
+from collections.abc import Callable
+from dataclasses import dataclass
+
 import networkx as nx
 import numpy as np
 
@@ -14,23 +29,36 @@ except Exception:  # fallback: no-op, só itera
         return x
 
 
+from hpc_framework.solvers.common import build_csr
+
+
 def _get_velocity(G: nx.Graph, u) -> float:
     """Retorna atributo 'velocity' se existir; caso contrário, 1.0 (fallback)."""
     return float(G.nodes[u].get("velocity", 1.0))
 
 
-def run_greedy_heuristic(graph: nx.Graph, delta_v: float) -> list[set[int]]:
+def run_greedy_heuristic(
+    graph: nx.Graph,
+    delta_v: float,
+    rng: np.random.Generator | int | None = None,
+    *,
+    return_order: bool = False,
+) -> list[set[int]] | tuple[list[set[int]], list]:
     """Executa heurística gulosa simples com barra de progresso.
 
     Args:
         graph: Grafo de entrada (NetworkX).
         delta_v: Parâmetro de sensibilidade da alocação.
+        rng: Gerador (ou semente) que embaralha as sementes; None = entropia do SO.
+        return_order: Se True, devolve também a ordem de nós usada.
 
     Returns:
-        Uma lista de conjuntos de nós (clusters).
+        Uma lista de conjuntos de nós (clusters), ou (clusters, ordem).
     """
+    rng = np.random.default_rng(rng)
     nodes = list(graph.nodes())
-    np.random.shuffle(nodes)
+    nodes = [nodes[i] for i in rng.permutation(len(nodes)).tolist()]
+    order = list(nodes)
 
     clusters: list[set[int]] = []
     assigned_nodes: set[int] = set()
@@ -58,4 +86,129 @@ def run_greedy_heuristic(graph: nx.Graph, delta_v: float) -> list[set[int]]:
 
     # “Consumo” básico para smoke test (não quebra o fluxo)
     _ = sum(len(c) for c in clusters)
-    return clusters
+    return (clusters, order) if return_order else clusters
+
+
+def _neighbors(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """Vizinhos concatenados dos vértices de `frontier` (com repetições)."""
+    if frontier.size == 1:
+        u = int(frontier[0])
+        return indices[indptr[u] : indptr[u + 1]]
+    starts = indptr[frontier]
+    lens = indptr[frontier + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(lens) - lens), lens)
+    return indices[offsets + np.arange(int(lens.sum()), dtype=np.int64)]
+
+
+def run_greedy_csr(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    velocities: np.ndarray,
+    delta_v: float,
+    order: np.ndarray | None = None,
+) -> np.ndarray:
+    """Heurística gulosa sobre CSR; mesmos clusters de `run_greedy_heuristic` por ordem.
+
+    Args:
+        indptr: (n+1,) ponteiros CSR da adjacência simétrica.
+        indices: Vizinhos concatenados (0-based).
+        velocities: (n,) velocidade de cada vértice.
+        delta_v: Tolerância |v − v_semente| para entrar no cluster.
+        order: Ordem das sementes (permutação de 0..n-1); padrão 0..n-1.
+
+    Returns:
+        Rótulos (n,) int64; o cluster `c` é o c-ésimo criado na ordem das sementes.
+    """
+    n = int(indptr.size) - 1
+    vel = np.asarray(velocities, dtype=np.float64)
+    seeds = np.arange(n, dtype=np.int64) if order is None else np.asarray(order, dtype=np.int64)
+    labels = np.full(n, -1, dtype=np.int64)
+    stamp = np.empty(n, dtype=np.int64)  # deduplicação da fronteira sem sort
+    c = 0
+    for s in seeds.tolist():
+        if labels[s] >= 0:
+            continue
+        labels[s] = c
+        lo, hi = vel[s] - delta_v, vel[s] + delta_v
+        frontier = np.array([s], dtype=np.int64)
+        while frontier.size:
+            nb = _neighbors(indptr, indices, frontier)
+            nb = nb[labels[nb] < 0]
+            w = vel[nb]
+            nb = nb[(w >= lo) & (w <= hi)]
+            if nb.size == 0:
+                break
+            labels[nb] = c
+            pos = np.arange(nb.size)
+            stamp[nb] = pos
+            frontier = nb[stamp[nb] == pos]
+        c += 1
+    return labels
+
+
+def run_greedy_arrays(
+    n: int,
+    edges: np.ndarray,
+    velocities: np.ndarray,
+    delta_v: float,
+    order: np.ndarray | None = None,
+) -> np.ndarray:
+    """Atalho: monta o CSR a partir de (m,2) arestas e chama `run_greedy_csr`."""
+    indptr, indices, _ = build_csr(n, np.asarray(edges).reshape(-1, 2))
+    return run_greedy_csr(indptr, indices, velocities, delta_v, order)
+
+
+def labels_to_clusters(labels: np.ndarray) -> list[set[int]]:
+    """Converte rótulos 0..C-1 no formato `list[set[int]]` de `run_greedy_heuristic`."""
+    labels = np.asarray(labels)
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    return [set(part.tolist()) for part in np.split(order, bounds)] if labels.size else []
+
+
+@dataclass
+class GreedyResult:
+    """Melhor execução de `run_greedy_restarts` (+ escore de todas as ordens)."""
+
+    labels: np.ndarray  # (n,) rótulos da melhor ordem
+    order: np.ndarray  # (n,) ordem de sementes que a produziu
+    score: float
+    restart: int  # índice da melhor ordem (a 1ª, em caso de empate)
+    scores: np.ndarray  # (R,) escore de cada ordem, na ordem sorteada
+
+
+def num_clusters(labels: np.ndarray) -> float:
+    """Escore padrão das reinicializações: nº de clusters (menor é melhor)."""
+    return float(labels.max()) + 1.0 if labels.size else 0.0
+
+
+def run_greedy_restarts(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    velocities: np.ndarray,
+    delta_v: float,
+    *,
+    restarts: int = 1,
+    rng: np.random.Generator | int | None = None,
+    score: Callable[[np.ndarray], float] = num_clusters,
+) -> GreedyResult:
+    """Gulosa multi-start determinística: `restarts` ordens de `rng`, fica a melhor.
+
+    A ordem r é a r-ésima `rng.permutation(n)`, então a mesma semente reproduz toda a
+    varredura (e a ordem 0 coincide com `run_greedy_heuristic(..., rng=semente)` quando
+    os nós do grafo são 0..n-1 em ordem). `score` recebe os rótulos; menor é melhor.
+    """
+    if restarts < 1:
+        raise ValueError("restarts deve ser >= 1")
+    rng = np.random.default_rng(rng)
+    n = int(indptr.size) - 1
+    scores = np.empty(restarts, dtype=np.float64)
+    best: GreedyResult | None = None
+    for r in range(restarts):
+        order = rng.permutation(n)
+        labels = run_greedy_csr(indptr, indices, velocities, delta_v, order)
+        scores[r] = score(labels)
+        if best is None or scores[r] < best.score:
+            best = GreedyResult(labels, order, float(scores[r]), r, scores)
+    assert best is not None
+    return best
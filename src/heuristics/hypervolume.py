@@ -0,0 +1,449 @@
+"""Hypervolume (HV) exato de frentes de Pareto (minimização), métrica central do protocolo.
+
+- 2-D: varredura ordenada, vetorizada.
+- 3-D: varredura em z com escada 2-D (x crescente, y decrescente) em listas Python,
+  localizada por bisect (Beume et al., 2009); cada ponto entra e sai da escada no máximo
+  uma vez, então são O(n log n) comparações, mas cada inserção é um `xs[j:k] = [px]`
+  O(n) (memmove): pior caso O(n²), desprezível nos tamanhos de frente do protocolo.
+  A área da escada é atualizada incrementalmente.
+- d > 3: recursão WFG (While et al., 2012) — HV = Σ contribuições exclusivas, cada uma
+  = caixa do ponto − HV do conjunto-limite —, descendo até a base 3-D.
+
+`hypervolume_batch` avalia milhares de frentes numa chamada: um único `lexsort` agrupa
+por frente e ordena por z, e a varredura 3-D percorre todas em sequência.
+`contributions`/`contributions_batch` dão a contribuição exclusiva de cada ponto (0 para
+dominados/repetidos); em 3-D, uma varredura em z com a "sombra" de cada degrau da escada
+(Emmerich & Fonseca, 2011) em vez de um HV por ponto removido.
+
+Normalização (protocolo §4.4, `specs/bounds.json`): (f1, f2, f3) ↔ (`neg_fo1`,
+`num_clusters_norm`, `desvio_vel`), cada um levado a [0, 1] por (f − min)/(max − min);
+com `overflow_policy: cap_and_flag`, valores fora são truncados e sinalizados. O ponto de
+referência é {1.1, 1.1, 1.1}.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import operator
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from heuristics.objectives import DELTA_V, V_MAX
+
+BOUNDS_PATH = Path(__file__).resolve().parents[2] / "specs" / "bounds.json"
+BOUNDS_KEYS = ("neg_fo1", "num_clusters_norm", "desvio_vel")
+REF_POINT = (1.1, 1.1, 1.1)
+
+_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+# ------------------------------ normalização ------------------------------
+
+
+def _eval_bound(expr: float | str, env: dict[str, float]) -> float:
+    """Avalia um limite de `bounds.json` (número ou expressão em |V|, delta_v, v_max)."""
+    if isinstance(expr, int | float):
+        return float(expr)
+
+    def ev(node: ast.AST) -> float:
+        if isinstance(node, ast.Constant) and isinstance(node.value, int | float):
+            return float(node.value)
+        if isinstance(node, ast.Name) and node.id in env:
+            return env[node.id]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub | ast.UAdd):
+            v = ev(node.operand)
+            return -v if isinstance(node.op, ast.USub) else v
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            return _BINOPS[type(node.op)](ev(node.left), ev(node.right))
+        raise ValueError(f"expressão de limite não suportada: {expr!r}")
+
+    return ev(ast.parse(expr.replace("|V|", "n"), mode="eval").body)
+
+
+def load_bounds(path: Path = BOUNDS_PATH) -> dict[str, Any]:
+    """Carrega `specs/bounds.json`."""
+    with Path(path).open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_bounds(
+    bounds: dict[str, Any], n: int, *, delta_v: float = DELTA_V
+) -> tuple[np.ndarray, np.ndarray]:
+    """Limites (lo, hi) numéricos de (f1, f2, f3) para uma instância com `n` vértices."""
+    env = {"n": float(n), "delta_v": float(delta_v), "v_max": V_MAX}
+    lo = np.array([_eval_bound(bounds[k]["min"], env) for k in BOUNDS_KEYS])
+    hi = np.array([_eval_bound(bounds[k]["max"], env) for k in BOUNDS_KEYS])
+    if np.any(hi <= lo):
+        raise ValueError(f"bounds degenerados para n={n}: min={lo}, max={hi}")
+    return lo, hi
+
+
+def normalize_objectives(
+    F: np.ndarray,
+    n: int,
+    *,
+    bounds: dict[str, Any] | None = None,
+    delta_v: float = DELTA_V,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Leva (f1, f2, f3) a [0, 1] pelos bounds do protocolo.
+
+    Args:
+        F: (m, 3) objetivos brutos (linhas de `SolutionBatchEval.objectives`).
+        n: Número de vértices da instância (|V| nas expressões dos bounds).
+        bounds: Conteúdo de `bounds.json` (padrão: `specs/bounds.json`).
+        delta_v: Valor de `delta_v` nas expressões.
+
+    Returns:
+        (Fn, overflow): objetivos normalizados (m, 3) e máscara (m,) das linhas truncadas
+        (`cap_and_flag`); com outra política, nada é truncado e a máscara só sinaliza.
+    """
+    bounds = load_bounds() if bounds is None else bounds
+    lo, hi = resolve_bounds(bounds, n, delta_v=delta_v)
+    Fn = (np.asarray(F, dtype=np.float64).reshape(-1, 3) - lo) / (hi - lo)
+    overflow = np.any((Fn < 0.0) | (Fn > 1.0), axis=1)
+    if bounds.get("overflow_policy", "cap_and_flag") == "cap_and_flag":
+        Fn = np.clip(Fn, 0.0, 1.0)
+    return Fn, overflow
+
+
+# ------------------------------ núcleos ------------------------------
+
+
+def _hv2d(P: np.ndarray, ref: np.ndarray) -> float:
+    """HV 2-D de pontos já dentro da caixa de referência."""
+    if P.shape[0] == 0:
+        return 0.0
+    P = P[np.lexsort((P[:, 1], P[:, 0]))]
+    best_y = np.minimum.accumulate(P[:, 1])
+    x_next = np.append(P[1:, 0], ref[0])
+    return float(np.sum((x_next - P[:, 0]) * (ref[1] - best_y)))
+
+
+def _sweep3d(P: np.ndarray, ref: np.ndarray, group: np.ndarray | None = None) -> np.ndarray:
+    """HV 3-D por grupo; `P` ordenado por (grupo, z) e dentro da caixa de referência."""
+    m = P.shape[0]
+    if group is None:
+        group = np.zeros(m, dtype=np.int64)
+    n_groups = int(group[-1]) + 1 if m else 0
+    out = np.zeros(n_groups)
+    rx, ry, rz = (float(r) for r in ref)
+    X, Y, Z, G = P[:, 0].tolist(), P[:, 1].tolist(), P[:, 2].tolist(), group.tolist()
+    xs: list[float] = []
+    ys: list[float] = []
+    area = vol = 0.0
+    for t in range(m):
+        px, py, g = X[t], Y[t], G[t]
+        if t and g != G[t - 1]:  # novo grupo: fecha o anterior
+            out[G[t - 1]] = vol + area * (rz - Z[t - 1])
+            xs, ys, area, vol = [], [], 0.0, 0.0
+        elif t:
+            vol += area * (Z[t] - Z[t - 1])
+        j = bisect_left(xs, px)
+        if (j < len(xs) and xs[j] == px and ys[j] <= py) or (j and ys[j - 1] <= py):
+            continue  # dominado (em x, y) por um ponto de z menor ou igual
+        # área ganha: [px, x_j) com a altura do vizinho à esquerda, depois cada removido
+        h = ys[j - 1] if j else ry
+        k = j
+        while k < len(xs) and ys[k] >= py:
+            area += (xs[k] - (xs[k - 1] if k > j else px)) * (h - py)
+            h = ys[k]
+            k += 1
+        area += ((xs[k] if k < len(xs) else rx) - (xs[k - 1] if k > j else px)) * (h - py)
+        xs[j:k] = [px]
+        ys[j:k] = [py]
+    if m:
+        out[G[-1]] = vol + area * (rz - Z[-1])
+    return out
+
+
+def _stair_add(
+    xs: list[float], ys: list[float], px: float, py: float, X: float, Y: float
+) -> tuple[int, int, float] | None:
+    """Posição (j, k) de (px, py) numa escada limitada por (X, Y) e a área que ele ganha.
+
+    Devolve None se o ponto é dominado; senão as entradas `j:k` são as que ele domina
+    (o chamador faz o splice).
+    """
+    j = bisect_left(xs, px)
+    if (j < len(xs) and xs[j] == px and ys[j] <= py) or (j and ys[j - 1] <= py):
+        return None
+    h = ys[j - 1] if j else Y
+    gain = 0.0
+    k = j
+    while k < len(xs) and ys[k] >= py:
+        gain += (xs[k] - (xs[k - 1] if k > j else px)) * (h - py)
+        h = ys[k]
+        k += 1
+    gain += ((xs[k] if k < len(xs) else X) - (xs[k - 1] if k > j else px)) * (h - py)
+    return j, k, gain
+
+
+def _stair_area(xs: list[float], ys: list[float], X: float, Y: float) -> float:
+    """Área coberta por uma escada dentro da caixa limitada por (X, Y)."""
+    area = 0.0
+    for i in range(len(xs)):
+        area += ((xs[i + 1] if i + 1 < len(xs) else X) - xs[i]) * (Y - ys[i])
+    return area
+
+
+def _contrib3d(P: np.ndarray, ref: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """Contribuição exclusiva 3-D por linha; `P` ordenado por (grupo, z, x, y), sem repetidos.
+
+    Varredura em z (Emmerich & Fonseca, 2011): na fatia de altura z, a área exclusiva de
+    um degrau q da escada é o retângulo até os vizinhos menos a "sombra" — a escada dos
+    pontos dominados (em x, y) só por q. Inserir um degrau só mexe nos vizinhos (que
+    perdem a parte da sombra agora também dominada pelo novo ponto) e nos degraus
+    removidos, que viram a sombra do novo; um ponto dominado só por q entra na sombra
+    de q. Cada degrau acumula área × Δz apenas quando sua área muda. Custo: o de
+    `_sweep3d` mais o recálculo da sombra dos dois vizinhos a cada degrau inserido.
+    """
+    m = P.shape[0]
+    out = np.zeros(m)
+    rx, ry, rz = (float(r) for r in ref)
+    X, Y, Z, G = P[:, 0].tolist(), P[:, 1].tolist(), P[:, 2].tolist(), group.tolist()
+    xs: list[float] = []  # escada (x ↑, y ↓) e dados por degrau, listas paralelas
+    ys: list[float] = []
+    ids: list[int] = []
+    shadow: list[tuple[list[float], list[float]]] = []
+    cov: list[float] = []  # área da sombra dentro do retângulo do degrau
+    area: list[float] = []  # área exclusiva corrente
+    since: list[float] = []  # z da última atualização de `area`
+
+    def settle(i: int, z: float) -> None:
+        out[ids[i]] += area[i] * (z - since[i])
+        since[i] = z
+
+    def refresh(i: int) -> None:
+        bx = xs[i + 1] if i + 1 < len(xs) else rx
+        by = ys[i - 1] if i else ry
+        area[i] = (bx - xs[i]) * (by - ys[i]) - cov[i]
+
+    for t in range(m):
+        px, py, z = X[t], Y[t], Z[t]
+        if t and G[t] != G[t - 1]:  # novo grupo: fecha o anterior
+            for i in range(len(xs)):
+                settle(i, rz)
+            xs, ys, ids, shadow, cov, area, since = [], [], [], [], [], [], []
+        q = bisect_right(xs, px) - 1  # último degrau com x <= px
+        if q >= 0 and ys[q] <= py:  # dominado em (x, y)
+            if q and ys[q - 1] <= py:
+                continue  # dois ou mais dominadores: nunca será exclusivo de ninguém
+            sx, sy = shadow[q]
+            bx = xs[q + 1] if q + 1 < len(xs) else rx
+            by = ys[q - 1] if q else ry
+            hit = _stair_add(sx, sy, px, py, bx, by)
+            if hit is None:
+                continue
+            j, k, gain = hit
+            sx[j:k] = [px]
+            sy[j:k] = [py]
+            settle(q, z)
+            cov[q] += gain
+            refresh(q)
+            continue
+
+        j = bisect_left(xs, px)
+        k = j
+        while k < len(xs) and ys[k] >= py:
+            settle(k, z)
+            k += 1
+        if j:  # vizinho à esquerda: sombra com x >= px passa a ser dominada por p também
+            settle(j - 1, z)
+            sx, sy = shadow[j - 1]
+            cut = bisect_left(sx, px)
+            del sx[cut:], sy[cut:]
+            cov[j - 1] = _stair_area(sx, sy, px, ys[j - 2] if j > 1 else ry)
+        if k < len(xs):  # vizinho à direita: idem para y >= py
+            settle(k, z)
+            sx, sy = shadow[k]
+            cut = 0
+            while cut < len(sy) and sy[cut] >= py:
+                cut += 1
+            del sx[:cut], sy[:cut]
+            cov[k] = _stair_area(sx, sy, xs[k + 1] if k + 1 < len(xs) else rx, py)
+        # os degraus removidos (já uma escada) viram a sombra de p
+        sx, sy = xs[j:k], ys[j:k]
+        c = _stair_area(sx, sy, xs[k] if k < len(xs) else rx, ys[j - 1] if j else ry)
+        xs[j:k], ys[j:k], ids[j:k] = [px], [py], [t]
+        shadow[j:k], cov[j:k], area[j:k], since[j:k] = [(sx, sy)], [c], [0.0], [z]
+        for i in range(max(j - 1, 0), min(j + 2, len(xs))):
+            refresh(i)
+    for i in range(len(xs)):
+        settle(i, rz)
+    return out
+
+
+def _inside(P: np.ndarray, ref: np.ndarray) -> np.ndarray:
+    """Linhas estritamente dominantes da referência (as demais não somam volume)."""
+    return np.all(ref > P, axis=1)
+
+
+def _wfg(P: np.ndarray, ref: np.ndarray) -> float:
+    """HV por WFG para d ≥ 2 (base 2-D/3-D pelas varreduras)."""
+    d = P.shape[1]
+    if P.shape[0] == 0:
+        return 0.0
+    if d == 2:
+        return _hv2d(P, ref)
+    if d == 3:
+        return float(_sweep3d(P[np.argsort(P[:, 2], kind="stable")], ref)[0])
+    P = P[np.argsort(P[:, -1], kind="stable")[::-1]]  # pior último objetivo primeiro
+    total = 0.0
+    for i in range(P.shape[0]):
+        box = float(np.prod(ref - P[i]))
+        limit = np.maximum(P[i + 1 :], P[i])
+        total += box - _wfg(_nondominated(limit), ref)
+    return total
+
+
+def _nondominated(P: np.ndarray) -> np.ndarray:
+    """Pontos não dominados de `P` (sem repetições)."""
+    if P.shape[0] <= 1:
+        return P
+    P = np.unique(P, axis=0)
+    le = np.all(P[:, None, :] <= P[None, :, :], axis=2)
+    lt = np.any(P[:, None, :] < P[None, :, :], axis=2)
+    dominated = np.any(le & lt, axis=0)
+    return P[~dominated]
+
+
+# ------------------------------ API ------------------------------
+
+
+def hypervolume(F: np.ndarray, ref: np.ndarray | tuple[float, ...] = REF_POINT) -> float:
+    """HV exato de uma frente (m, d) em relação a `ref` (minimização).
+
+    Pontos dominados, repetidos ou fora da caixa de `ref` são aceitos e não somam volume.
+    """
+    P = np.asarray(F, dtype=np.float64)
+    r = np.asarray(ref, dtype=np.float64)
+    if P.ndim != 2 or P.shape[1] != r.size:
+        raise ValueError(f"F deve ter shape (m, {r.size})")
+    P = P[_inside(P, r)]
+    if r.size == 1:
+        return float(r[0] - P[:, 0].min()) if P.size else 0.0
+    return _wfg(P, r)
+
+
+def hypervolume_batch(
+    F: np.ndarray,
+    front_ids: np.ndarray,
+    ref: np.ndarray | tuple[float, ...] = REF_POINT,
+    *,
+    num_fronts: int | None = None,
+) -> np.ndarray:
+    """HV de muitas frentes numa chamada.
+
+    Args:
+        F: (m, d) pontos de todas as frentes concatenados.
+        front_ids: (m,) índice inteiro da frente de cada ponto (qualquer ordem).
+        ref: Ponto de referência comum.
+        num_fronts: Tamanho da saída (padrão: max(front_ids) + 1; frentes vazias = 0).
+
+    Returns:
+        (num_fronts,) HVs.
+    """
+    P = np.asarray(F, dtype=np.float64)
+    ids = np.asarray(front_ids, dtype=np.int64)
+    r = np.asarray(ref, dtype=np.float64)
+    if P.ndim != 2 or P.shape[1] != r.size or ids.shape != (P.shape[0],):
+        raise ValueError(f"F deve ter shape (m, {r.size}) e front_ids (m,)")
+    K = int(num_fronts) if num_fronts is not None else (int(ids.max()) + 1 if ids.size else 0)
+    out = np.zeros(K)
+    keep = _inside(P, r)
+    P, ids = P[keep], ids[keep]
+    if P.shape[0] == 0:
+        return out
+    d = r.size
+    if d == 2:  # fatia 3-D de altura 1: mesma varredura, volume = área
+        P, r, d = np.column_stack((P, np.zeros(P.shape[0]))), np.append(r, 1.0), 3
+    if d == 3:
+        order = np.lexsort((P[:, 2], ids))
+        ids = ids[order]
+        start = np.r_[True, ids[1:] != ids[:-1]]
+        out[ids[start]] = _sweep3d(P[order], r, np.cumsum(start) - 1)
+    else:
+        for k in np.unique(ids):
+            out[k] = _wfg(P[ids == k], r)
+    return out
+
+
+def _contributions_wfg(P: np.ndarray, r: np.ndarray) -> np.ndarray:
+    """Contribuições por remoção, ponto a ponto (d ∉ {2, 3}; P dentro de `ref`)."""
+    out = np.zeros(P.shape[0])
+    for a in range(P.shape[0]):
+        p = P[a]
+        others = np.delete(P, a, axis=0)
+        if np.any(np.all(others <= p, axis=1)):
+            continue  # dominado ou repetido: remover não muda o HV
+        out[a] = float(np.prod(r - p)) - hypervolume(np.maximum(others, p), r)
+    return out
+
+
+def contributions(F: np.ndarray, ref: np.ndarray | tuple[float, ...] = REF_POINT) -> np.ndarray:
+    """Contribuição exclusiva de cada ponto: HV(F) − HV(F sem o ponto).
+
+    Em 2-D/3-D, uma única varredura (`contributions_batch`); para d > 3, caixa do ponto −
+    HV do conjunto-limite max(p, q), q ≠ p. Pontos dominados, repetidos ou fora de `ref`
+    têm contribuição 0.
+    """
+    P = np.asarray(F, dtype=np.float64)
+    r = np.asarray(ref, dtype=np.float64)
+    if P.ndim != 2 or P.shape[1] != r.size:
+        raise ValueError(f"F deve ter shape (m, {r.size})")
+    return contributions_batch(P, np.zeros(P.shape[0], dtype=np.int64), r)
+
+
+def contributions_batch(
+    F: np.ndarray,
+    front_ids: np.ndarray,
+    ref: np.ndarray | tuple[float, ...] = REF_POINT,
+) -> np.ndarray:
+    """Contribuições exclusivas de todos os pontos de muitas frentes numa chamada.
+
+    Args:
+        F: (m, d) pontos de todas as frentes concatenados.
+        front_ids: (m,) índice inteiro da frente de cada ponto (qualquer ordem).
+        ref: Ponto de referência comum.
+
+    Returns:
+        (m,) contribuição de cada linha de `F` dentro da própria frente.
+    """
+    P = np.asarray(F, dtype=np.float64)
+    ids = np.asarray(front_ids, dtype=np.int64)
+    r = np.asarray(ref, dtype=np.float64)
+    if P.ndim != 2 or P.shape[1] != r.size or ids.shape != (P.shape[0],):
+        raise ValueError(f"F deve ter shape (m, {r.size}) e front_ids (m,)")
+    out = np.zeros(P.shape[0])
+    keep = np.flatnonzero(_inside(P, r))
+    if keep.size == 0:
+        return out
+    P, ids = P[keep], ids[keep]
+    d = r.size
+    if d == 2:  # fatia 3-D de altura 1: mesma varredura, volume = área
+        P, r, d = np.column_stack((P, np.zeros(P.shape[0]))), np.append(r, 1.0), 3
+    if d != 3:
+        for k in np.unique(ids):
+            sel = ids == k
+            out[keep[sel]] = _contributions_wfg(P[sel], r)
+        return out
+    order = np.lexsort((P[:, 1], P[:, 0], P[:, 2], ids))
+    P, ids, keep = P[order], ids[order], keep[order]
+    # repetidos (linhas adjacentes após a ordenação) contribuem 0 e entram uma só vez
+    same = np.r_[False, (ids[1:] == ids[:-1]) & np.all(P[1:] == P[:-1], axis=1)]
+    first = ~same
+    dup = same | np.r_[same[1:], False]
+    start = np.r_[True, ids[first][1:] != ids[first][:-1]]
+    contrib = _contrib3d(P[first], r, np.cumsum(start) - 1)
+    contrib[dup[first]] = 0.0
+    out[keep[first]] = contrib
+    return out
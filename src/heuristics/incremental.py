@@ -0,0 +1,249 @@
+"""Avaliação incremental de f1/f2/f3 para movimentos de um vértice (SA, GA, busca local).
+
+`IncrementalObjectives` mantém, por cluster, tamanho, soma e soma dos quadrados das
+velocidades e dois heaps (mín. e máx.) com remoção preguiçosa: uma entrada `(v, i)` do
+heap do cluster `c` só vale enquanto `labels[i] == c`. Assim o ganho de mover o vértice
+`i` para `c` (`delta`) sai em O(log |C|) amortizado — só os clusters de origem e destino
+mudam —, e `apply`/`undo` atualizam/restauram o estado exatamente.
+
+NFE (número de avaliações, `specs/budgets.yml`): a avaliação completa inicial e cada
+`delta` contam 1; `apply` e `undo` não contam (aplicar um vizinho já avaliado é grátis).
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from heuristics.objectives import DELTA_V
+
+
+class MoveDelta(NamedTuple):
+    """Variação dos objetivos ao mover um vértice (+ viabilidade Δv resultante)."""
+
+    df1: float
+    df2: float
+    df3: float
+    feasible: bool
+
+
+def _cv(size: int, s: float, sq: float) -> float:
+    """CV populacional a partir de (tamanho, soma, soma dos quadrados)."""
+    if size <= 1:
+        return 0.0
+    mean = s / size
+    return math.sqrt(max(sq / size - mean * mean, 0.0)) / mean
+
+
+class IncrementalObjectives:
+    """Estado de uma partição com avaliação O(log |C|) de movimentos de um vértice.
+
+    Args:
+        labels: (n,) rótulos em [0, n); ids vazios ficam disponíveis para novos clusters.
+        velocities: (n,) velocidades.
+        delta_v: Tolerância de velocidade intra-cluster (viabilidade).
+    """
+
+    def __init__(
+        self, labels: np.ndarray, velocities: np.ndarray, *, delta_v: float = DELTA_V
+    ) -> None:
+        """Monta o estado por cluster (avaliação completa inicial: 1 NFE)."""
+        lab = np.asarray(labels, dtype=np.int64)
+        vel = np.asarray(velocities, dtype=np.float64)
+        n = lab.size
+        if vel.shape != (n,) or n == 0:
+            raise ValueError("labels e velocities devem ter o mesmo shape (n,), n >= 1")
+        if int(lab.min()) < 0 or int(lab.max()) >= n:
+            raise ValueError(f"labels devem estar em [0, {n})")
+        self.n = n
+        self.delta_v = float(delta_v)
+        self.labels = lab.tolist()
+        self.vel = vel.tolist()
+        self.size = np.bincount(lab, minlength=n).tolist()
+        self.sum = np.bincount(lab, weights=vel, minlength=n).tolist()
+        self.sumsq = np.bincount(lab, weights=vel * vel, minlength=n).tolist()
+        self._min: list[list[tuple[float, int]]] = [[] for _ in range(n)]
+        self._max: list[list[tuple[float, int]]] = [[] for _ in range(n)]
+        for i, (c, v) in enumerate(zip(self.labels, self.vel, strict=True)):
+            self._min[c].append((v, i))
+            self._max[c].append((-v, i))
+        for c in range(n):
+            heapq.heapify(self._min[c])
+            heapq.heapify(self._max[c])
+        self._free = [c for c in range(n - 1, -1, -1) if self.size[c] == 0]
+        self._undo: list[tuple | None] = []  # None: `apply` sem efeito (i já em c)
+
+        occupied = [c for c in range(n) if self.size[c]]
+        self.num_clusters = len(occupied)
+        self.fo1 = sum(self.size[c] * self._top(c, -1, self._min) for c in occupied)
+        self.cv_sum = sum(_cv(self.size[c], self.sum[c], self.sumsq[c]) for c in occupied)
+        self.n_infeasible = sum(self._spread(c, -1) > self.delta_v for c in occupied)
+        self.nfe = 1
+
+    # ------------------------------ consultas ------------------------------
+
+    @property
+    def objectives(self) -> tuple[float, float, float]:
+        """(f1, f2, f3) da partição corrente."""
+        return -self.fo1, self.num_clusters / self.n, self.cv_sum / self.num_clusters
+
+    @property
+    def feasible(self) -> bool:
+        """Todos os clusters respeitam max − min ≤ Δv."""
+        return self.n_infeasible == 0
+
+    def labels_array(self) -> np.ndarray:
+        """Cópia dos rótulos correntes como array (n,) int64."""
+        return np.asarray(self.labels, dtype=np.int64)
+
+    def empty_cluster(self) -> int:
+        """Um id de cluster sem vértices (destino de um movimento que cria cluster)."""
+        while self._free and self.size[self._free[-1]]:
+            self._free.pop()
+        if not self._free:  # impossível com n ids e n vértices, salvo todos ocupados
+            raise ValueError("não há id de cluster livre")
+        return self._free[-1]
+
+    def _top(self, c: int, skip: int, heaps: list[list[tuple[float, int]]]) -> float:
+        """Valor do topo válido do heap de `c` ignorando o vértice `skip` (sinal do heap)."""
+        h = heaps[c]
+        labels = self.labels
+        while h and labels[h[0][1]] != c:  # limpa entradas de quem saiu
+            heapq.heappop(h)
+        if not h or h[0][1] != skip:
+            return h[0][0] if h else math.inf
+        held = []
+        while h and (h[0][1] == skip or labels[h[0][1]] != c):
+            e = heapq.heappop(h)
+            if e[1] == skip:
+                held.append(e)
+        top = h[0][0] if h else math.inf
+        for e in held:
+            heapq.heappush(h, e)
+        return top
+
+    def _spread(self, c: int, skip: int, extra: float | None = None) -> float:
+        """Amplitude (máx − mín) de `c` sem `skip` e com a velocidade `extra` (se houver)."""
+        lo = self._top(c, skip, self._min)
+        hi = -self._top(c, skip, self._max)
+        if extra is not None:
+            lo, hi = min(lo, extra), max(hi, extra)
+        return hi - lo if hi >= lo else 0.0
+
+    def delta(self, i: int, c: int) -> MoveDelta:
+        """Variação de (f1, f2, f3) ao mover o vértice `i` para o cluster `c` (1 NFE)."""
+        self.nfe += 1
+        a = self.labels[i]
+        if a == c:
+            return MoveDelta(0.0, 0.0, 0.0, self.n_infeasible == 0)
+        v = self.vel[i]
+        sa, sb = self.size[a], self.size[c]
+
+        # origem sem i
+        a_min_old = self._top(a, -1, self._min)
+        a_min_new = self._top(a, i, self._min) if sa > 1 else 0.0
+        d_fo1 = (sa - 1) * a_min_new - sa * a_min_old
+        cv_a_old = _cv(sa, self.sum[a], self.sumsq[a])
+        cv_a_new = _cv(sa - 1, self.sum[a] - v, self.sumsq[a] - v * v)
+        inf_a_old = self._spread(a, -1) > self.delta_v
+        inf_a_new = sa > 1 and self._spread(a, i) > self.delta_v
+        # destino com i
+        if sb:
+            b_min_old = self._top(c, -1, self._min)
+            d_fo1 += (sb + 1) * min(b_min_old, v) - sb * b_min_old
+            inf_b_old = self._spread(c, -1) > self.delta_v
+            inf_b_new = self._spread(c, -1, v) > self.delta_v
+        else:
+            d_fo1 += v
+            inf_b_old = inf_b_new = False
+        cv_b_old = _cv(sb, self.sum[c], self.sumsq[c])
+        cv_b_new = _cv(sb + 1, self.sum[c] + v, self.sumsq[c] + v * v)
+
+        k_new = self.num_clusters - (sa == 1) + (sb == 0)
+        cv_new = self.cv_sum + cv_a_new - cv_a_old + cv_b_new - cv_b_old
+        infeasible = self.n_infeasible - inf_a_old + inf_a_new - inf_b_old + inf_b_new
+        return MoveDelta(
+            -d_fo1,
+            (k_new - self.num_clusters) / self.n,
+            cv_new / k_new - self.cv_sum / self.num_clusters,
+            infeasible == 0,
+        )
+
+    # ------------------------------ mutação ------------------------------
+
+    def apply(self, i: int, c: int) -> None:
+        """Move `i` para `c` (0 NFE); o estado anterior vai para a pilha de `undo`."""
+        a = self.labels[i]
+        if a == c:
+            self._undo.append(None)
+            return
+        self._undo.append(
+            (
+                i,
+                a,
+                c,
+                (self.sum[a], self.sumsq[a], self.sum[c], self.sumsq[c]),
+                (self.fo1, self.cv_sum, self.num_clusters, self.n_infeasible),
+            )
+        )
+        self._move(i, a, c)
+
+    def undo(self) -> None:
+        """Desfaz o último `apply` restaurando somas e objetivos bit a bit."""
+        rec = self._undo.pop()
+        if rec is None:
+            return
+        i, a, c, sums, objs = rec
+        self._move(i, c, a)
+        self.sum[a], self.sumsq[a], self.sum[c], self.sumsq[c] = sums
+        self.fo1, self.cv_sum, self.num_clusters, self.n_infeasible = objs
+
+    def commit(self) -> None:
+        """Descarta o histórico de `undo` (movimentos aceitos em definitivo)."""
+        self._undo.clear()
+
+    def _move(self, i: int, a: int, c: int) -> None:
+        """Move `i` de `a` para `c` atualizando somas, heaps e objetivos."""
+        v = self.vel[i]
+        sa, sb = self.size[a], self.size[c]
+        old = (
+            sa * self._top(a, -1, self._min) + (sb * self._top(c, -1, self._min) if sb else 0.0),
+            _cv(sa, self.sum[a], self.sumsq[a]) + _cv(sb, self.sum[c], self.sumsq[c]),
+            (self._spread(a, -1) > self.delta_v) + (sb > 0 and self._spread(c, -1) > self.delta_v),
+        )
+
+        self.labels[i] = c
+        self.size[a] -= 1
+        self.size[c] += 1
+        self.sum[a] -= v
+        self.sumsq[a] -= v * v
+        self.sum[c] += v
+        self.sumsq[c] += v * v
+        heapq.heappush(self._min[c], (v, i))
+        heapq.heappush(self._max[c], (-v, i))
+        for heaps in (self._min, self._max):  # compacta heaps inchados por entradas mortas
+            if len(heaps[c]) > 2 * self.size[c] + 16:
+                heaps[c] = [e for e in heaps[c] if self.labels[e[1]] == c]
+                heapq.heapify(heaps[c])
+        if self.size[a] == 0:
+            self.sum[a] = self.sumsq[a] = 0.0
+            self._free.append(a)
+
+        sa, sb = self.size[a], self.size[c]
+        self.fo1 += (
+            (sa * self._top(a, -1, self._min) if sa else 0.0)
+            + sb * self._top(c, -1, self._min)
+            - old[0]
+        )
+        self.cv_sum += (
+            _cv(sa, self.sum[a], self.sumsq[a]) + _cv(sb, self.sum[c], self.sumsq[c]) - old[1]
+        )
+        self.n_infeasible += (
+            (sa > 0 and self._spread(a, -1) > self.delta_v)
+            + (self._spread(c, -1) > self.delta_v)
+            - old[2]
+        )
+        self.num_clusters += (sa == 0) * -1 + (sb == 1)
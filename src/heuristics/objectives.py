@@ -0,0 +1,111 @@
+"""Objetivos do protocolo (f1, f2, f3) e viabilidade Δv, vetorizados.
+
+Para uma partição dada por rótulos (um por vértice) e o array de velocidades:
+
+- `f1 = −Σ_k |C_k|·min_{i∈C_k} v_i` (negação de FO1);
+- `f2 = |C| / |V|` (fração de clusters);
+- `f3` = média, sobre os clusters, do CV intra-cluster (desvio-padrão populacional / média);
+- viável ⇔ max − min ≤ Δv em todo cluster.
+
+Os agregados por cluster (tamanho, soma, mín./máx., variância) saem de `np.bincount` e
+`np.minimum/maximum.at` sobre o id `solução·K + rótulo` — O(R·n), sem ordenação nem laço
+Python por cluster —, e R soluções (matriz (R, n)) são avaliadas numa única passada. É o
+núcleo de avaliação comum às heurísticas.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Parâmetros globais do protocolo (docs/protocol/proto_v3.1.1.md §3.1)
+DELTA_V = 5.0
+V_MAX = 16.0
+
+
+@dataclass
+class SolutionBatchEval:
+    """Objetivos de R soluções (um valor por linha de `labels`)."""
+
+    f1: np.ndarray  # (R,) −Σ|C_k|·min v
+    f2: np.ndarray  # (R,) |C|/|V|
+    f3: np.ndarray  # (R,) CV intra-cluster médio
+    num_clusters: np.ndarray  # (R,) int64
+    avg_std_dev: np.ndarray  # (R,) desvio-padrão intra-cluster médio (m/s)
+    max_spread: np.ndarray  # (R,) maior (max − min) de velocidade num cluster
+    feasible: np.ndarray  # (R,) bool: max_spread ≤ Δv
+
+    @property
+    def objectives(self) -> np.ndarray:
+        """Matriz (R, 3) com (f1, f2, f3) — entrada do hypervolume."""
+        return np.column_stack((self.f1, self.f2, self.f3))
+
+
+def evaluate_solutions(
+    labels: np.ndarray,
+    velocities: np.ndarray,
+    *,
+    delta_v: float = DELTA_V,
+) -> SolutionBatchEval:
+    """Avalia f1/f2/f3 e a viabilidade Δv de uma ou várias partições.
+
+    Args:
+        labels: (n,) ou (R, n) rótulos inteiros em [0, n) (não precisam ser
+            contíguos: rótulos sem vértices são ignorados).
+        velocities: (n,) velocidades.
+        delta_v: Tolerância de velocidade intra-cluster.
+
+    Returns:
+        `SolutionBatchEval` com arrays (R,) (R = 1 para entrada 1-D).
+    """
+    L = np.atleast_2d(np.asarray(labels))
+    vel = np.asarray(velocities, dtype=np.float64)
+    R, n = L.shape
+    if vel.shape != (n,):
+        raise ValueError(f"velocities deve ter shape ({n},), não {vel.shape}")
+    if n == 0:
+        raise ValueError("partição vazia")
+    if int(L.min()) < 0 or int(L.max()) >= n:
+        raise ValueError(f"labels devem estar em [0, {n})")
+
+    # id de cluster = solução·K + rótulo: agregados por bincount/ufunc.at, sem ordenação
+    K = int(L.max()) + 1
+    cid = (np.arange(R, dtype=np.int64)[:, None] * K + L).ravel()
+    vv = np.broadcast_to(vel, (R, n)).ravel()
+    size = np.bincount(cid, minlength=R * K).astype(np.float64)
+    vmin = np.full(R * K, np.inf)
+    np.minimum.at(vmin, cid, vv)
+    vmax = np.full(R * K, -np.inf)
+    np.maximum.at(vmax, cid, vv)
+    occ = size > 0
+    vmin[~occ] = vmax[~occ] = 0.0  # ids sem vértices: neutros nas somas abaixo
+    safe = np.where(occ, size, 1.0)
+    mean = np.bincount(cid, weights=vv, minlength=R * K) / safe
+    # variância em duas passadas (sem cancelamento de sum(v²) − n·média²)
+    std = np.sqrt(np.bincount(cid, weights=(vv - mean[cid]) ** 2, minlength=R * K) / safe)
+
+    num = occ.reshape(R, K).sum(axis=1)
+    f1 = -(size * vmin).reshape(R, K).sum(axis=1)
+    cv = np.where(occ, std / np.where(occ, mean, 1.0), 0.0).reshape(R, K)
+    spread = (vmax - vmin).reshape(R, K).max(axis=1)
+    return SolutionBatchEval(
+        f1=f1,
+        f2=num / n,
+        f3=cv.sum(axis=1) / num,
+        num_clusters=num.astype(np.int64),
+        avg_std_dev=std.reshape(R, K).sum(axis=1) / num,
+        max_spread=spread,
+        feasible=spread <= delta_v,
+    )
+
+
+def energy(
+    f1: np.ndarray,
+    f2: np.ndarray,
+    f3: np.ndarray,
+    n: int,
+    weights: tuple[float, float, float] = (1.0, 1.0, 1.0),
+) -> np.ndarray:
+    """Escalarização minimizada por SA/GA: w1·f1/(n·v_max) + w2·f2 + w3·f3."""
+    return weights[0] * f1 / (n * V_MAX) + weights[1] * f2 + weights[2] * f3
@@ -0,0 +1,172 @@
+"""Saída das heurísticas no formato do runner (JSON por run + partição `.part`).
+
+Os resultados (`SAResult`, `GAResult`, ...) expõem `algo`, `params` (dataclass), `seed`,
+`labels`, `objectives`, `energy`, `nfe`, `elapsed_s`, `status`, `run_name` e `stats`
+(contadores próprios do algoritmo). O `.part` tem um rótulo por linha, o mesmo formato
+do gpmetis/kaffpa, então `read_partition_labels` e `aggregate_manifests.py` o leem. Se o
+lote gravou um traço anytime (`heuristics.trace`), cada JSON aponta para ele com
+`trace_path` e `trace_chain` (índice do run no lote).
+
+Orçamentos aninhados (protocolo §4.3, E ∈ {1e4, 5e4, 1e5, 2e5}): um único run no maior
+orçamento guarda em `checkpoints` o melhor ao cruzar cada fronteira menor, e
+`split_by_budget` materializa um resultado por orçamento — o run em E=1e4 é o prefixo do
+run em E=2e5, então não precisa ser refeito.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from heuristics.budgets import Budget
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Melhor solução de um run ao completar `nfe` avaliações."""
+
+    nfe: int
+    labels: np.ndarray
+    objectives: tuple[float, float, float]
+    energy: float
+    elapsed_s: float
+    stats: dict[str, Any] = field(default_factory=dict)  # campos de `res.stats` no checkpoint
+
+
+def split_by_budget(res: Any, levels: Sequence[int]) -> dict[int, Any]:
+    """Um resultado por orçamento de NFE em `levels`, a partir dos checkpoints de `res`.
+
+    O nível igual ao NFE final é o próprio `res`; os menores saem de `res.checkpoints`.
+    Níveis não alcançados (teto de tempo antes da fronteira) repetem o melhor final com
+    `status="timeout"`.
+    """
+    by_nfe = {cp.nfe: cp for cp in res.checkpoints}
+    out = {}
+    for level in sorted(set(levels)):
+        cp = by_nfe.get(level)
+        if cp is not None:
+            out[level] = replace(
+                res,
+                labels=cp.labels,
+                objectives=cp.objectives,
+                energy=cp.energy,
+                nfe=cp.nfe,
+                elapsed_s=cp.elapsed_s,
+                status="ok",
+                checkpoints=[],
+                **cp.stats,
+            )
+        elif level == res.nfe or (level > res.nfe and res.status == "timeout"):
+            out[level] = replace(res, checkpoints=[])
+        else:
+            raise ValueError(f"{res.run_name}: sem checkpoint em nfe={level}")
+    return out
+
+
+def result_record(
+    res: Any,
+    *,
+    instance_id: str,
+    budget: Budget | None = None,
+    part_path: Path | None = None,
+    trace_path: Path | None = None,
+    trace_chain: int | None = None,
+) -> dict[str, Any]:
+    """JSON de um run com as chaves do JSON do runner (+ objetivos, NFE e `res.stats`)."""
+    time_cap = budget.time_limit_s if budget is not None else None
+    return {
+        "instance_id": instance_id,
+        "algo": res.algo,
+        "k": None,
+        "beta": None,
+        "seed": res.seed,
+        "budget_time_ms": int(time_cap * 1000) if time_cap is not None else None,
+        "status": res.status,
+        "returncode": 0,
+        "elapsed_ms": int(res.elapsed_s * 1000),
+        "stdout": "",
+        "stderr": "",
+        "part_path": str(part_path) if part_path else None,
+        "cutsize_best": None,
+        "modularity": None,
+        "hyperparams": asdict(res.params),
+        "budget": budget.name if budget is not None else None,
+        "budget_nfe": budget.nfe_limit if budget is not None else None,
+        "nfe": res.nfe,
+        **res.stats,
+        "objectives": dict(zip(("f1", "f2", "f3"), res.objectives, strict=True)),
+        "num_clusters": int(np.unique(res.labels).size),
+        "energy": res.energy,
+        "feasible": True,
+        "trace_path": str(trace_path) if trace_path else None,
+        "trace_chain": trace_chain if trace_path else None,
+    }
+
+
+def write_results(
+    results: Sequence[Any],
+    out_dir: Path,
+    *,
+    instance_id: str,
+    budget: Budget | None = None,
+    trace_path: Path | None = None,
+) -> list[Path]:
+    """Grava `<run_name>.json` + `<run_name>.part` (um rótulo por linha) por resultado."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for idx, res in enumerate(results):
+        part = out_dir / f"{res.run_name}.part"
+        part.write_text("\n".join(map(str, res.labels.tolist())) + "\n", encoding="ascii")
+        out = out_dir / f"{res.run_name}.json"
+        rec = result_record(
+            res,
+            instance_id=instance_id,
+            budget=budget,
+            part_path=part,
+            trace_path=trace_path,
+            trace_chain=idx,
+        )
+        with out.open("w", encoding="utf-8") as f:
+            json.dump(rec, f, ensure_ascii=False, indent=2)
+        paths.append(out)
+    return paths
+
+
+def write_budget_results(
+    results: Sequence[Any],
+    out_dir: Path,
+    levels: Sequence[int],
+    *,
+    instance_id: str,
+    budget: Budget,
+    trace_path: Path | None = None,
+) -> list[Path]:
+    """`write_results` por nível de NFE, em `<out_dir>/nfe<nível>/`, a partir de um só run.
+
+    `budget` dá o teto de tempo e o `checkpoint_every_nfe`; cada nível vira um `Budget`
+    `type: nfe` próprio (`budget_nfe` no JSON).
+    """
+    split = [split_by_budget(res, levels) for res in results]
+    paths = []
+    for level in sorted(set(levels)):
+        level_budget = Budget(
+            name=f"nfe{level}",
+            type="nfe",
+            value=float(level),
+            checkpoint_every_nfe=budget.checkpoint_every_nfe,
+            time_cap_s=budget.time_limit_s,
+        )
+        paths += write_results(
+            [s[level] for s in split],
+            Path(out_dir) / f"nfe{level}",
+            instance_id=instance_id,
+            budget=level_budget,
+            trace_path=trace_path,
+        )
+    return paths
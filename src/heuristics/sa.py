@@ -0,0 +1,377 @@
+"""Simulated annealing com cadeias independentes em lockstep sobre estado matricial.
+
+Cada cadeia é um par (hiperparâmetros, semente); todas avançam juntas, um movimento por
+passo, com o estado em matrizes (B, n): rótulos e, por cluster, tamanho, soma, soma dos
+quadrados e velocidade mín./máx. Um passo sorteia para cada cadeia um vértice `i` e o
+cluster de um vizinho (ou, com prob. `NEW_CLUSTER_PROB`, um cluster novo), avalia o ΔE
+de todas de uma vez e aplica os aceitos com indexação vetorizada — só as cadeias em que
+`i` era o extremo do cluster de origem reescaneiam aquele cluster.
+
+- Energia: `f1/(n·v_max) + f2 + f3` (pesos ajustáveis; os três termos são adimensionais).
+- Restrição Δv é rígida: movimentos inviáveis são rejeitados; o estado inicial (todos
+  singletons, ou `init_labels`) precisa ser viável.
+- NFE: a avaliação inicial + 1 por passo (cada vizinho proposto é avaliado).
+- Os sorteios de cada cadeia saem do seu próprio `default_rng(seed)`, em blocos, então
+  o resultado de uma cadeia não depende de quais outras rodam junto com ela.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+
+from heuristics.budgets import BUDGETS_PATH, get_budget, hyperparam_grid, load_budgets
+from heuristics.objectives import DELTA_V, energy, evaluate_solutions
+from heuristics.results import Checkpoint, write_budget_results, write_results
+from heuristics.trace import TraceRecorder
+
+NEW_CLUSTER_PROB = 0.05
+SA_BLOCK_STEPS = 256  # passos por bloco de sorteios (e granularidade do teto de tempo)
+
+
+@dataclass(frozen=True)
+class SAParams:
+    """Hiperparâmetros de uma cadeia (nomes de `specs/budgets.yml`)."""
+
+    T0: float = 1.0
+    alpha: float = 0.95
+    iters_per_T: int = 100
+
+
+@dataclass
+class SAResult:
+    """Melhor solução viável de uma cadeia."""
+
+    algo: ClassVar[str] = "sa"
+    params: SAParams
+    seed: int
+    labels: np.ndarray  # (n,) rótulos da melhor solução
+    objectives: tuple[float, float, float]  # (f1, f2, f3) recalculados do zero
+    energy: float
+    nfe: int
+    accepted: int
+    elapsed_s: float
+    status: str  # "ok" (orçamento de NFE cumprido) | "timeout" (teto de tempo)
+    checkpoints: list[Checkpoint] = field(default_factory=list)  # orçamentos menores
+
+    @property
+    def run_name(self) -> str:
+        """Nome estável da cadeia (arquivos JSON/partição)."""
+        p = self.params
+        return f"sa_T{p.T0:g}_a{p.alpha:g}_i{p.iters_per_T}_s{self.seed}"
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Contadores específicos do SA (vão para o JSON)."""
+        return {"accepted": self.accepted}
+
+
+def _cv(size: np.ndarray, s: np.ndarray, sq: np.ndarray) -> np.ndarray:
+    """CV populacional vetorizado (0 para clusters com até 1 vértice)."""
+    big = size > 1
+    safe = np.where(big, size, 1)
+    mean = s / safe
+    var = np.maximum(sq / safe - mean * mean, 0.0)
+    return np.where(big, np.sqrt(var) / np.where(big, mean, 1.0), 0.0)
+
+
+def run_sa(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    velocities: np.ndarray,
+    configs: Sequence[SAParams],
+    seeds: Sequence[int],
+    *,
+    nfe_budget: int | None = None,
+    time_cap_s: float | None = None,
+    delta_v: float = DELTA_V,
+    weights: tuple[float, float, float] = (1.0, 1.0, 1.0),
+    init_labels: np.ndarray | None = None,
+    trace: TraceRecorder | None = None,
+    checkpoints: Sequence[int] = (),
+) -> list[SAResult]:
+    """Roda uma cadeia por (config, semente) — `configs × seeds` — em lockstep.
+
+    Args:
+        indptr: (n+1,) ponteiros CSR da adjacência simétrica.
+        indices: Vizinhos concatenados.
+        velocities: (n,) velocidades.
+        configs: Pontos da grade de hiperparâmetros.
+        seeds: Sementes (cadeias da mesma semente compartilham os sorteios).
+        nfe_budget: Máximo de avaliações por cadeia (inclui a inicial).
+        time_cap_s: Teto de parede para o lote todo (checado a cada bloco de passos).
+        delta_v: Tolerância de velocidade intra-cluster.
+        weights: Pesos de (f1, f2, f3) na energia.
+        init_labels: Partição inicial viável (padrão: todos singletons).
+        trace: Recebe (nfe, f1, f2, f3) da partição inicial e de cada melhora do
+            melhor de uma cadeia (`chain` = índice da cadeia no retorno).
+        checkpoints: NFEs (< `nfe_budget`) em que o melhor de cada cadeia é guardado em
+            `SAResult.checkpoints`; o prefixo até lá é idêntico a um run com esse orçamento.
+
+    Returns:
+        Um `SAResult` por cadeia, na ordem `for cfg in configs for seed in seeds`.
+    """
+    if nfe_budget is None and time_cap_s is None:
+        raise ValueError("informe nfe_budget e/ou time_cap_s")
+    t0 = time.perf_counter()
+    chains = list(itertools.product(configs, seeds))
+    B = len(chains)
+    vel = np.asarray(velocities, dtype=np.float64)
+    n = vel.size
+    deg = np.diff(indptr)
+    rows = np.arange(B)
+    T0 = np.array([c.T0 for c, _ in chains], dtype=np.float64)
+    alpha = np.array([c.alpha for c, _ in chains], dtype=np.float64)
+    iters = np.array([c.iters_per_T for c, _ in chains], dtype=np.int64)
+    rngs = [np.random.default_rng(s) for _, s in chains]
+
+    init = np.arange(n) if init_labels is None else np.asarray(init_labels, dtype=np.int64)
+    ev = evaluate_solutions(init, vel, delta_v=delta_v)
+    if not ev.feasible[0]:
+        raise ValueError("init_labels viola a restrição Δv")
+    labels = np.tile(init, (B, 1))
+    size = np.tile(np.bincount(init, minlength=n), (B, 1))
+    s = np.tile(np.bincount(init, weights=vel, minlength=n), (B, 1))
+    sq = np.tile(np.bincount(init, weights=vel * vel, minlength=n), (B, 1))
+    lo = np.full(n, np.inf)
+    np.minimum.at(lo, init, vel)
+    hi = np.full(n, -np.inf)
+    np.maximum.at(hi, init, vel)
+    cmin, cmax = np.tile(lo, (B, 1)), np.tile(hi, (B, 1))
+    free = np.flatnonzero(size[0] == 0)[::-1]
+    free_ids = np.zeros((B, n), dtype=np.int64)
+    free_ids[:, : free.size] = free
+    free_cnt = np.full(B, free.size, dtype=np.int64)
+
+    fo1 = np.full(B, -float(ev.f1[0]))
+    cv_sum = np.full(B, float(ev.f3[0] * ev.num_clusters[0]))
+    k = np.full(B, int(ev.num_clusters[0]), dtype=np.int64)
+    E = energy(-fo1, k / n, cv_sum / k, n, weights)
+    best_E = E.copy()
+    best_labels = labels.copy()
+    nfe = 1
+    accepted = np.zeros(B, dtype=np.int64)
+    if trace is not None:
+        trace.begin_run()
+        trace.record(nfe, -fo1, k / n, cv_sum / k, chain=rows)
+    cps = sorted(c for c in set(checkpoints) if nfe_budget is None or c < nfe_budget)
+    snaps: list[list[Checkpoint]] = [[] for _ in range(B)]
+
+    def snapshot() -> None:
+        ev_b = evaluate_solutions(best_labels, vel, delta_v=delta_v)
+        E_b = energy(ev_b.f1, ev_b.f2, ev_b.f3, n, weights)
+        t = time.perf_counter() - t0
+        for b in range(B):
+            obj = (float(ev_b.f1[b]), float(ev_b.f2[b]), float(ev_b.f3[b]))
+            snaps[b].append(
+                Checkpoint(
+                    nfe,
+                    best_labels[b].copy(),
+                    obj,
+                    float(E_b[b]),
+                    t,
+                    {"accepted": int(accepted[b])},
+                )
+            )
+
+    while cps and cps[0] <= nfe:
+        if cps.pop(0) == nfe:
+            snapshot()
+    next_cp = cps.pop(0) if cps else -1
+    step = 0
+    status = "ok"
+
+    while nfe_budget is None or nfe < nfe_budget:
+        if time_cap_s is not None and time.perf_counter() - t0 >= time_cap_s:
+            status = "timeout"
+            break
+        steps = SA_BLOCK_STEPS if nfe_budget is None else min(SA_BLOCK_STEPS, nfe_budget - nfe)
+        U = np.stack([r.random((steps, 4)) for r in rngs], axis=1)  # (steps, B, 4)
+        for u in U:
+            i = np.minimum((u[:, 0] * n).astype(np.int64), n - 1)
+            d = deg[i]
+            off = np.minimum((u[:, 1] * d).astype(np.int64), np.maximum(d - 1, 0))
+            j = np.where(d > 0, indices[np.minimum(indptr[i] + off, indices.size - 1)], i)
+            a = labels[rows, i]
+            c = labels[rows, j]
+            new = (u[:, 2] < NEW_CLUSTER_PROB) | (d == 0)
+            top = free_ids[rows, np.maximum(free_cnt - 1, 0)]
+            c = np.where(new, np.where(free_cnt > 0, top, a), c)
+
+            v = vel[i]
+            sa, sb = size[rows, a], size[rows, c]
+            bmin = np.minimum(cmin[rows, c], v)
+            bmax = np.maximum(cmax[rows, c], v)
+            ok = (a != c) & (bmax - bmin <= delta_v)
+
+            amin, amax = cmin[rows, a], cmax[rows, a]
+            need = np.flatnonzero(ok & (sa > 1) & ((v == amin) | (v == amax)))
+            if need.size:  # i era extremo da origem: reescaneia só essas cadeias
+                M = labels[need] == a[need, None]
+                M[np.arange(need.size), i[need]] = False
+                amin[need] = np.where(M, vel, np.inf).min(axis=1)
+                amax[need] = np.where(M, vel, -np.inf).max(axis=1)
+            single = sa == 1
+            # destino vazio tem cmin = inf: zera o termo antigo antes do produto
+            d_fo1 = (
+                (sa - 1) * amin
+                - sa * cmin[rows, a]
+                + (sb + 1) * bmin
+                - sb * np.where(sb > 0, cmin[rows, c], 0.0)
+            )
+            sa_s, sa_q, sb_s, sb_q = s[rows, a], sq[rows, a], s[rows, c], sq[rows, c]
+            d_cv = (
+                _cv(sa - 1, sa_s - v, sa_q - v * v)
+                - _cv(sa, sa_s, sa_q)
+                + _cv(sb + 1, sb_s + v, sb_q + v * v)
+                - _cv(sb, sb_s, sb_q)
+            )
+            k_new = k - single + (sb == 0)
+            E_new = energy(-(fo1 + d_fo1), k_new / n, (cv_sum + d_cv) / k_new, n, weights)
+            dE = E_new - E
+            T = T0 * alpha ** (step // iters)
+            with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+                acc = ok & ((dE <= 0.0) | (u[:, 3] < np.exp(-np.maximum(dE, 0.0) / T)))
+            nfe += 1
+            step += 1
+
+            r = np.flatnonzero(acc)
+            if r.size:
+                ir, ar, cr, vr = i[r], a[r], c[r], v[r]
+                labels[r, ir] = cr
+                size[r, ar] -= 1
+                size[r, cr] += 1
+                s[r, ar] -= vr
+                sq[r, ar] -= vr * vr
+                s[r, cr] += vr
+                sq[r, cr] += vr * vr
+                cmin[r, ar], cmax[r, ar] = amin[r], amax[r]
+                cmin[r, cr], cmax[r, cr] = bmin[r], bmax[r]
+                # cluster novo sai do topo da pilha de livres; origem esvaziada entra nela
+                free_cnt[r[sb[r] == 0]] -= 1
+                e = r[single[r]]
+                s[e, a[e]] = sq[e, a[e]] = 0.0
+                cmin[e, a[e]], cmax[e, a[e]] = np.inf, -np.inf
+                free_ids[e, free_cnt[e]] = a[e]
+                free_cnt[e] += 1
+                fo1[r] += d_fo1[r]
+                cv_sum[r] += d_cv[r]
+                k[r] = k_new[r]
+                E[r] = E_new[r]
+                accepted[r] += 1
+                better = r[E_new[r] < best_E[r]]
+                if better.size:
+                    best_E[better] = E_new[better]
+                    best_labels[better] = labels[better]
+                    if trace is not None:
+                        kb = k[better]
+                        trace.record(nfe, -fo1[better], kb / n, cv_sum[better] / kb, chain=better)
+            if nfe == next_cp:
+                snapshot()
+                next_cp = cps.pop(0) if cps else -1
+
+    elapsed = time.perf_counter() - t0
+    final = evaluate_solutions(best_labels, vel, delta_v=delta_v)
+    return [
+        SAResult(
+            params=cfg,
+            seed=int(seed),
+            labels=best_labels[b],
+            objectives=(float(final.f1[b]), float(final.f2[b]), float(final.f3[b])),
+            energy=float(
+                energy(final.f1[b : b + 1], final.f2[b : b + 1], final.f3[b : b + 1], n, weights)[0]
+            ),
+            nfe=nfe,
+            accepted=int(accepted[b]),
+            elapsed_s=elapsed,
+            status=status,
+            checkpoints=snaps[b],
+        )
+        for b, (cfg, seed) in enumerate(chains)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entrypoint: `python -m heuristics.sa --instance X --out-dir D [--budget small]`."""
+    ap = argparse.ArgumentParser(
+        prog="python -m heuristics.sa",
+        description="SA em lote: toda a grade de budgets.yml × sementes num só processo.",
+    )
+    ap.add_argument("--instance", type=Path, required=True, help=".json|.json.gz|.npyd")
+    ap.add_argument("--out-dir", type=Path, required=True)
+    ap.add_argument("--budgets", type=Path, default=BUDGETS_PATH)
+    ap.add_argument("--budget", default=None, help="Preset (padrão: defaults.budget_preset)")
+    ap.add_argument("--seeds", type=int, nargs="+", default=None)
+    ap.add_argument("--delta-v", type=float, default=DELTA_V)
+    ap.add_argument(
+        "--nfe-levels",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Orçamentos aninhados: um run no maior, resultados de todos em <out-dir>/nfe<N>/",
+    )
+    ap.add_argument("--no-trace", action="store_true", help="Não grava <out-dir>/sa.trace")
+    args = ap.parse_args(argv)
+
+    from hpc_framework.runner import load_instance
+    from hpc_framework.solvers.common import build_csr
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    spec = load_budgets(args.budgets)
+    budget = get_budget(spec, args.budget)
+    configs = [SAParams(**hp) for hp in hyperparam_grid(spec, "sa")]
+    seeds = args.seeds if args.seeds is not None else spec["seeds"]["stochastic"]
+    inst = load_instance(args.instance, need_nodes=True)
+    if inst.velocities is None:
+        raise SystemExit("instância sem velocidades")
+    indptr, indices, _ = build_csr(inst.n, np.asarray(inst.edges))
+    trace_path = None if args.no_trace else args.out_dir / "sa.trace"
+    if trace_path is not None:
+        args.out_dir.mkdir(parents=True, exist_ok=True)
+    trace = TraceRecorder.from_budget(trace_path, spec, budget) if trace_path else None
+
+    results = run_sa(
+        indptr,
+        indices,
+        inst.velocities,
+        configs,
+        seeds,
+        nfe_budget=max(args.nfe_levels) if args.nfe_levels else budget.nfe_limit,
+        time_cap_s=budget.time_limit_s,
+        delta_v=args.delta_v,
+        trace=trace,
+        checkpoints=args.nfe_levels or (),
+    )
+    if trace is not None:
+        trace.close()
+    if args.nfe_levels:
+        paths = write_budget_results(
+            results,
+            args.out_dir,
+            args.nfe_levels,
+            instance_id=inst.instance_id,
+            budget=budget,
+            trace_path=trace_path,
+        )
+    else:
+        paths = write_results(
+            results,
+            args.out_dir,
+            instance_id=inst.instance_id,
+            budget=budget,
+            trace_path=trace_path,
+        )
+    logging.info("%d cadeias (%s) gravadas em %s", len(paths), budget.name, args.out_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
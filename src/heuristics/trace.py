@@ -0,0 +1,150 @@
+"""Traço anytime das heurísticas: (nfe, tempo, f1, f2, f3) a cada melhora.
+
+As heurísticas chamam `TraceRecorder.record` quando o melhor de uma cadeia melhora. O
+registro só copia valores para um buffer pré-alocado (crescido por dobra se cheio); a
+gravação em disco (`flush`) acontece no máximo a cada `min_interval_s` segundos e, se
+`checkpoint_every_nfe` for dado, só depois de o NFE avançar esse tanto desde a última
+gravação (`specs/budgets.yml`: `checkpoint_every_nfe`, `defaults.checkpoint_min_interval_s`).
+`close` força a gravação final. Runs em sequência que reiniciam o NFE (GA: um por
+(params, seed)) chamam `begin_run`, que zera a referência do limite de NFE.
+
+O sidecar (`.trace`) é uma sequência de registros binários `TRACE_DTYPE` (little-endian,
+sem cabeçalho), só com anexações: um run interrompido deixa um arquivo legível até o
+último flush. `read_trace` o devolve como array estruturado. Um único arquivo pode
+guardar várias cadeias (campo `chain`: índice do run no lote).
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+TRACE_DTYPE = np.dtype(
+    [
+        ("chain", "<i4"),
+        ("nfe", "<i8"),
+        ("elapsed_s", "<f8"),
+        ("f1", "<f8"),
+        ("f2", "<f8"),
+        ("f3", "<f8"),
+    ]
+)
+DEFAULT_MIN_INTERVAL_S = 0.25
+
+
+class TraceRecorder:
+    """Buffer de melhoras com flush limitado por tempo/NFE para um sidecar `.trace`.
+
+    Args:
+        path: Arquivo de saída (truncado na criação); None mantém o traço só em memória.
+        capacity: Registros pré-alocados no buffer.
+        min_interval_s: Intervalo mínimo entre gravações em disco.
+        checkpoint_every_nfe: Avanço mínimo de NFE entre gravações (None: sem mínimo).
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        capacity: int = 4096,
+        min_interval_s: float = DEFAULT_MIN_INTERVAL_S,
+        checkpoint_every_nfe: int | None = None,
+    ) -> None:
+        """Abre o sidecar e inicia o relógio (`elapsed_s` conta a partir daqui)."""
+        self.path = Path(path) if path is not None else None
+        self.min_interval_s = float(min_interval_s)
+        self.checkpoint_every_nfe = checkpoint_every_nfe
+        self._buf = np.zeros(max(int(capacity), 1), dtype=TRACE_DTYPE)
+        self._len = 0
+        self._written: list[np.ndarray] = []  # só em memória (path=None)
+        self._t0 = time.perf_counter()
+        self._last_flush_t = self._t0
+        self._last_flush_nfe = 0
+        self._fh = self.path.open("wb") if self.path is not None else None
+
+    @classmethod
+    def from_budget(
+        cls, path: Path | None, spec: dict[str, Any], budget: Any, **kwargs: Any
+    ) -> TraceRecorder:
+        """Recorder com os limites de I/O de `budgets.yml` (preset `budget`)."""
+        kwargs.setdefault(
+            "min_interval_s",
+            spec.get("defaults", {}).get("checkpoint_min_interval_s", DEFAULT_MIN_INTERVAL_S),
+        )
+        kwargs.setdefault("checkpoint_every_nfe", budget.checkpoint_every_nfe)
+        return cls(path, **kwargs)
+
+    def __enter__(self) -> TraceRecorder:
+        """Uso como context manager (`close` na saída)."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Flush final e fechamento."""
+        self.close()
+
+    def begin_run(self) -> None:
+        """Marca o início de um run cujo NFE recomeça do zero (limite de NFE volta a 0)."""
+        self._last_flush_nfe = 0
+
+    def record(self, nfe: int, f1: Any, f2: Any, f3: Any, *, chain: Any = 0) -> None:
+        """Anexa uma melhora (escalares) ou várias (arrays alinhados, uma por cadeia)."""
+        f1 = np.atleast_1d(f1)
+        m = f1.size
+        if self._len + m > self._buf.size:
+            grown = np.zeros(max(2 * self._buf.size, self._len + m), dtype=TRACE_DTYPE)
+            grown[: self._len] = self._buf[: self._len]
+            self._buf = grown
+        now = time.perf_counter()
+        rec = self._buf[self._len : self._len + m]
+        rec["chain"] = chain
+        rec["nfe"] = nfe
+        rec["elapsed_s"] = now - self._t0
+        rec["f1"] = f1
+        rec["f2"] = f2
+        rec["f3"] = f3
+        self._len += m
+        if now - self._last_flush_t >= self.min_interval_s and (
+            self.checkpoint_every_nfe is None
+            or nfe - self._last_flush_nfe >= self.checkpoint_every_nfe
+        ):
+            self.flush(nfe)
+
+    def flush(self, nfe: int | None = None) -> None:
+        """Grava (anexa) o buffer pendente e o esvazia, ignorando os limites."""
+        if self._len:
+            chunk = self._buf[: self._len]
+            if self._fh is not None:
+                self._fh.write(chunk.tobytes())
+                self._fh.flush()
+            else:
+                self._written.append(chunk.copy())
+            self._len = 0
+        self._last_flush_t = time.perf_counter()
+        if nfe is not None:
+            self._last_flush_nfe = nfe
+
+    def close(self) -> None:
+        """Flush final e fechamento do sidecar (idempotente)."""
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def to_array(self) -> np.ndarray:
+        """Traço completo (gravado + pendente) como array `TRACE_DTYPE`."""
+        pending = self._buf[: self._len]
+        if self.path is not None:
+            if self._fh is not None:
+                self._fh.flush()
+            return np.concatenate((read_trace(self.path), pending))
+        return np.concatenate([*self._written, pending])
+
+
+def read_trace(path: Path) -> np.ndarray:
+    """Lê um sidecar `.trace` (ignora um registro final incompleto)."""
+    raw = Path(path).read_bytes()
+    whole = len(raw) - len(raw) % TRACE_DTYPE.itemsize
+    return np.frombuffer(raw[:whole], dtype=TRACE_DTYPE).copy()
@@ -1,19 +1,46 @@
-"""CLI do HPC Framework (modo single-run)."""
+"""CLI do HPC Framework (single-run e `batch`: uma instância × várias configs)."""
 
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
 from pathlib import Path
 
-from .runner import run_one
+from .graph_cache import DEFAULT_MAX_BYTES, GraphCache
+from .runner import RunArtifact, RunConfig, run_batch, run_one
+from .solvers.common import PART_FILE_MODES
+
+
+def _add_cache_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--graph-cache",
+        type=Path,
+        default=None,
+        help="Diretório de cache de .graph (reaproveita exportações da mesma instância)",
+    )
+    p.add_argument(
+        "--graph-cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024**2,
+        help="Tamanho máximo do cache de .graph (MiB; despejo LRU)",
+    )
+
+
+def _add_part_files_arg(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--part-files",
+        choices=list(PART_FILE_MODES),
+        default="keep",
+        help="Destino do arquivo de partição após calcular o cut (economiza disco em sweeps)",
+    )
 
 
 def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description="Runner single-run: exporta .graph, chama METIS/KaHIP e emite JSON de resultados."
     )
-    p.add_argument("--instance", required=True, help="Arquivo da instância (.json|.json.gz)")
+    p.add_argument("--instance", required=True, help="Instância (.json|.json.gz|bundle .npyd)")
     p.add_argument("--algo", required=True, choices=["metis", "kahip"])
     p.add_argument("--k", required=True, type=int)
     p.add_argument("--beta", required=True, type=float)
@@ -25,15 +52,123 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     p.add_argument("--log-level", choices=["debug", "info", "warning", "error"], default="info")
     p.add_argument("--kahip-preset", choices=["fast", "eco", "strong"], default="fast")
+    _add_cache_args(p)
+    _add_part_files_arg(p)
+    return p
+
+
+def _build_batch_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="hpc-framework batch",
+        description=(
+            "Batch: carrega/exporta UMA instância e executa várias configs "
+            "(produto cartesiano dos valores ou lista JSON via --configs)."
+        ),
+    )
+    p.add_argument("--instance", required=True, help="Instância (.json|.json.gz|bundle .npyd)")
+    p.add_argument("--out-dir", required=True, type=Path, help="Diretório dos JSONs por run")
+    p.add_argument("--workdir", type=Path, default=Path("."), help="Diretório de trabalho")
+    p.add_argument(
+        "--configs",
+        type=Path,
+        default=None,
+        help="JSON com lista de objetos {algo,k,beta,seed,budget_time_ms[,kahip_preset]}",
+    )
+    p.add_argument("--algo", nargs="+", choices=["metis", "kahip"], default=["metis"])
+    p.add_argument("--k", nargs="+", type=int, default=None)
+    p.add_argument("--beta", nargs="+", type=float, default=None)
+    p.add_argument("--seed", nargs="+", type=int, default=None)
+    p.add_argument("--budget-time-ms", type=int, dest="budget_time_ms", default=None)
+    p.add_argument("--kahip-preset", nargs="+", choices=["fast", "eco", "strong"], default=["fast"])
+    p.add_argument(
+        "--workers", type=int, default=1, help="Runs simultâneos (pool de processos local)"
+    )
+    p.add_argument(
+        "--pin-cpus",
+        nargs="*",
+        type=int,
+        default=None,
+        help="Fixa cada worker num núcleo (sem valores: todos os núcleos disponíveis)",
+    )
+    p.add_argument("--log-level", choices=["debug", "info", "warning", "error"], default="info")
+    _add_cache_args(p)
+    _add_part_files_arg(p)
     return p
 
 
+def _batch_configs(args: argparse.Namespace, parser: argparse.ArgumentParser) -> list[RunConfig]:
+    """Configs do batch: arquivo JSON (`--configs`) ou produto cartesiano dos flags."""
+    if args.configs is not None:
+        raw = json.loads(args.configs.read_text(encoding="utf-8"))
+        return [
+            RunConfig(
+                algo=str(c["algo"]),
+                k=int(c["k"]),
+                beta=float(c["beta"]),
+                seed=int(c["seed"]),
+                budget_time_ms=int(c["budget_time_ms"]),
+                kahip_preset=str(c.get("kahip_preset", "fast")),
+            )
+            for c in raw
+        ]
+    missing = [f for f in ("k", "beta", "seed", "budget_time_ms") if getattr(args, f) is None]
+    if missing:
+        parser.error(
+            "sem --configs, informe: " + ", ".join(f"--{m.replace('_', '-')}" for m in missing)
+        )
+    configs = []
+    for algo, k, beta, seed in itertools.product(args.algo, args.k, args.beta, args.seed):
+        presets = args.kahip_preset if algo == "kahip" else ["fast"]
+        for preset in presets:
+            configs.append(RunConfig(algo, k, beta, seed, args.budget_time_ms, preset))
+    return configs
+
+
+def _cache_from_args(args: argparse.Namespace) -> GraphCache | None:
+    if not args.graph_cache:
+        return None
+    return GraphCache(args.graph_cache, max_bytes=args.graph_cache_max_mb * 1024**2)
+
+
+def _artifact_obj(art: RunArtifact) -> dict:
+    return {
+        "run_id": art.run_id,
+        "algo": art.algo,
+        "status": art.status,
+        "cut": art.cut,
+        "elapsed_ms": art.elapsed_ms,
+        "part_file": str(art.part_file) if art.part_file else None,
+    }
+
+
+def _main_batch(argv: list[str]) -> None:
+    parser = _build_batch_parser()
+    args = parser.parse_args(argv)
+    arts = run_batch(
+        instance_path=Path(args.instance),
+        configs=_batch_configs(args, parser),
+        out_dir=Path(args.out_dir),
+        workdir=Path(args.workdir),
+        log_level=str(args.log_level),
+        graph_cache=_cache_from_args(args),
+        workers=int(args.workers),
+        pin_cpus=(args.pin_cpus or True) if args.pin_cpus is not None else False,
+        part_files=str(args.part_files),
+    )
+    for art in arts:
+        print(json.dumps(_artifact_obj(art), ensure_ascii=False))
+
+
 def main(argv: list[str] | None = None) -> None:
     # Para os testes de entrypoint: se chamado sem argv, apenas "alive".
     if argv is None:
         print("alive")
         return
 
+    if argv and argv[0] == "batch":
+        _main_batch(argv[1:])
+        return
+
     parser = _build_parser()
     args = parser.parse_args(argv)
 
@@ -48,14 +183,8 @@ def main(argv: list[str] | None = None) -> None:
         workdir=Path(args.workdir),
         kahip_preset=str(args.kahip_preset),
         log_level=str(args.log_level),
+        graph_cache=_cache_from_args(args),
+        part_files=str(args.part_files),
     )
 
-    obj = {
-        "run_id": art.run_id,
-        "algo": art.algo,
-        "status": art.status,
-        "cut": art.cut,
-        "elapsed_ms": art.elapsed_ms,
-        "part_file": str(art.part_file) if art.part_file else None,
-    }
-    print(json.dumps(obj, ensure_ascii=False))
+    print(json.dumps(_artifact_obj(art), ensure_ascii=False))
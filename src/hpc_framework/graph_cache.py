@@ -0,0 +1,114 @@
+"""Cache endereçado por conteúdo dos `.graph` (METIS) exportados pelo runner.
+
+A chave é um hash (BLAKE2b) de `n` + arestas normalizadas para int64; a mesma
+instância resolvida com vários (algo, k, β, seed) reaproveita um único arquivo,
+ligado no workdir por hardlink (symlink/cópia como fallback). O diretório é
+limitado em bytes com despejo LRU (mtime atualizado a cada acerto).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from hpc_framework.solvers.common import write_metis_graph
+
+CACHE_FORMAT_TAG = b"metis-graph-v1"
+DEFAULT_MAX_BYTES = 2 * 1024**3  # 2 GiB
+_HASH_CHUNK_ROWS = 1 << 20
+
+
+def graph_key(n: int, edges: np.ndarray) -> str:
+    """Hash estável de (n, edges), independente do dtype/layout de `edges`."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(CACHE_FORMAT_TAG)
+    h.update(f"|n={int(n)}|m={int(edges.shape[0])}|".encode())
+    for a in range(0, int(edges.shape[0]), _HASH_CHUNK_ROWS):
+        block = np.ascontiguousarray(edges[a : a + _HASH_CHUNK_ROWS], dtype="<i8")
+        h.update(block.tobytes())
+    return h.hexdigest()
+
+
+def link_or_copy(src: Path, dest: Path) -> str:
+    """Liga `src` em `dest` (hardlink → symlink → cópia); retorna o método usado."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    try:
+        os.link(src, dest)
+        return "hardlink"
+    except OSError:
+        pass
+    try:
+        dest.symlink_to(src.resolve())
+        return "symlink"
+    except OSError:
+        shutil.copyfile(src, dest)
+        return "copy"
+
+
+class GraphCache:
+    """Cache LRU de `.graph` limitado em bytes (seguro para vários processos)."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Abre (ou cria) o cache em `root`, limitado a `max_bytes`."""
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> Path:
+        """Caminho do arquivo em cache para uma chave."""
+        return self.root / f"{key}.graph"
+
+    def materialize(self, n: int, edges: np.ndarray, dest: Path) -> Path:
+        """Garante `dest` com o `.graph` de (n, edges), exportando só em cache miss."""
+        key = graph_key(n, edges)
+        cached = self.path_for(key)
+        if cached.exists():
+            self.hits += 1
+            os.utime(cached)  # marca uso recente (LRU por mtime)
+        else:
+            self.misses += 1
+            # escrita atômica: processos concorrentes nunca veem arquivo parcial
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{key}.", suffix=".tmp")
+            os.close(fd)
+            try:
+                write_metis_graph(Path(tmp), n, edges)
+                os.replace(tmp, cached)
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+            self.evict(keep=cached)
+
+        how = link_or_copy(cached, dest)
+        logging.debug("graph cache %s: %s -> %s (%s)", key, cached, dest, how)
+        return dest
+
+    def evict(self, keep: Path | None = None) -> list[Path]:
+        """Remove os menos usados até caber em `max_bytes` (nunca remove `keep`)."""
+        entries = []
+        for p in self.root.glob("*.graph"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:  # removido por outro processo
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        removed: list[Path] = []
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and p == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+            removed.append(p)
+        return removed
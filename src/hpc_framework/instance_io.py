@@ -0,0 +1,382 @@
+"""Leitura de instâncias para o runner: JSON v1.1 (.json/.json.gz) e bundle binário (.npyd).
+
+O bundle `.npyd` é um diretório gravado pelo gerador (`generator.cli`) com:
+`header.json` (cabeçalho v1.1 + `format`, `n`, `m`), `edges.npy` (m,2),
+`velocities.npy` (n,) e `positions.npy` (n,2). Os arrays são abertos via
+`np.load(mmap_mode="r")`, sem materializar listas Python.
+
+Para JSON, `read_json_stream` faz parsing incremental em blocos de bytes: as arestas
+vão direto para um array pré-alocado e o bloco `nodes` pode ser pulado sem decodificar.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+BUNDLE_SUFFIX = ".npyd"
+BUNDLE_FORMAT = "npy-bundle-v1"
+
+# Leitura incremental de JSON
+STREAM_CHUNK_BYTES = 1 << 20  # 1 MiB por bloco lido (descompactado)
+
+# Bytes aceitos dentro do array `edges` (dígitos, colchetes, vírgula e espaço JSON)
+_EDGE_BYTES_OK = np.zeros(256, dtype=bool)
+_EDGE_BYTES_OK[np.frombuffer(b"0123456789[], \t\r\n", dtype=np.uint8)] = True
+# Sequência de tokens válida em `edges` (N = inteiro): "[N,N]" separados por ","
+_EDGE_PATTERN = np.frombuffer(b"[N,N],", dtype=np.uint8)
+
+# Números JSON só terminam num delimitador (branco, vírgula ou fechamento)
+_NUMBER_START = frozenset("-0123456789")
+_SCALAR_DELIMS = frozenset(" \t\r\n,]}")
+
+
+@dataclass
+class InstanceData:
+    """Instância carregada em forma de arrays (independente do formato em disco)."""
+
+    n: int
+    edges: np.ndarray
+    velocities: np.ndarray | None = None
+    positions: np.ndarray | None = None
+    header: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def instance_id(self) -> str:
+        """Identificador declarado no cabeçalho (vazio se ausente)."""
+        return str(self.header.get("instance_id", ""))
+
+
+def instance_num_nodes(inst: dict[str, Any]) -> int | None:
+    """Resolve n a partir das chaves aceitas (`n`, `num_nodes`, ..., `instance_metrics.nodes_final`)."""
+    n_raw: Any | None = inst.get("n")
+    if n_raw is None:
+        n_raw = inst.get("num_nodes") or inst.get("numVertices") or inst.get("num_nodes_v1_1")
+    if n_raw is None:
+        n_raw = (inst.get("instance_metrics") or {}).get("nodes_final")
+    return int(n_raw) if n_raw is not None else None
+
+
+def is_bundle(path: Path) -> bool:
+    """True se `path` aponta para um bundle binário `.npyd`."""
+    return str(path).rstrip("/").endswith(BUNDLE_SUFFIX)
+
+
+def read_bundle(path: Path, *, mmap: bool = True) -> InstanceData:
+    """Abre um bundle `.npyd` (arrays memory-mapped por padrão)."""
+    header_path = path / "header.json"
+    if not header_path.exists():
+        raise FileNotFoundError(f"bundle incompleto (sem header.json): {path}")
+    with header_path.open("r", encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"formato de bundle desconhecido: {header.get('format')!r}")
+
+    mode: Literal["r", "r+", "c"] | None = "r" if mmap else None
+    edges = np.load(path / "edges.npy", mmap_mode=mode)
+    if edges.ndim != 2 or edges.shape[1] != 2:
+        raise ValueError("edges must be an (m,2) array")
+    n = int(header["n"])
+    if int(header.get("m", edges.shape[0])) != edges.shape[0]:
+        raise ValueError("header 'm' difere de edges.npy")
+
+    vel_path = path / "velocities.npy"
+    pos_path = path / "positions.npy"
+    velocities = np.load(vel_path, mmap_mode=mode) if vel_path.exists() else None
+    positions = np.load(pos_path, mmap_mode=mode) if pos_path.exists() else None
+    return InstanceData(n=n, edges=edges, velocities=velocities, positions=positions, header=header)
+
+
+def read_json_document(path: Path) -> dict[str, Any]:
+    """Lê JSON (possivelmente .gz) de instância como documento completo."""
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ------------------------- JSON incremental (streaming) -------------------------
+
+
+def _container_end(seg: np.ndarray, depth: int, str_state: int) -> tuple[int, int, int]:
+    """Procura o fim de um container JSON em `seg`, dado o estado herdado do bloco anterior.
+
+    `str_state`: 0 fora de string, 1 dentro, 2 dentro logo após uma barra invertida.
+    Retorna (índice do fechamento ou -1, profundidade final, `str_state` final).
+    Vetorizado; blocos com barra invertida (escapes) caem num laço escalar.
+    """
+    if seg.size == 0:
+        return -1, depth, str_state
+    if str_state == 2 or np.any(seg == 92):  # escapes: varredura escalar
+        for i, c in enumerate(seg.tolist()):
+            if str_state == 2:
+                str_state = 1
+            elif str_state == 1:
+                if c == 92:
+                    str_state = 2
+                elif c == 34:
+                    str_state = 0
+            elif c == 34:
+                str_state = 1
+            elif c in (91, 123):
+                depth += 1
+            elif c in (93, 125):
+                depth -= 1
+                if depth == 0:
+                    return i, 0, 0
+        return -1, depth, str_state
+
+    quotes = seg == 34
+    inside = (np.cumsum(quotes) & 1).astype(bool) ^ bool(str_state)
+    outside = ~inside & ~quotes
+    opens = outside & ((seg == 91) | (seg == 123))
+    closes = outside & ((seg == 93) | (seg == 125))
+    d = depth + np.cumsum(opens.astype(np.int64) - closes.astype(np.int64))
+    hit = np.flatnonzero(d == 0)
+    if hit.size:
+        return int(hit[0]), 0, 0
+    return -1, int(d[-1]), int(inside[-1])
+
+
+def _parse_uints(seg: np.ndarray) -> np.ndarray:
+    """Converte todas as sequências de dígitos ASCII de `seg` em int64 (vetorizado)."""
+    idx = np.flatnonzero((seg >= 48) & (seg <= 57))
+    if idx.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    first = np.empty(idx.size, dtype=bool)
+    first[0] = True
+    first[1:] = idx[1:] != idx[:-1] + 1
+    run_start = np.flatnonzero(first)
+    run_end = np.append(run_start[1:], idx.size)
+    run_id = np.cumsum(first) - 1
+    exp = run_end[run_id] - np.arange(idx.size) - 1
+    if int(exp.max()) > 18:
+        raise ValueError("edges: inteiro grande demais para int64")
+    digits = seg[idx].astype(np.int64) - 48
+    return np.add.reduceat(digits * (10**exp), run_start)
+
+
+def _edge_tokens(seg: np.ndarray) -> np.ndarray:
+    """Tokens de `seg` sem brancos, cada sequência de dígitos reduzida a um `N`.
+
+    `seg` não pode começar no meio de um número (garantido pelo corte em `read_edges`).
+    """
+    digit = (seg >= 48) & (seg <= 57)
+    starts = digit.copy()
+    starts[1:] &= ~digit[:-1]
+    keep = starts | (~digit & (seg != 32) & (seg != 9) & (seg != 10) & (seg != 13))
+    return np.where(digit[keep], np.uint8(78), seg[keep])
+
+
+class _JsonByteStream:
+    """Cursor sobre os bytes de um documento JSON lido em blocos (plain ou gzip)."""
+
+    def __init__(self, fh: Any, chunk_bytes: int) -> None:
+        self.fh = fh
+        self.chunk_bytes = chunk_bytes
+        self.buf = b""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        """Anexa mais um bloco ao buffer (descartando o prefixo já consumido)."""
+        data = self.fh.read(self.chunk_bytes)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> int:
+        """Próximo byte não-branco (sem consumir)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in b" \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("JSON truncado")
+
+    def expect(self, ch: bytes) -> None:
+        """Consome o byte `ch` (após brancos) ou falha."""
+        got = self.peek()
+        if got != ch[0]:
+            raise ValueError(f"JSON inválido: esperado {ch!r}, obtido {bytes([got])!r}")
+        self.pos += 1
+
+    def read_scalar(self) -> Any:
+        """Decodifica string/número/literal a partir da posição corrente."""
+        decoder = json.JSONDecoder()
+        self.peek()
+        while True:
+            try:
+                text = self.buf[self.pos :].decode("utf-8")
+                value, end = decoder.raw_decode(text)
+                # um número cortado pelo fim do bloco ainda decodifica ("0." -> 0):
+                # só aceita se o byte seguinte já estiver no buffer e for delimitador
+                if text[0] not in _NUMBER_START or (
+                    end < len(text) and text[end] in _SCALAR_DELIMS
+                ):
+                    self.pos += len(text[:end].encode("utf-8"))
+                    return value
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                pass
+            if not self._fill():
+                raise ValueError("JSON truncado/inválido")
+
+    def scan_container(self, keep: bool) -> bytes:
+        """Avança até o fim do container que começa aqui; devolve seus bytes se `keep`."""
+        self.peek()
+        pieces: list[bytes] = []
+        depth, str_state = 0, 0
+        while True:
+            seg = np.frombuffer(self.buf, dtype=np.uint8, offset=self.pos)
+            end, depth, str_state = _container_end(seg, depth, str_state)
+            if end >= 0:
+                if keep:
+                    pieces.append(self.buf[self.pos : self.pos + end + 1])
+                self.pos += end + 1
+                return b"".join(pieces)
+            if keep:
+                pieces.append(self.buf[self.pos :])
+            self.pos = len(self.buf)
+            if not self._fill():
+                raise ValueError("JSON truncado")
+
+    def read_value(self) -> Any:
+        """Decodifica um valor qualquer (containers via captura de bytes + json.loads)."""
+        if self.peek() in b"[{":
+            return json.loads(self.scan_container(keep=True))
+        return self.read_scalar()
+
+    def skip_value(self) -> None:
+        """Pula um valor sem decodificá-lo."""
+        if self.peek() in b"[{":
+            self.scan_container(keep=False)
+        else:
+            self.read_scalar()
+
+    def read_edges(self, m_hint: int) -> np.ndarray:
+        """Lê `[[u, v], ...]` direto para um array int64 pré-alocado (cresce se preciso)."""
+        self.expect(b"[")
+        out = np.empty(2 * max(m_hint, 1), dtype=np.int64)
+        filled = 0
+        depth = 1
+        n_tok = 0  # tokens já conferidos contra `_EDGE_PATTERN` (forma (m,2) exata)
+        while True:
+            seg = np.frombuffer(self.buf, dtype=np.uint8, offset=self.pos)
+            end, depth, _ = _container_end(seg, depth, 0)
+            if end >= 0:
+                body, consumed = seg[:end], end + 1
+            else:
+                # não corta um número no meio: processa até o último não-dígito
+                # (a sobra só tem dígitos, logo a profundidade calculada continua válida)
+                nondig = np.flatnonzero((seg < 48) | (seg > 57))
+                cut = int(nondig[-1]) + 1 if nondig.size else 0
+                body, consumed = seg[:cut], cut
+            if body.size and not _EDGE_BYTES_OK[body].all():
+                raise ValueError("edges: esperado lista de pares de inteiros não negativos")
+            toks = _edge_tokens(body)
+            if toks.size and not np.array_equal(
+                toks, _EDGE_PATTERN[(n_tok + np.arange(toks.size)) % _EDGE_PATTERN.size]
+            ):
+                raise ValueError("edges must be an (m,2) list/array")
+            n_tok += toks.size
+            vals = _parse_uints(body)
+            if filled + vals.size > out.size:
+                grown = np.empty(max(2 * out.size, filled + vals.size), dtype=np.int64)
+                grown[:filled] = out[:filled]
+                out = grown
+            out[filled : filled + vals.size] = vals
+            filled += vals.size
+            self.pos += consumed
+            if end >= 0:
+                break
+            if not self._fill():
+                raise ValueError("JSON truncado em 'edges'")
+        if n_tok and n_tok % _EDGE_PATTERN.size != _EDGE_PATTERN.size - 1:  # sem "," final
+            raise ValueError("edges must be an (m,2) list/array")
+        if filled < out.size:
+            out = out[:filled].copy() if filled < out.size // 2 else out[:filled]
+        return out.reshape(-1, 2)
+
+
+def read_json_stream(
+    path: Path,
+    *,
+    need_nodes: bool = True,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+) -> InstanceData:
+    """Lê uma instância JSON v1.1 (.json/.json.gz) de forma incremental.
+
+    - `edges` é decodificado bloco a bloco para um array (m,2) pré-alocado a partir de
+      `instance_metrics` (quando o cabeçalho vem antes), sem lista de listas intermediária.
+    - `nodes` é pulado sem decodificação quando `need_nodes=False` (METIS/KaHIP).
+    - Demais chaves de topo compõem `header`.
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    header: dict[str, Any] = {}
+    edges: np.ndarray | None = None
+    velocities: np.ndarray | None = None
+    positions: np.ndarray | None = None
+
+    with opener(path, "rb") as fh:
+        s = _JsonByteStream(fh, chunk_bytes)
+        s.expect(b"{")
+        if s.peek() == ord("}"):
+            s.pos += 1
+        else:
+            while True:
+                key = s.read_scalar()
+                s.expect(b":")
+                if key == "edges":
+                    edges = s.read_edges(_edge_count_hint(header))
+                elif key == "nodes" and need_nodes:
+                    velocities, positions = _nodes_to_arrays(s.read_value())
+                elif key == "nodes":
+                    s.skip_value()
+                else:
+                    header[key] = s.read_value()
+                sep = s.peek()
+                s.pos += 1
+                if sep == ord("}"):
+                    break
+                if sep != ord(","):
+                    raise ValueError("JSON inválido: esperado ',' ou '}'")
+
+    n = instance_num_nodes(header)
+    if n is None and velocities is not None:
+        n = int(velocities.size)
+    if n is None:
+        raise KeyError("instance missing 'n'/'num_nodes'")
+    if edges is None:
+        raise KeyError("instance missing 'edges'")
+    return InstanceData(n=n, edges=edges, velocities=velocities, positions=positions, header=header)
+
+
+def _edge_count_hint(header: dict[str, Any]) -> int:
+    """Estimativa de m pelo cabeçalho (density_final · n(n-1)/2); 0 se indisponível."""
+    metrics = header.get("instance_metrics") or {}
+    n = instance_num_nodes(header)
+    dens = metrics.get("density_final")
+    if n is None or dens is None:
+        return 0
+    return int(round(float(dens) * n * (n - 1) / 2)) + 1
+
+
+def _nodes_to_arrays(nodes: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """Converte a lista `nodes` em (velocities (n,), positions (n,2)) indexados por `id`."""
+    n = len(nodes)
+    ids = np.fromiter((nd.get("id", i) for i, nd in enumerate(nodes)), dtype=np.int64, count=n)
+    vel = np.fromiter((nd.get("velocity", np.nan) for nd in nodes), dtype=np.float64, count=n)
+    pos = np.array([nd.get("pos", (np.nan, np.nan)) for nd in nodes], dtype=np.float64)
+    velocities = np.full(n, np.nan)
+    positions = np.full((n, 2), np.nan)
+    velocities[ids] = vel
+    positions[ids] = pos.reshape(n, 2)
+    return velocities, positions
@@ -0,0 +1,93 @@
+"""Execução local em paralelo (pool de processos) com pinagem opcional de CPU por worker.
+
+Cada worker do pool pode ser fixado em um núcleo (`os.sched_setaffinity`); processos
+filhos (gpmetis/kaffpa) herdam a afinidade, então cada solver roda isolado no seu
+núcleo e as medições de tempo não competem entre si. Com pinagem, as variáveis de
+threads (OMP/BLAS) do worker são fixadas em 1, como em `scripts/run_phase_1.sh`.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def available_cpus() -> list[int]:
+    """Núcleos utilizáveis por este processo (respeita cgroups/taskset quando possível)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _mp_context() -> mp.context.BaseContext:
+    """`fork` quando disponível: workers herdam arrays já carregados sem serializar."""
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return mp.get_context()
+
+
+def _init_worker(
+    cpu_queue: Any | None,
+    initializer: Callable[..., None] | None,
+    initargs: tuple,
+) -> None:
+    """Inicializa um worker: pina num núcleo (se pedido) e roda o inicializador do usuário."""
+    if cpu_queue is not None and hasattr(os, "sched_setaffinity"):
+        cpu = int(cpu_queue.get())
+        os.sched_setaffinity(0, {cpu})
+        for var in THREAD_ENV_VARS:
+            os.environ[var] = "1"
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def run_parallel(
+    fn: Callable[[Any], Any],
+    tasks: Iterable[Any],
+    *,
+    workers: int,
+    pin_cpus: bool | list[int] = False,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple = (),
+) -> Iterator[tuple[int, Any]]:
+    """Executa `fn(task)` para cada tarefa e produz `(índice, resultado)` na ordem de término.
+
+    Args:
+        fn: Função de módulo (picklable) aplicada a cada tarefa.
+        tasks: Tarefas (argumento único de `fn`).
+        workers: Nº de processos; `<= 1` executa em série no próprio processo.
+        pin_cpus: `True` usa `available_cpus()`; lista explícita fixa os núcleos
+            (reutilizados em rodízio se houver mais workers que núcleos).
+        initializer: Executado uma vez por worker (ex.: publicar arrays compartilhados).
+        initargs: Argumentos do `initializer`.
+    """
+    task_list = list(tasks)
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for i, task in enumerate(task_list):
+            yield i, fn(task)
+        return
+
+    ctx = _mp_context()
+    cpu_queue = None
+    if pin_cpus:
+        cpus = available_cpus() if pin_cpus is True else list(pin_cpus)
+        cpu_queue = ctx.SimpleQueue()
+        for w in range(workers):
+            cpu_queue.put(cpus[w % len(cpus)])
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(cpu_queue, initializer, initargs),
+    ) as ex:
+        futures = {ex.submit(fn, task): i for i, task in enumerate(task_list)}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
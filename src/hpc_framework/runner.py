@@ -5,7 +5,6 @@ Usado pelos testes e pelo CLI para exportar .graph, invocar o solver e salvar ar
 
 from __future__ import annotations
 
-import gzip
 import json
 import logging
 import math
@@ -15,13 +14,29 @@ import socket
 import subprocess
 import sys
 import time
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 
-from hpc_framework.solvers.common import read_partition_labels, write_metis_graph
+from generator.modularity import modularity
+from hpc_framework.graph_cache import GraphCache, link_or_copy
+from hpc_framework.instance_io import (
+    InstanceData,
+    instance_num_nodes,
+    is_bundle,
+    read_bundle,
+    read_json_document,
+    read_json_stream,
+)
+from hpc_framework.parallel import run_parallel
+from hpc_framework.solvers.common import (
+    dispose_partition_file,
+    read_partition_labels,
+    write_metis_graph,
+)
 from hpc_framework.solvers.kahip import run_kaffpa
 from hpc_framework.solvers.metis import run_gpmetis
 
@@ -50,14 +65,70 @@ def feasible_beta(labels: np.ndarray, k: int, beta: float) -> tuple[bool, dict]:
     return ok, {"counts": counts.tolist(), "max_allowed": max_allowed}
 
 
+# Orçamento de elementos do gather (R_chunk × m) na avaliação em lote
+EVAL_CHUNK_ELEMS = 1 << 24
+
+
+@dataclass
+class PartitionBatchEval:
+    """Métricas de R partições do mesmo grafo (um elemento/linha por partição)."""
+
+    cutsize: np.ndarray  # (R,) int64
+    counts: np.ndarray  # (R, k) int64 — tamanho de cada parte
+    max_imbalance: np.ndarray  # (R,) float — max_j counts / (n/k) - 1
+    feasible: np.ndarray | None  # (R,) bool — só quando `beta` é informado
+    max_allowed: int | None  # ceil((1+β)·n/k), mesmo critério de `feasible_beta`
+
+
+def evaluate_partitions(
+    edges: np.ndarray,
+    labels: np.ndarray,
+    *,
+    k: int | None = None,
+    beta: float | None = None,
+    chunk_elems: int = EVAL_CHUNK_ELEMS,
+) -> PartitionBatchEval:
+    """Avalia cutsize, contagens por parte, desequilíbrio e viabilidade de R partições.
+
+    `labels` é (R, n) (ou (n,) para uma só) com rótulos em [0, k). O gather
+    `labels[:, edges]` é feito em blocos de linhas para limitar a memória a
+    ~`chunk_elems` elementos.
+    """
+    if edges.ndim != 2 or edges.shape[1] != 2:
+        raise ValueError("edges must be an (m,2) array")
+    L = np.atleast_2d(np.asarray(labels))
+    R, n = L.shape
+    lab_min, lab_max = (int(L.min()), int(L.max())) if L.size else (0, -1)
+    k = lab_max + 1 if k is None else int(k)
+    if lab_min < 0 or lab_max >= k:
+        raise ValueError("labels devem estar em [0, k)")
+
+    u = np.asarray(edges[:, 0], dtype=np.intp)
+    v = np.asarray(edges[:, 1], dtype=np.intp)
+    m = u.size
+    cut = np.zeros(R, dtype=np.int64)
+    step = max(1, chunk_elems // max(m, 1))
+    for a in range(0, R, step):
+        sub = L[a : a + step]
+        cut[a : a + step] = np.count_nonzero(sub[:, u] != sub[:, v], axis=1)
+
+    offsets = (np.arange(R, dtype=np.int64) * k)[:, None]
+    counts = np.bincount((L + offsets).ravel(), minlength=R * k).reshape(R, k)
+    max_imbalance = counts.max(axis=1) / (n / k) - 1.0 if n and k else np.zeros(R)
+
+    feasible = None
+    max_allowed = None
+    if beta is not None:
+        max_allowed = math.ceil((1.0 + beta) * n / k)
+        feasible = np.all(counts <= max_allowed, axis=1)
+    return PartitionBatchEval(cut, counts, max_imbalance, feasible, max_allowed)
+
+
 def extract_graph_from_instance(inst: dict[str, Any]) -> tuple[int, np.ndarray]:
     """Extrai (n, edges) de uma instância v1.1 (aceita várias chaves para n)."""
-    n_raw: Any | None = inst.get("n")
-    if n_raw is None:
-        n_raw = inst.get("num_nodes") or inst.get("numVertices") or inst.get("num_nodes_v1_1")
-    if n_raw is None:
+    n = instance_num_nodes(inst)
+    if n is None:
         raise KeyError("instance missing 'n'/'num_nodes'")
-    n = int(n_raw)
 
     edges = inst.get("edges")
     if edges is None:
@@ -70,11 +141,17 @@ def extract_graph_from_instance(inst: dict[str, Any]) -> tuple[int, np.ndarray]:
 
 def _read_instance(p: Path) -> dict[str, Any]:
     """Lê JSON (possivelmente .gz) de instância."""
-    if str(p).endswith(".gz"):
-        with gzip.open(p, "rt", encoding="utf-8") as f:
-            return json.load(f)
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return read_json_document(p)
+
+
+def load_instance(p: Path, *, need_nodes: bool = False) -> InstanceData:
+    """Carrega (n, edges, ...) de bundle binário `.npyd` (mmap) ou de JSON v1.1 (streaming).
+
+    `need_nodes=False` pula velocidades/posições no JSON (METIS/KaHIP só usam o grafo).
+    """
+    if is_bundle(p):
+        return read_bundle(p)
+    return read_json_stream(p, need_nodes=need_nodes)
 
 
 @dataclass
@@ -89,88 +166,306 @@ class RunArtifact:
     part_file: Path | None
 
 
-def run(
-    *,
-    instance_path: Path,
-    algo: str,
-    k: int,
-    beta: float,
-    seed: int,
-    budget_time_ms: int,
-    out_json: Path,
-    workdir: Path,
-    kahip_preset: str = "fast",
-    log_level: str = "info",  # aceito (compat testes), mas sem logging verboso
-) -> RunArtifact:
-    """Executa um único run end-to-end e persiste JSON de saída."""
-    # logging mínimo (compat)
+@dataclass(frozen=True)
+class RunConfig:
+    """Uma configuração de solver para um run (usada por `run_batch`)."""
+
+    algo: str
+    k: int
+    beta: float
+    seed: int
+    budget_time_ms: int
+    kahip_preset: str = "fast"
+
+    @property
+    def run_name(self) -> str:
+        """Nome estável do run (subdiretório de trabalho e arquivo JSON)."""
+        preset = f"_{self.kahip_preset}" if self.algo == "kahip" else ""
+        return f"{self.algo}{preset}_k{self.k}_b{self.beta:g}_s{self.seed}_t{self.budget_time_ms}"
+
+
+def _setup_logging(log_level: str) -> None:
+    """Logging mínimo (compat)."""
     level = getattr(logging, (log_level or "INFO").upper(), logging.INFO)
     logging.basicConfig(level=level, stream=sys.stdout, format="[%(levelname)s] %(message)s")
 
-    inst = _read_instance(instance_path)
-    n, edges = extract_graph_from_instance(inst)
 
-    workdir.mkdir(parents=True, exist_ok=True)
-    graph_path = workdir / "graph.graph"
-    write_metis_graph(graph_path, n, edges)
+def _export_graph(
+    n: int, edges: np.ndarray, graph_path: Path, graph_cache: GraphCache | None
+) -> None:
+    """Exporta o `.graph` (ou liga a partir do cache)."""
+    graph_path.parent.mkdir(parents=True, exist_ok=True)
+    if graph_cache is not None:
+        graph_cache.materialize(n, edges, graph_path)
+    else:
+        # pode ser hardlink do cache de um run anterior: não truncar o inode compartilhado
+        graph_path.unlink(missing_ok=True)
+        write_metis_graph(graph_path, n, edges)
+
+
+def _write_result(
+    out_json: Path,
+    cfg: RunConfig,
+    *,
+    instance_id: str,
+    workdir: Path,
+    graph_path: Path,
+    status: str,
+    returncode: int | None,
+    elapsed_ms: int | None,
+    stdout: str,
+    stderr: str,
+    part_path: Path | None,
+    cut: int | None,
+    q: float | None = None,
+) -> None:
+    """Persiste o JSON de resultado de um run (apenas tipos nativos)."""
+    out = {
+        "instance_id": instance_id,
+        "algo": cfg.algo,
+        "k": cfg.k,
+        "beta": cfg.beta,
+        "seed": cfg.seed,
+        "budget_time_ms": cfg.budget_time_ms,
+        "workdir": str(workdir),
+        "graph_path": str(graph_path),
+        "status": status,
+        "returncode": returncode,
+        "elapsed_ms": elapsed_ms,
+        "stdout": stdout,
+        "stderr": stderr,
+        "part_path": str(part_path) if part_path else None,
+        # chave exigida pelos testes:
+        "cutsize_best": int(cut) if cut is not None else None,
+        # modularidade da partição do solver (k comunidades), sem NetworkX
+        "modularity": float(q) if q is not None else None,
+    }
+    out_json.parent.mkdir(parents=True, exist_ok=True)
+    with out_json.open("w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+
 
+def _solve_and_record(
+    *,
+    cfg: RunConfig,
+    edges: np.ndarray,
+    graph_path: Path,
+    workdir: Path,
+    out_json: Path,
+    instance_id: str,
+    n: int | None = None,
+    part_files: str = "keep",
+) -> RunArtifact:
+    """Chama o solver sobre um `.graph` já exportado, computa o cut e grava o JSON.
+
+    `part_files` (`keep`/`delete`/`gzip`) decide o destino do arquivo de partição após
+    a leitura; o JSON registra o caminho final (ou None se apagado).
+    """
     t0 = time.perf_counter()
-    if algo == "metis":
-        res = run_gpmetis(graph_path, k=k, beta=beta, seed=seed, timeout_s=budget_time_ms / 1000.0)
-    elif algo == "kahip":
+    timeout_s = cfg.budget_time_ms / 1000.0
+    if cfg.algo == "metis":
+        res = run_gpmetis(graph_path, k=cfg.k, beta=cfg.beta, seed=cfg.seed, timeout_s=timeout_s)
+    elif cfg.algo == "kahip":
         res = run_kaffpa(
             graph_path,
-            k=k,
-            beta=beta,
-            seed=seed,
-            timeout_s=budget_time_ms / 1000.0,
-            preset=kahip_preset,
+            k=cfg.k,
+            beta=cfg.beta,
+            seed=cfg.seed,
+            timeout_s=timeout_s,
+            preset=cfg.kahip_preset,
         )
     else:
         raise ValueError("algo must be 'metis' or 'kahip'")
 
     elapsed = int((time.perf_counter() - t0) * 1000)
-    labels = (
-        read_partition_labels(res.part_path) if res.part_path and res.part_path.exists() else None
-    )
+    part_path = res.part_path if res.part_path and res.part_path.exists() else None
+    labels = read_partition_labels(part_path, n=n) if part_path is not None else None
     cut = compute_cutsize_edges_labels(edges, labels) if labels is not None else None
+    q = modularity(edges, labels) if labels is not None else None
+    if part_path is not None:
+        part_path = dispose_partition_file(part_path, part_files)
 
     # Mapeia status do solver para o status esperado pelos testes de runner
     status_json = res.status if res.status in {"ok", "timeout"} else "solver_failed"
 
-    # Persistência do JSON (apenas tipos nativos)
-    out = {
-        "instance_id": inst.get("instance_id", ""),
-        "algo": algo,
-        "k": k,
-        "beta": beta,
-        "seed": seed,
-        "budget_time_ms": budget_time_ms,
-        "workdir": str(workdir),
-        "graph_path": str(graph_path),
-        "status": status_json,
-        "returncode": res.returncode,
-        "elapsed_ms": res.elapsed_ms,
-        "stdout": res.stdout,
-        "stderr": res.stderr,
-        "part_path": str(res.part_path) if res.part_path else None,
-        # chave exigida pelos testes:
-        "cutsize_best": int(cut) if cut is not None else None,
-    }
-    out_json.parent.mkdir(parents=True, exist_ok=True)
-    with out_json.open("w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
+    _write_result(
+        out_json,
+        cfg,
+        instance_id=instance_id,
+        workdir=workdir,
+        graph_path=graph_path,
+        status=status_json,
+        returncode=res.returncode,
+        elapsed_ms=res.elapsed_ms,
+        stdout=res.stdout,
+        stderr=res.stderr,
+        part_path=part_path,
+        cut=cut,
+        q=q,
+    )
 
     return RunArtifact(
-        run_id=f"{algo}-{int(time.time())}",
-        algo=algo,
+        run_id=f"{cfg.algo}-{int(time.time())}",
+        algo=cfg.algo,
         status=status_json,
         cut=cut,
         elapsed_ms=elapsed,
-        part_file=res.part_path if res.part_path and res.part_path.exists() else None,
+        part_file=part_path,
     )
 
 
+def run(
+    *,
+    instance_path: Path,
+    algo: str,
+    k: int,
+    beta: float,
+    seed: int,
+    budget_time_ms: int,
+    out_json: Path,
+    workdir: Path,
+    kahip_preset: str = "fast",
+    log_level: str = "info",  # aceito (compat testes), mas sem logging verboso
+    graph_cache: GraphCache | None = None,
+    part_files: str = "keep",
+) -> RunArtifact:
+    """Executa um único run end-to-end e persiste JSON de saída.
+
+    Com `graph_cache`, o `.graph` é reaproveitado entre runs da mesma instância;
+    `part_files` vai para `_solve_and_record`.
+    """
+    _setup_logging(log_level)
+
+    inst = load_instance(instance_path)
+    graph_path = workdir / "graph.graph"
+    _export_graph(inst.n, inst.edges, graph_path, graph_cache)
+
+    cfg = RunConfig(algo, k, beta, seed, budget_time_ms, kahip_preset)
+    return _solve_and_record(
+        cfg=cfg,
+        edges=inst.edges,
+        graph_path=graph_path,
+        workdir=workdir,
+        out_json=out_json,
+        instance_id=inst.instance_id,
+        n=inst.n,
+        part_files=part_files,
+    )
+
+
+# Arestas da instância do batch corrente, publicadas uma vez por worker do pool
+_BATCH_EDGES: np.ndarray | None = None
+
+
+def _set_batch_edges(edges: np.ndarray | None) -> None:
+    """Inicializador de worker: publica as arestas já carregadas (herdadas via fork)."""
+    global _BATCH_EDGES  # noqa: PLW0603
+    _BATCH_EDGES = edges
+
+
+def _batch_task(task: tuple[RunConfig, Path, Path, Path, str, int, str]) -> RunArtifact:
+    """Executa uma config do batch no seu próprio subdiretório (serial ou em worker)."""
+    cfg, shared_graph, run_dir, out_json, instance_id, n, part_files = task
+    assert _BATCH_EDGES is not None, "_set_batch_edges não foi chamado"
+    graph_path = run_dir / "graph.graph"
+    link_or_copy(shared_graph, graph_path)
+    try:
+        return _solve_and_record(
+            cfg=cfg,
+            edges=_BATCH_EDGES,
+            graph_path=graph_path,
+            workdir=run_dir,
+            out_json=out_json,
+            instance_id=instance_id,
+            n=n,
+            part_files=part_files,
+        )
+    except (RuntimeError, ValueError) as ex:
+        logging.error("run %s falhou: %s", cfg.run_name, ex)
+        _write_result(
+            out_json,
+            cfg,
+            instance_id=instance_id,
+            workdir=run_dir,
+            graph_path=graph_path,
+            status="solver_failed",
+            returncode=None,
+            elapsed_ms=0,
+            stdout="",
+            stderr=f"{ex.__class__.__name__}: {ex}",
+            part_path=None,
+            cut=None,
+        )
+        return RunArtifact(
+            run_id=f"{cfg.algo}-{int(time.time())}",
+            algo=cfg.algo,
+            status="solver_failed",
+            cut=None,
+            elapsed_ms=0,
+            part_file=None,
+        )
+
+
+def run_batch(
+    *,
+    instance_path: Path,
+    configs: Iterable[RunConfig],
+    out_dir: Path,
+    workdir: Path,
+    log_level: str = "info",
+    graph_cache: GraphCache | None = None,
+    workers: int = 1,
+    pin_cpus: bool | list[int] = False,
+    part_files: str = "keep",
+) -> list[RunArtifact]:
+    """Carrega/exporta a instância uma vez e executa todas as `configs`.
+
+    Cada config roda em `workdir/<run_name>/` (o `.graph` é ligado, não reescrito, para
+    que arquivos de partição não colidam entre runs/workers) e seu JSON vai para
+    `out_dir/<run_name>.json` assim que termina. Erros de parâmetro/ferramenta de uma
+    config viram `status="solver_failed"` sem interromper as demais.
+
+    Com `workers > 1`, as configs são distribuídas num pool de processos
+    (`hpc_framework.parallel`); `pin_cpus` fixa cada worker num núcleo. O retorno
+    segue a ordem de `configs`. `part_files="gzip"|"delete"` comprime/remove cada
+    arquivo de partição logo após o cálculo do cut.
+    """
+    _setup_logging(log_level)
+
+    inst = load_instance(instance_path)
+    shared_graph = workdir / "graph.graph"
+    _export_graph(inst.n, inst.edges, shared_graph, graph_cache)
+
+    cfg_list = list(configs)
+    tasks = [
+        (
+            cfg,
+            shared_graph,
+            workdir / cfg.run_name,
+            out_dir / f"{cfg.run_name}.json",
+            inst.instance_id,
+            inst.n,
+            part_files,
+        )
+        for cfg in cfg_list
+    ]
+    artifacts: list[RunArtifact | None] = [None] * len(tasks)
+    try:
+        for i, art in run_parallel(
+            _batch_task,
+            tasks,
+            workers=min(workers, max(len(tasks), 1)),
+            pin_cpus=pin_cpus,
+            initializer=_set_batch_edges,
+            initargs=(inst.edges,),
+        ):
+            logging.info("run %s: %s (cut=%s)", cfg_list[i].run_name, art.status, art.cut)
+            artifacts[i] = art
+    finally:
+        _set_batch_edges(None)  # modo serial publica no próprio processo
+    return [a for a in artifacts if a is not None]
+
+
 def run_one(**kwargs):
     """Backcompat: alias para `run` (mantém assinatura esperada pelos testes/CLI)."""
     return run(**kwargs)
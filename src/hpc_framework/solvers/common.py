@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import gzip
 import shutil
 import subprocess
 import time
@@ -28,36 +29,193 @@ def ensure_tool(name: str) -> bool:
     return shutil.which(name) is not None
 
 
-def write_metis_graph(path: Path, n: int, edges: np.ndarray) -> None:
-    """Escreve grafo no formato METIS (1-based)."""
+METIS_CHUNK_TOKENS = 1 << 20  # nº aproximado de inteiros formatados por bloco de escrita
+
+
+def build_csr(
+    n: int, edges: np.ndarray, edge_weights: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """Monta a adjacência simétrica em CSR (xadj, adjncy[, adjwgt]) sem laços Python.
+
+    Self-loops são descartados; arestas paralelas (inclusive (u,v) e (v,u)) viram uma só,
+    com pesos somados. Vizinhos de cada vértice ficam em ordem crescente (0-based).
+    """
+    if edges.ndim != 2 or edges.shape[1] != 2:
+        raise ValueError("edges must be an (m,2) array")
+    u = np.asarray(edges[:, 0], dtype=np.int64)
+    v = np.asarray(edges[:, 1], dtype=np.int64)
+    if u.size and (min(int(u.min()), int(v.min())) < 0 or max(int(u.max()), int(v.max())) >= n):
+        raise ValueError("edges referenciam vértices fora de [0, n)")
+    keep = u != v
+    u, v = u[keep], v[keep]
+
+    src = np.concatenate((u, v))
+    dst = np.concatenate((v, u))
+    key = src * n + dst
+    # ordenação + máscara de vizinhos iguais (dedup) — mais barato que np.unique
+    if edge_weights is None:
+        key = np.sort(key)
+        order = None
+    else:
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+    first = np.ones(key.size, dtype=bool)
+    first[1:] = key[1:] != key[:-1]
+    adjwgt = None
+    if order is not None:
+        w = np.asarray(edge_weights, dtype=np.int64)[keep]
+        w = np.concatenate((w, w))[order]
+        adjwgt = np.add.reduceat(w, np.flatnonzero(first)) if key.size else w
+    key = key[first]
+
+    src, adjncy = np.divmod(key, n) if n else (key, key)
+    xadj = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=xadj[1:])
+    return xadj, adjncy, adjwgt
+
+
+def _metis_rows(
+    xadj: np.ndarray,
+    adjncy: np.ndarray,
+    adjwgt: np.ndarray | None,
+    vwgt: np.ndarray | None,
+    chunk_tokens: int,
+):
+    """Gera o corpo do arquivo METIS em blocos de texto (um `%` por bloco de linhas)."""
+    n = xadj.size - 1
+    deg = np.diff(xadj).tolist()
+    pair = "%d %d" if adjwgt is not None else "%d"
+    templates: dict[int, str] = {}
+    start = 0
+    while start < n:
+        # avança linhas até ~chunk_tokens inteiros (sempre ao menos uma linha)
+        stop = int(np.searchsorted(xadj, xadj[start] + chunk_tokens, side="right"))
+        stop = min(max(stop - 1, start + 1), n)
+        a, b = int(xadj[start]), int(xadj[stop])
+
+        cols: list[np.ndarray] = [adjncy[a:b] + 1]
+        if adjwgt is not None:
+            cols.append(adjwgt[a:b])
+        nbrs = np.column_stack(cols).ravel() if len(cols) > 1 else cols[0]
+
+        rows = []
+        for d in deg[start:stop]:
+            t = templates.get(d)
+            if t is None:
+                t = templates[d] = " ".join([pair] * d)
+            rows.append(t)
+        if vwgt is not None:
+            # peso do vértice abre cada linha: intercala-o antes do bloco de vizinhos
+            rows = [("%d " + t) if t else "%d" for t in rows]
+            step = 2 if adjwgt is not None else 1
+            at = (xadj[start:stop] - a) * step + np.arange(stop - start)
+            tokens = np.empty(nbrs.size + at.size, dtype=np.int64)
+            mask = np.zeros(tokens.size, dtype=bool)
+            mask[at] = True
+            tokens[at] = vwgt[start:stop]
+            tokens[~mask] = nbrs
+            flat = tokens.tolist()
+        else:
+            flat = nbrs.tolist()
+        yield ("\n".join(rows) % tuple(flat)) + "\n"
+        start = stop
+
+
+def write_metis_graph(
+    path: Path,
+    n: int,
+    edges: np.ndarray,
+    *,
+    vertex_weights: np.ndarray | None = None,
+    edge_weights: np.ndarray | None = None,
+    chunk_tokens: int = METIS_CHUNK_TOKENS,
+) -> None:
+    """Escreve grafo no formato METIS (1-based) a partir de CSR vetorizado.
+
+    Sem pesos, o arquivo é o clássico `n m` + vizinhos ordenados por linha. Com
+    `vertex_weights` (n,) e/ou `edge_weights` (alinhado a `edges`), o cabeçalho ganha
+    o campo `fmt` (`010`, `001` ou `011`) e as linhas seguem o layout do manual do METIS.
+    """
     assert edges.ndim == 2 and edges.shape[1] == 2
-    adj: list[list[int]] = [[] for _ in range(n)]
-    for u, v in map(tuple, edges.tolist()):
-        if u == v:
-            continue
-        adj[u].append(v)
-        adj[v].append(u)
+    xadj, adjncy, adjwgt = build_csr(n, edges, edge_weights)
+    m = int(adjncy.size // 2)
+    vwgt = None if vertex_weights is None else np.asarray(vertex_weights, dtype=np.int64)
+    if vwgt is not None and vwgt.shape != (n,):
+        raise ValueError("vertex_weights must have shape (n,)")
 
+    fmt = f"0{int(vwgt is not None)}{int(adjwgt is not None)}"
+    header = f"{n} {m}" if fmt == "000" else f"{n} {m} {fmt}"
     with path.open("w", encoding="utf-8") as f:
-        m = int(sum(len(lst) for lst in adj) // 2)
-        f.write(f"{n} {m}\n")
-        for lst in adj:
-            # 1-based (sem gerador desnecessário)
-            lst_uniq = sorted({x + 1 for x in lst})
-            if lst_uniq:
-                f.write(" ".join(str(x) for x in lst_uniq))
-            f.write("\n")
-
-
-def read_partition_labels(path: Path) -> np.ndarray:
-    """Lê rótulos inteiros (uma linha por vértice)."""
-    labels: list[int] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            s = line.strip()
-            if s:
-                labels.append(int(s))
-    return np.asarray(labels, dtype=np.int64)
+        f.write(header + "\n")
+        f.writelines(_metis_rows(xadj, adjncy, adjwgt, vwgt, chunk_tokens))
+
+
+# Destino do arquivo de partição após a leitura (economia de disco em sweeps grandes)
+PART_FILE_MODES = ("keep", "delete", "gzip")
+
+
+def _parse_label_buffer(buf: np.ndarray) -> np.ndarray:
+    """Converte um buffer ASCII de inteiros não-negativos (um por linha) em int32."""
+    is_digit = (buf >= 48) & (buf <= 57)
+    if not np.all(is_digit | (buf == 10) | (buf == 13) | (buf == 32) | (buf == 9)):
+        raise ValueError("partition file contains non-numeric characters")
+    idx = np.flatnonzero(is_digit)
+    if idx.size == 0:
+        return np.zeros(0, dtype=np.int32)
+    first = np.empty(idx.size, dtype=bool)
+    first[0] = True
+    first[1:] = idx[1:] != idx[:-1] + 1
+    run_start = np.flatnonzero(first)
+    if run_start.size == idx.size:
+        # caso comum (k ≤ 10): um dígito por linha
+        return (buf[idx] - 48).astype(np.int32)
+    run_end = np.append(run_start[1:], idx.size)
+    exp = np.repeat(run_end, np.diff(np.append(run_start, idx.size))) - np.arange(idx.size) - 1
+    if int(exp.max()) > 9:
+        raise ValueError("partition label too large for int32")
+    vals = np.add.reduceat((buf[idx] - 48).astype(np.int64) * (10**exp), run_start)
+    if int(vals.max()) > np.iinfo(np.int32).max:
+        raise ValueError("partition label too large for int32")
+    return vals.astype(np.int32)
+
+
+def dispose_partition_file(path: Path, mode: str = "keep") -> Path | None:
+    """Aplica `mode` ao arquivo de partição e devolve onde ele ficou.
+
+    `keep` não mexe; `delete` remove (retorna None); `gzip` grava `<path>.gz` e remove
+    o original. Arquivos já `.gz` não são recomprimidos.
+    """
+    if mode not in PART_FILE_MODES:
+        raise ValueError(f"part file mode must be one of {PART_FILE_MODES}")
+    if mode == "keep":
+        return path
+    if mode == "delete":
+        path.unlink(missing_ok=True)
+        return None
+    if path.suffix == ".gz":
+        return path
+    gz_path = path.with_name(path.name + ".gz")
+    with path.open("rb") as src, gzip.open(gz_path, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
+    path.unlink()
+    return gz_path
+
+
+def read_partition_labels(path: Path, n: int | None = None, *, after: str = "keep") -> np.ndarray:
+    """Lê rótulos inteiros (uma linha por vértice) de `.part.k`/`.ka.part` em int32.
+
+    O arquivo inteiro é lido de uma vez e convertido sem laço Python; `.gz` é aceito.
+    Com `n`, o número de rótulos é validado (ValueError se divergir). `after` aplica
+    `dispose_partition_file` depois da leitura bem-sucedida.
+    """
+    if after not in PART_FILE_MODES:
+        raise ValueError(f"part file mode must be one of {PART_FILE_MODES}")
+    data = gzip.decompress(path.read_bytes()) if path.suffix == ".gz" else path.read_bytes()
+    labels = _parse_label_buffer(np.frombuffer(data, dtype=np.uint8))
+    if n is not None and labels.size != n:
+        raise ValueError(f"{path}: expected {n} labels, got {labels.size}")
+    dispose_partition_file(path, after)
+    return labels
 
 
 def beta_to_metis_ufactor(beta: float) -> int:
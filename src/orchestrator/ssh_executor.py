@@ -1,5 +1,6 @@
 # src/orchestrator/ssh_executor.py
 import logging
+import shlex
 from pathlib import Path
 
 from fabric import Connection
@@ -27,14 +28,25 @@ def execute_remote_experiment(params: dict) -> bool:
     connect_kwargs = {"key_filename": key_path}
 
     # Constrói o comando CLI a partir dos parâmetros
-    command_cli = (
-        f"python -m src.heuristics.cli "
-        f"--instance {params['instance_path']} "
-        f"--heuristic {params['heuristic']} "
-        f"--budget {params['budget']} "
-        f"--output {params['output_path']} "
-        f"--seed {params['seed']}"
-    )
+    if params.get("nfe_levels"):
+        # orçamentos aninhados: `heuristics.sa|ga` roda no maior nível e grava
+        # `<out_dir>/nfe<N>/` para cada um
+        command_cli = (
+            f"python -m heuristics.{params['heuristic']} "
+            f"--instance {shlex.quote(str(params['instance_path']))} "
+            f"--out-dir {shlex.quote(str(params['out_dir']))} "
+            f"--seeds {int(params['seed'])} "
+            "--nfe-levels " + " ".join(str(int(b)) for b in params["nfe_levels"])
+        )
+    else:
+        command_cli = (
+            f"python -m src.heuristics.cli "
+            f"--instance {params['instance_path']} "
+            f"--heuristic {params['heuristic']} "
+            f"--budget {params['budget']} "
+            f"--output {params['output_path']} "
+            f"--seed {params['seed']}"
+        )
 
     # Envolve o comando CLI com o poetry
     full_command = f"{REMOTE_POETRY_PATH} run {command_cli}"
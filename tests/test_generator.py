@@ -10,9 +10,13 @@ from jsonschema import validate
 
 sys.path.insert(0, str(Path(__file__).parents[1]))
 
+import src.generator.cli as gen_cli
 from src.generator.cli import (
+    _iter_instance_json,
+    build_edge_list,
     build_graph,
     generate_velocities,
+    random_tree_wilson,
     save_instance,
 )
 
@@ -127,3 +131,127 @@ def test_reproducibility_with_seed(tmp_path):
 
     assert out1.read_text() == out2.read_text()
     assert out1.read_text() != out3.read_text()
+
+
+@pytest.mark.parametrize("n_edges", [0, 1, 23])
+def test_streaming_json_is_byte_identical_to_json_dump(n_edges):
+    """O writer em streaming reproduz exatamente json.dump(indent=2), inclusive entre blocos."""
+    rng = np.random.default_rng(7)
+    n = 11
+    velocities = generate_velocities(rng, n, 0.2)
+    positions = rng.uniform(0.0, 1000.0, (n, 2))
+    edges = np.sort(rng.integers(0, n, (n_edges, 2)), axis=1)
+    header = {"schema_version": "1.1", "epsilon": 50.0, "instance_metrics": {"modularity": None}}
+
+    expected = json.dumps(
+        {
+            **header,
+            "nodes": [
+                {"id": i, "velocity": float(velocities[i]), "pos": positions[i].tolist()}
+                for i in range(n)
+            ],
+            "edges": edges.tolist(),
+        },
+        indent=2,
+    )
+    got = "".join(_iter_instance_json(header, edges, velocities, positions, chunk_rows=4))
+    assert got == expected
+
+
+def test_wilson_tree_is_spanning_and_uniform_on_k4():
+    """Wilson em K_4: árvore geradora válida, reprodutível e ~uniforme nas 16 árvores."""
+    n = 200
+    edges = random_tree_wilson(np.random.default_rng(11), n)
+    assert edges.shape == (n - 1, 2) and np.all(edges[:, 0] < edges[:, 1])
+    assert nx.is_tree(nx.Graph(edges.tolist()))
+    assert np.array_equal(edges, random_tree_wilson(np.random.default_rng(11), n))
+
+    rng = np.random.default_rng(12)
+    counts: dict[bytes, int] = {}
+    draws = 3200
+    for _ in range(draws):
+        key = random_tree_wilson(rng, 4).tobytes()
+        counts[key] = counts.get(key, 0) + 1
+    assert len(counts) == 16  # Cayley: 4^(4-2)
+    expected = draws / 16
+    chi2 = sum((c - expected) ** 2 / expected for c in counts.values())
+    assert chi2 < 37.7  # quantil 0.999 de χ² com 15 g.l.
+
+
+def test_sparse_mode_builds_exact_simple_connected_graph(monkeypatch):
+    """Modo 'sparse' (sem máscara O(n²)): m exato, sem duplicatas, árvore preservada."""
+    monkeypatch.setattr(gen_cli, "SPARSE_PAIRS_MIN", 0)
+    n, density = 3000, 0.002
+    edges = build_edge_list(np.random.default_rng(5), n, density, verbose=False)
+
+    assert gen_cli._TELEMETRY.density_mode == "sparse"
+    assert edges.shape[0] == int(density * (n * (n - 1) // 2))
+    assert np.all(edges[:, 0] < edges[:, 1])
+    keys = edges[:, 0] * n + edges[:, 1]
+    assert np.all(np.diff(keys) > 0)  # ordenadas e sem duplicatas
+    tree = gen_cli.random_tree_wilson(np.random.default_rng(5), n)
+    assert np.isin(tree[:, 0] * n + tree[:, 1], keys).all()
+
+
+@pytest.mark.parametrize("density", [0.5, 0.97])
+def test_complement_mode_keeps_tree_and_exact_density(density):
+    """Modo 'complement': sorteia as ausentes sem tocar a árvore de Wilson."""
+    n = 400
+    edges = build_edge_list(np.random.default_rng(9), n, density, verbose=False)
+
+    assert gen_cli._TELEMETRY.density_mode == "complement"
+    assert edges.shape[0] == int(density * (n * (n - 1) // 2))
+    keys = edges[:, 0] * n + edges[:, 1]
+    assert np.all(edges[:, 0] < edges[:, 1]) and np.all(np.diff(keys) > 0)
+    tree = gen_cli.random_tree_wilson(np.random.default_rng(9), n)
+    assert np.isin(tree[:, 0] * n + tree[:, 1], keys).all()
+
+
+def _validation_case(n: int, density: float, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    edges = build_edge_list(rng, n, density, verbose=False)
+    vel = generate_velocities(rng, n, 0.2)
+    params = {
+        "nodes_requested": n,
+        "density_requested": density,
+        "cv_vel_requested": 0.2,
+        "seed": seed,
+        "epsilon": 50.0,
+    }
+    header = gen_cli._instance_header(edges, vel, None, params)
+    pos = rng.uniform(gen_cli.POS_MIN, gen_cli.POS_MAX, (n, 2))
+    return header, edges, vel, pos
+
+
+def _verdicts(header, edges, vel, pos) -> tuple[bool, bool]:
+    out = []
+    for mode in ("full", "fast"):
+        try:
+            gen_cli._validate_instance(header, edges, vel, pos, SCHEMA, mode)
+            out.append(True)
+        except gen_cli.ValidationError:
+            out.append(False)
+    return tuple(out)
+
+
+@pytest.mark.parametrize("density", [0.02, 0.3, 0.7])
+def test_fast_validation_agrees_with_full(density):
+    header, edges, vel, pos = _validation_case(80, density)
+    assert _verdicts(header, edges, vel, pos) == (True, True)
+
+    dup = np.vstack([edges, edges[-1:]])
+    neg = edges.copy()
+    neg[0, 0] = -1
+    slow = vel.copy()
+    slow[5] = 1.0
+    far = pos.copy()
+    far[3, 1] = 2e3
+    bad_header = {**header, "epsilon": -1.0}
+    assert _verdicts(header, dup, vel, pos) == (False, False)
+    assert _verdicts(header, neg, vel, pos) == (False, False)
+    assert _verdicts(header, edges, slow, pos) == (False, False)
+    assert _verdicts(header, edges, vel, far) == (False, False)
+    assert _verdicts(bad_header, edges, vel, pos) == (False, False)
+    # fast é mais estrito: exige a forma canônica que o gerador sempre produz
+    assert _verdicts(header, edges[::-1], vel, pos) == (True, False)
+    gen_cli._validate_instance(header, dup, vel, pos, SCHEMA, "off")
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import numpy as np
+
+from generator.batch import format_summary, generate_batch, instance_seeds, load_manifest
+from generator.cli import generate_instance
+from hpc_framework.instance_io import read_json_document
+
+MANIFEST = """
+epsilon: 50.0
+seed: 7
+instances:
+  - filename: "seeded.json"
+    params: { nodes: 40, density: 0.1, cv_vel: 0.1, seed: 101 }
+  - filename: "derived.json"
+    params: { nodes: 30, density: 0.2, cv_vel: 0.2 }
+  - filename: "bad.json"
+    params: { nodes: 1, density: 0.2, cv_vel: 0.2 }
+"""
+
+
+def test_generate_batch_parallel_summary_and_seeds(tmp_path: Path):
+    (tmp_path / "m.yaml").write_text(MANIFEST)
+    specs, master_seed = load_manifest(tmp_path / "m.yaml")
+    assert master_seed == 7 and specs[0].epsilon == 50.0
+
+    rows = generate_batch(specs, tmp_path / "out", workers=2, master_seed=master_seed)
+    assert [r["status"] for r in rows] == ["ok", "ok", "failed"]
+    assert all(r["peak_rss_mb"] > 0 and r["seconds"] >= 0 for r in rows)
+    assert "seeded.json" in format_summary(rows)
+
+    # seed explícita == `instance-generator --seed 101`; sem seed == filho da semente-mestre
+    seeds = instance_seeds(specs, master_seed)
+    generate_instance(
+        nodes=40, density=0.1, cv_vel=0.1, epsilon=50.0, output=tmp_path / "ref.json", seed=101
+    )
+    assert (tmp_path / "ref.json").read_bytes() == (tmp_path / "out" / "seeded.json").read_bytes()
+    generate_instance(
+        nodes=30, density=0.2, cv_vel=0.2, epsilon=50.0, output=tmp_path / "d.json", seed=seeds[1]
+    )
+    derived = read_json_document(tmp_path / "out" / "derived.json")
+    assert np.array_equal(derived["edges"], read_json_document(tmp_path / "d.json")["edges"])
+    # proveniência: semente-mestre + spawn_key bastam para refazer a instância derivada
+    metrics = derived["instance_metrics"]
+    assert metrics["seed"] == 7 and metrics["seed_spawn_key"] == [1]
+    generate_instance(
+        nodes=30,
+        density=0.2,
+        cv_vel=0.2,
+        epsilon=50.0,
+        output=tmp_path / "r.json",
+        seed=np.random.SeedSequence(metrics["seed"], spawn_key=metrics["seed_spawn_key"]),
+    )
+    assert (tmp_path / "r.json").read_bytes() == (tmp_path / "out" / "derived.json").read_bytes()
+
+    again = generate_batch(specs[:2], tmp_path / "out", workers=2, master_seed=master_seed)
+    assert [r["status"] for r in again] == ["skipped", "skipped"]
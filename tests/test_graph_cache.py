@@ -0,0 +1,38 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+from hpc_framework.graph_cache import GraphCache, graph_key
+from hpc_framework.solvers.common import write_metis_graph
+
+
+def _ring(n: int) -> np.ndarray:
+    return np.array([[i, (i + 1) % n] for i in range(n)], dtype=np.int64)
+
+
+def test_cache_reuses_export_across_workdirs(tmp_path: Path):
+    cache = GraphCache(tmp_path / "cache")
+    edges = _ring(12)
+    a = cache.materialize(12, edges, tmp_path / "w1" / "graph.graph")
+    b = cache.materialize(12, edges.astype(np.int32), tmp_path / "w2" / "graph.graph")
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    ref = tmp_path / "ref.graph"
+    write_metis_graph(ref, 12, edges)
+    assert a.read_bytes() == b.read_bytes() == ref.read_bytes()
+    assert graph_key(12, edges) != graph_key(13, edges)
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = GraphCache(tmp_path / "cache", max_bytes=10**9)
+    for i, n in enumerate((20, 30, 40)):
+        cache.materialize(n, _ring(n), tmp_path / f"w{n}" / "graph.graph")
+        os.utime(cache.path_for(graph_key(n, _ring(n))), (i, i))
+
+    sizes = {n: cache.path_for(graph_key(n, _ring(n))).stat().st_size for n in (20, 30, 40)}
+    cache.max_bytes = sizes[30] + sizes[40]
+    removed = cache.evict()
+    assert removed == [cache.path_for(graph_key(20, _ring(20)))]
+    # o link no workdir sobrevive ao despejo
+    assert (tmp_path / "w20" / "graph.graph").exists()
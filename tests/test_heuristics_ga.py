@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from generator.cli import build_edge_list
+from heuristics import ga
+from heuristics.budgets import get_budget, hyperparam_grid, load_budgets
+from heuristics.greedy import run_greedy_csr
+from heuristics.objectives import energy, evaluate_solutions
+from heuristics.results import split_by_budget, write_budget_results, write_results
+from hpc_framework.solvers.common import build_csr
+
+
+@pytest.fixture(scope="module")
+def graph():
+    rng = np.random.default_rng(2)
+    n = 300
+    edges = build_edge_list(rng, n, 0.03, verbose=False)
+    vel = rng.uniform(0.0, 16.0, n)  # faixa larga: a gulosa deixa espaço para melhora
+    indptr, indices, _ = build_csr(n, edges)
+    return indptr, indices, vel
+
+
+def test_operators_keep_partitions_feasible():
+    L = np.array([[0, 0, 3, 3, 3], [4, 1, 1, 4, 0]])
+    np.testing.assert_array_equal(ga._compact(L, 5), [[0, 0, 1, 1, 1], [2, 1, 1, 2, 0]])
+
+    rng = np.random.default_rng(0)
+    n = 200
+    vel = rng.uniform(0, 16, n)
+    indptr = np.arange(n + 1) * 2
+    indices = np.column_stack(((np.arange(n) - 1) % n, (np.arange(n) + 1) % n)).ravel()
+    pop = np.stack(
+        [run_greedy_csr(indptr, indices, vel, 2.5, rng.permutation(n)) for _ in range(8)]
+    )
+    for _ in range(20):
+        ga._mutate(pop, vel, indptr, indices, rng, 0.3, 5.0)
+        ev = evaluate_solutions(pop, vel)
+        assert ev.feasible.all()
+
+
+def test_nfe_accounting_reproducibility_and_improvement(graph):
+    indptr, indices, vel = graph
+    params = ga.GAParams(pop_size=20, cx_prob=0.8, mut_prob=0.1, elitism=2)
+    res = ga.run_ga(indptr, indices, vel, params, 3, nfe_budget=1010)
+    again = ga.run_ga(indptr, indices, vel, params, 3, nfe_budget=1010)
+
+    # 20 iniciais + 55 gerações de 18 filhos = 1010
+    assert res.nfe == 1010 and res.generations == 55 and res.status == "ok"
+    np.testing.assert_array_equal(res.labels, again.labels)
+    ev = evaluate_solutions(res.labels, vel)
+    assert ev.feasible[0]
+    assert res.objectives == pytest.approx((ev.f1[0], ev.f2[0], ev.f3[0]))
+    assert res.energy == pytest.approx(energy(ev.f1, ev.f2, ev.f3, vel.size)[0])
+
+    init = ga.run_ga(indptr, indices, vel, params, 3, nfe_budget=params.pop_size)
+    assert init.generations == 0 and res.energy < init.energy
+
+
+def test_time_cap_grid_and_output(graph, tmp_path: Path):
+    indptr, indices, vel = graph
+    res = ga.run_ga(indptr, indices, vel, ga.GAParams(pop_size=10), 0, time_cap_s=0.0)
+    assert res.status == "timeout" and res.nfe == 10 and res.generations == 0
+
+    grid = hyperparam_grid(load_budgets(), "ga")
+    assert len(grid) == 16 and set(grid[0]) == {"pop_size", "cx_prob", "mut_prob", "elitism"}
+    (out,) = write_results([res], tmp_path, instance_id="toy")
+    data = json.loads(out.read_text())
+    assert data["algo"] == "ga" and data["generations"] == 0 and data["nfe"] == 10
+    assert out.stem == "ga_p10_cx0.8_m0.1_e1_s0"
+
+
+def test_one_run_materializes_every_budget_level(graph, tmp_path: Path):
+    indptr, indices, vel = graph
+    params, levels = ga.GAParams(pop_size=20, elitism=1), [100, 333, 600]
+    full = ga.run_ga(indptr, indices, vel, params, 5, nfe_budget=600, checkpoints=levels[:2])
+    for level in levels[:2]:
+        alone = ga.run_ga(indptr, indices, vel, params, 5, nfe_budget=level)
+        (cp,) = [c for c in full.checkpoints if c.nfe == level]
+        np.testing.assert_array_equal(cp.labels, alone.labels)
+        assert cp.energy == alone.energy and cp.stats == {"generations": alone.generations}
+
+    budget = get_budget(load_budgets(), "small")
+    paths = write_budget_results([full], tmp_path, levels, instance_id="toy", budget=budget)
+    recs = [json.loads(p.read_text()) for p in paths]
+    assert [(r["budget"], r["budget_nfe"], r["nfe"]) for r in recs] == [
+        (f"nfe{lv}", lv, lv) for lv in levels
+    ]
+    assert [p.parent.name for p in paths] == ["nfe100", "nfe333", "nfe600"]
+
+    late = ga.run_ga(indptr, indices, vel, params, 5, time_cap_s=0.0, checkpoints=[500])
+    assert split_by_budget(late, [500])[500].status == "timeout"
+    with pytest.raises(ValueError):
+        split_by_budget(full, [250])
@@ -0,0 +1,57 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from generator.cli import build_edge_list, generate_velocities
+from heuristics.greedy import (
+    labels_to_clusters,
+    run_greedy_arrays,
+    run_greedy_csr,
+    run_greedy_heuristic,
+    run_greedy_restarts,
+)
+from hpc_framework.solvers.common import build_csr
+
+
+@pytest.mark.parametrize(("n", "density", "delta_v"), [(300, 0.02, 1.0), (400, 0.1, 2.0)])
+def test_csr_engine_matches_networkx_engine(n, density, delta_v):
+    rng = np.random.default_rng(n)
+    edges = build_edge_list(rng, n, density, verbose=False)
+    vel = generate_velocities(rng, n, 0.2)
+    G = nx.Graph()
+    G.add_nodes_from((i, {"velocity": v}) for i, v in enumerate(vel.tolist()))
+    G.add_edges_from(edges.tolist())
+
+    expected, order = run_greedy_heuristic(G, delta_v, rng=5, return_order=True)
+    assert order == np.random.default_rng(5).permutation(n).tolist()
+
+    labels = run_greedy_arrays(n, edges, vel, delta_v, np.array(order))
+    assert labels.min() == 0 and labels.max() == len(expected) - 1
+    assert labels_to_clusters(labels) == expected
+
+
+def test_csr_engine_respects_seed_window():
+    # caminho 0-1-2-3: 2 difere de 0 por mais que Δv, então bloqueia a expansão
+    edges = np.array([[0, 1], [1, 2], [2, 3]])
+    vel = np.array([10.0, 10.5, 12.0, 10.0])
+    assert run_greedy_arrays(4, edges, vel, 1.0).tolist() == [0, 0, 1, 2]
+    assert run_greedy_arrays(4, edges, vel, 1.0, np.array([2, 0, 1, 3])).tolist() == [1, 1, 0, 2]
+
+
+def test_restarts_are_reproducible_and_keep_the_best():
+    rng = np.random.default_rng(0)
+    n = 500
+    edges = build_edge_list(rng, n, 0.01, verbose=False)
+    vel = generate_velocities(rng, n, 0.3)
+    indptr, indices, _ = build_csr(n, edges)
+
+    res = run_greedy_restarts(indptr, indices, vel, 1.0, restarts=8, rng=42)
+    again = run_greedy_restarts(indptr, indices, vel, 1.0, restarts=8, rng=42)
+    np.testing.assert_array_equal(res.labels, again.labels)
+    np.testing.assert_array_equal(res.scores, again.scores)
+
+    assert res.score == res.scores.min() == res.labels.max() + 1
+    assert res.restart == int(np.argmin(res.scores))
+    np.testing.assert_array_equal(res.labels, run_greedy_csr(indptr, indices, vel, 1.0, res.order))
+    first = run_greedy_restarts(indptr, indices, vel, 1.0, rng=42)
+    assert first.scores[0] == res.scores[0]
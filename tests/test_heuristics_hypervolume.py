@@ -0,0 +1,97 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from heuristics import hypervolume as hv
+from heuristics.objectives import evaluate_solutions
+
+
+def _brute(P, ref):
+    """HV por decomposição em células da grade das coordenadas (exato, exponencial em d)."""
+    P = P[np.all(ref > P, axis=1)]
+    if not len(P):
+        return 0.0
+    axes = [np.unique(np.r_[P[:, k], ref[k]]) for k in range(P.shape[1])]
+    total = 0.0
+    for idx in itertools.product(*(range(len(a) - 1) for a in axes)):
+        lo = np.array([a[i] for a, i in zip(axes, idx, strict=True)])
+        hi = np.array([a[i + 1] for a, i in zip(axes, idx, strict=True)])
+        if np.any(np.all(lo >= P, axis=1)):
+            total += np.prod(hi - lo)
+    return total
+
+
+@pytest.mark.parametrize("d", [2, 3, 4])
+def test_exact_against_brute_force_with_ties(d):
+    rng = np.random.default_rng(d)
+    ref = np.full(d, 1.1)
+    for _ in range(25):
+        P = rng.integers(0, 5, (int(rng.integers(1, 8)), d)) / 4.0  # empates e pontos em ref
+        total = _brute(P, ref)
+        assert hv.hypervolume(P, ref) == pytest.approx(total, abs=1e-12)
+        excl = [total - _brute(np.delete(P, i, axis=0), ref) for i in range(len(P))]
+        np.testing.assert_allclose(hv.contributions(P, ref), excl, atol=1e-12)
+
+
+def test_batch_matches_per_front():
+    rng = np.random.default_rng(7)
+    F = rng.random((3000, 3)) * 1.2
+    ids = rng.integers(0, 200, 3000)
+    got = hv.hypervolume_batch(F, ids, num_fronts=203)
+    want = [hv.hypervolume(F[ids == k]) for k in range(203)]
+    np.testing.assert_allclose(got, want, rtol=0, atol=1e-12)
+    assert got[200:].tolist() == [0.0, 0.0, 0.0]
+
+    F2 = rng.random((400, 2))
+    ids2 = rng.integers(0, 30, 400)
+    want2 = [hv.hypervolume(F2[ids2 == k], (1.1, 1.1)) for k in range(30)]
+    np.testing.assert_allclose(hv.hypervolume_batch(F2, ids2, (1.1, 1.1)), want2, atol=1e-12)
+
+
+@pytest.mark.parametrize("d", [2, 3])
+def test_sweep_contributions_match_removal(d):
+    rng = np.random.default_rng(11 + d)
+    ref = np.full(d, 1.1)
+    for grid in (True, False):  # empates/dominados na grade; frente quase toda não dominada
+        if grid:
+            P = rng.integers(0, 6, (150, d)) / 5.0
+        else:
+            u = rng.random((150, d - 1))
+            P = np.column_stack((u, 1.0 - u.sum(axis=1) / (d - 1)))
+        total = hv.hypervolume(P, ref)
+        want = [total - hv.hypervolume(np.delete(P, i, axis=0), ref) for i in range(len(P))]
+        np.testing.assert_allclose(hv.contributions(P, ref), want, atol=1e-12)
+
+
+def test_contributions_batch_matches_per_front():
+    rng = np.random.default_rng(5)
+    F = rng.integers(0, 8, (2000, 3)) / 6.0
+    ids = rng.integers(0, 60, 2000)
+    got = hv.contributions_batch(F, ids)
+    for k in range(60):
+        np.testing.assert_allclose(got[ids == k], hv.contributions(F[ids == k]), atol=1e-12)
+    F4 = rng.random((60, 4))
+    ids4 = rng.integers(0, 3, 60)
+    got4 = hv.contributions_batch(F4, ids4, np.full(4, 1.1))
+    for k in range(3):
+        want4 = hv.contributions(F4[ids4 == k], np.full(4, 1.1))
+        np.testing.assert_allclose(got4[ids4 == k], want4, atol=1e-12)
+
+
+def test_normalization_follows_bounds_json():
+    n = 50
+    lo, hi = hv.resolve_bounds(hv.load_bounds(), n)
+    np.testing.assert_allclose(lo, [-(n * 16.0), 1 / n, 0.0])
+    np.testing.assert_allclose(hi, [0.0, 1.0, 5.0])
+
+    vel = np.linspace(1.0, 15.0, n)
+    L = np.stack([np.arange(n), np.arange(n) // 5, np.zeros(n, dtype=np.int64)])
+    Fn, overflow = hv.normalize_objectives(evaluate_solutions(L, vel).objectives, n)
+    assert Fn.min() >= 0.0 and Fn.max() <= 1.0 and not overflow.any()
+    assert Fn[0, 1] == pytest.approx(1.0) and Fn[2, 1] == pytest.approx(0.0)
+
+    Fn, overflow = hv.normalize_objectives([[1.0, 0.5, 0.1]], n)  # f1 > max: truncado
+    assert overflow.tolist() == [True] and Fn[0, 0] == 1.0
+    with pytest.raises(ValueError):
+        hv.resolve_bounds({**hv.load_bounds(), "desvio_vel": {"min": "__import__", "max": 1}}, n)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from heuristics.incremental import IncrementalObjectives
+from heuristics.objectives import evaluate_solutions
+
+
+def test_deltas_match_full_evaluation_and_undo_restores_state():
+    rng = np.random.default_rng(0)
+    n = 120
+    vel = rng.uniform(8.0, 16.0, n)
+    st = IncrementalObjectives(rng.integers(0, 10, n), vel, delta_v=3.0)
+
+    for _ in range(1500):
+        i = int(rng.integers(n))
+        c = st.empty_cluster() if rng.random() < 0.05 else st.labels[int(rng.integers(n))]
+        before, feas_before = st.objectives, st.feasible
+        d = st.delta(i, c)
+        st.apply(i, c)
+        ev = evaluate_solutions(st.labels_array(), vel, delta_v=3.0)
+        assert st.objectives == pytest.approx((ev.f1[0], ev.f2[0], ev.f3[0]), abs=1e-9)
+        assert np.subtract(st.objectives, before) == pytest.approx(d[:3], abs=1e-9)
+        assert d.feasible == st.feasible == bool(ev.feasible[0])
+        if rng.random() < 0.3:
+            st.undo()
+            assert st.objectives == before and st.feasible == feas_before
+        else:
+            st.commit()
+
+
+def test_nfe_counts_initial_evaluation_and_each_delta():
+    st = IncrementalObjectives(np.array([0, 0, 1]), np.array([8.0, 9.0, 15.0]))
+    assert st.nfe == 1
+    d = st.delta(2, 0)
+    assert d.df1 == pytest.approx(-(3 * 8.0 - 2 * 8.0 - 15.0))
+    assert d.df2 == pytest.approx(-1 / 3) and not d.feasible  # 15 − 8 > Δv
+    st.apply(2, 0)
+    st.undo()
+    assert st.nfe == 2 and st.labels == [0, 0, 1]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from heuristics.objectives import evaluate_solutions
+
+
+def _reference(labels: np.ndarray, vel: np.ndarray) -> tuple[float, ...]:
+    f1, cvs, sds, spread = 0.0, [], [], 0.0
+    for c in np.unique(labels):
+        x = vel[labels == c]
+        f1 -= x.size * x.min()
+        cvs.append(x.std() / x.mean())
+        sds.append(x.std())
+        spread = max(spread, x.max() - x.min())
+    return f1, len(cvs) / vel.size, float(np.mean(cvs)), float(np.mean(sds)), spread
+
+
+def test_batch_matches_per_cluster_reference():
+    rng = np.random.default_rng(0)
+    n = 400
+    vel = rng.uniform(8.0, 16.0, n)
+    L = rng.integers(0, 40, size=(6, n))
+    L[2] = rng.integers(0, 3, size=n) * 7  # rótulos não contíguos
+
+    res = evaluate_solutions(L, vel, delta_v=7.5)
+    for i in range(L.shape[0]):
+        got = (res.f1[i], res.f2[i], res.f3[i], res.avg_std_dev[i], res.max_spread[i])
+        assert got == pytest.approx(_reference(L[i], vel))
+    assert res.objectives.shape == (6, 3)
+    assert res.feasible.tolist() == (res.max_spread <= 7.5).tolist()
+
+
+def test_single_solution_and_singletons():
+    vel = np.array([8.0, 9.0, 14.0, 15.0])
+    res = evaluate_solutions(np.arange(4), vel)
+    assert res.f1.tolist() == [-46.0] and res.f2.tolist() == [1.0]
+    assert res.f3.tolist() == [0.0] and res.feasible.tolist() == [True]
+
+    res = evaluate_solutions(np.zeros(4, dtype=int), vel)
+    assert res.f1.tolist() == [-32.0] and res.num_clusters.tolist() == [1]
+    assert not res.feasible[0]  # 15 − 8 > Δv = 5
+
+    with pytest.raises(ValueError):
+        evaluate_solutions(np.array([0, 1, 2, 4]), vel)
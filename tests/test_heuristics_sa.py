@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from generator.cli import build_edge_list, generate_velocities
+from heuristics import sa
+from heuristics.budgets import get_budget, hyperparam_grid, load_budgets
+from heuristics.objectives import evaluate_solutions
+from heuristics.results import split_by_budget, write_results
+from hpc_framework.solvers.common import build_csr, read_partition_labels
+
+
+@pytest.fixture(scope="module")
+def graph():
+    rng = np.random.default_rng(1)
+    n = 300
+    edges = build_edge_list(rng, n, 0.03, verbose=False)
+    vel = generate_velocities(rng, n, 0.3)
+    indptr, indices, _ = build_csr(n, edges)
+    return indptr, indices, vel
+
+
+def test_budgets_yaml_drives_grid_and_limits():
+    spec = load_budgets()
+    small = get_budget(spec, "small")
+    assert (small.nfe_limit, small.time_limit_s) == (5000, 30)
+    assert get_budget(spec, "large").time_limit_s == 300 and get_budget(spec).name == "medium"
+    grid = hyperparam_grid(spec, "sa")
+    assert len(grid) == 18 and grid[0] == {"T0": 1.0, "alpha": 0.9, "iters_per_T": 100}
+
+
+def test_chains_are_independent_of_batching_and_respect_budget(graph):
+    indptr, indices, vel = graph
+    configs = [sa.SAParams(1.0, 0.9, 100), sa.SAParams(10.0, 0.99, 300)]
+    batch = sa.run_sa(indptr, indices, vel, configs, [0, 1], nfe_budget=3000)
+    alone = sa.run_sa(indptr, indices, vel, configs[1:], [1], nfe_budget=3000)[0]
+
+    assert [(r.params, r.seed) for r in batch] == [(c, s) for c in configs for s in (0, 1)]
+    np.testing.assert_array_equal(batch[3].labels, alone.labels)
+    init = evaluate_solutions(np.arange(vel.size), vel)
+    init_energy = sa.energy(init.f1, init.f2, init.f3, vel.size)[0]
+    for r in batch:
+        ev = evaluate_solutions(r.labels, vel)
+        assert ev.feasible[0] and r.nfe == 3000 and r.status == "ok"
+        assert r.objectives == pytest.approx((ev.f1[0], ev.f2[0], ev.f3[0]))
+        assert r.energy < init_energy
+
+
+def test_time_cap_and_runner_compatible_output(graph, tmp_path: Path):
+    indptr, indices, vel = graph
+    res = sa.run_sa(indptr, indices, vel, [sa.SAParams()], [7], time_cap_s=0.0)
+    assert res[0].status == "timeout" and res[0].nfe == 1
+
+    res = sa.run_sa(indptr, indices, vel, [sa.SAParams()], [7], nfe_budget=500)
+    budget = get_budget(load_budgets(), "small")
+    (out,) = write_results(res, tmp_path, instance_id="toy", budget=budget)
+    data = json.loads(out.read_text())
+    for key in ("instance_id", "algo", "seed", "status", "elapsed_ms", "part_path"):
+        assert key in data
+    assert data["algo"] == "sa" and data["budget_time_ms"] == 30000 and data["nfe"] == 500
+    labels = read_partition_labels(Path(data["part_path"]), n=vel.size)
+    np.testing.assert_array_equal(labels, res[0].labels)
+
+
+def test_checkpoints_match_separate_runs_at_each_budget(graph):
+    indptr, indices, vel = graph
+    cfg, levels = [sa.SAParams(5.0, 0.95, 100)], [300, 1000, 2500]
+    (full,) = sa.run_sa(indptr, indices, vel, cfg, [4], nfe_budget=2500, checkpoints=levels)
+    split = split_by_budget(full, levels)
+    for level in levels:
+        (alone,) = sa.run_sa(indptr, indices, vel, cfg, [4], nfe_budget=level)
+        got = split[level]
+        np.testing.assert_array_equal(got.labels, alone.labels)
+        assert (got.nfe, got.accepted, got.energy) == (alone.nfe, alone.accepted, alone.energy)
+        assert got.objectives == pytest.approx(alone.objectives) and got.checkpoints == []
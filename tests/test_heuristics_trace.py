@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from generator.cli import build_edge_list
+from heuristics import ga, sa
+from heuristics.budgets import get_budget, load_budgets
+from heuristics.objectives import energy
+from heuristics.trace import TRACE_DTYPE, TraceRecorder, read_trace
+from hpc_framework.solvers.common import build_csr
+
+
+def test_buffer_growth_rate_limit_and_partial_file(tmp_path):
+    path = tmp_path / "run.trace"
+    rec = TraceRecorder(path, capacity=2, min_interval_s=3600.0)
+    for nfe in range(1, 6):
+        rec.record(nfe, -float(nfe), 0.5, 0.1)
+    rec.record(6, np.array([-7.0, -8.0]), 0.4, 0.1, chain=np.array([1, 2]))
+    assert path.stat().st_size == 0  # dentro do intervalo: nada vai a disco
+    assert rec.to_array()["nfe"].tolist() == [1, 2, 3, 4, 5, 6, 6]
+    rec.close()
+
+    tr = read_trace(path)
+    assert tr.dtype == TRACE_DTYPE and tr["chain"].tolist() == [0] * 5 + [1, 2]
+    assert np.all(np.diff(tr["elapsed_s"]) >= 0)
+    with path.open("ab") as f:  # registro truncado (run interrompido) é ignorado
+        f.write(b"\0" * 5)
+    assert read_trace(path).size == 7
+
+    spec = load_budgets()
+    small = TraceRecorder.from_budget(None, spec, get_budget(spec, "small"))
+    assert (small.min_interval_s, small.checkpoint_every_nfe) == (0.25, 100)
+    small.record(1, -1.0, 1.0, 0.0)
+    small.record(150, -2.0, 0.5, 0.0)
+    small.flush()
+    assert small.to_array()["nfe"].tolist() == [1, 150]
+
+
+@pytest.fixture(scope="module")
+def graph():
+    rng = np.random.default_rng(3)
+    n = 200
+    edges = build_edge_list(rng, n, 0.04, verbose=False)
+    vel = rng.uniform(0.0, 16.0, n)
+    indptr, indices, _ = build_csr(n, edges)
+    return indptr, indices, vel
+
+
+def test_traces_end_at_the_reported_best(graph, tmp_path):
+    indptr, indices, vel = graph
+    n = vel.size
+    with TraceRecorder(tmp_path / "sa.trace", min_interval_s=0.0) as rec:
+        res = sa.run_sa(
+            indptr,
+            indices,
+            vel,
+            [sa.SAParams(), sa.SAParams(5.0)],
+            [0, 1],
+            nfe_budget=2000,
+            trace=rec,
+        )
+    tr = read_trace(tmp_path / "sa.trace")
+    for b, r in enumerate(res):
+        t = tr[tr["chain"] == b]
+        E = energy(t["f1"], t["f2"], t["f3"], n)
+        assert t["nfe"][0] == 1 and np.all(np.diff(E) < 0) and np.all(np.diff(t["nfe"]) >= 0)
+        assert (t["f1"][-1], t["f2"][-1], t["f3"][-1]) == pytest.approx(r.objectives)
+
+    rec = TraceRecorder()
+    r = ga.run_ga(
+        indptr, indices, vel, ga.GAParams(20), 0, nfe_budget=500, trace=rec, trace_chain=4
+    )
+    t = rec.to_array()
+    assert t["nfe"][0] == 20 and set(t["chain"]) == {4}
+    assert (t["f1"][-1], t["f2"][-1], t["f3"][-1]) == pytest.approx(r.objectives)
+
+
+def test_restarted_nfe_still_flushes_each_run(graph, tmp_path):
+    path = tmp_path / "runs.trace"
+    rec = TraceRecorder(path, min_interval_s=0.0, checkpoint_every_nfe=100)
+    for run in range(2):  # dois runs em sequência, NFE recomeçando em 1
+        rec.begin_run()
+        for nfe in range(1, 401, 50):
+            rec.record(nfe, -float(nfe), 0.5, 0.1, chain=run)
+        assert read_trace(path)["chain"].tolist().count(run) > 0  # flush antes de `close`
+
+    indptr, indices, vel = graph
+    path = tmp_path / "ga.trace"
+    with TraceRecorder(path, min_interval_s=0.0, checkpoint_every_nfe=20) as rec:
+        for idx in range(2):
+            ga.run_ga(
+                indptr,
+                indices,
+                vel,
+                ga.GAParams(20),
+                idx,
+                nfe_budget=2000,
+                trace=rec,
+                trace_chain=idx,
+            )
+            assert idx in read_trace(path)["chain"]
@@ -0,0 +1,128 @@
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from generator.cli import _save_instance_core, build_edge_list, generate_velocities
+from hpc_framework.instance_io import read_bundle, read_json_document, read_json_stream
+from hpc_framework.runner import load_instance
+
+
+def _params(n: int, seed: int) -> dict:
+    return {
+        "nodes_requested": n,
+        "density_requested": 0.2,
+        "cv_vel_requested": 0.2,
+        "seed": seed,
+        "epsilon": 50.0,
+    }
+
+
+def _generate(tmp_path: Path, name: str, n: int = 40, seed: int = 7, **kw) -> Path:
+    rng = np.random.default_rng(seed)
+    edges = build_edge_list(rng, n, 0.2, verbose=False)
+    vel = generate_velocities(rng, n, 0.2)
+    out = tmp_path / name
+    _save_instance_core(edges, vel, out, rng, None, _params(n, seed), **kw)
+    return out
+
+
+def test_bundle_roundtrip_matches_json(tmp_path: Path):
+    bundle = _generate(tmp_path, "inst.npyd", export_json=tmp_path / "inst.json.gz")
+    inst = read_bundle(bundle)
+    assert isinstance(inst.edges, np.memmap)
+    assert inst.edges.dtype == np.int32
+
+    with gzip.open(tmp_path / "inst.json.gz", "rt", encoding="utf-8") as f:
+        doc = json.load(f)
+    np.testing.assert_array_equal(inst.edges, np.asarray(doc["edges"]))
+    np.testing.assert_array_equal(inst.velocities, [nd["velocity"] for nd in doc["nodes"]])
+    np.testing.assert_array_equal(inst.positions, [nd["pos"] for nd in doc["nodes"]])
+    assert inst.header["instance_metrics"] == doc["instance_metrics"]
+
+
+def test_runner_loads_bundle_and_generator_json(tmp_path: Path):
+    bundle = _generate(tmp_path, "a.npyd")
+    js = _generate(tmp_path, "a.json")
+    a, b = load_instance(bundle), load_instance(js)
+    assert a.n == b.n == 40
+    np.testing.assert_array_equal(a.edges, b.edges)
+
+
+def test_bundle_without_header_is_rejected(tmp_path: Path):
+    bundle = _generate(tmp_path, "b.npyd")
+    (bundle / "header.json").unlink()
+    with pytest.raises(FileNotFoundError):
+        read_bundle(bundle)
+
+
+@pytest.mark.parametrize("chunk_bytes", [7, 64, 1 << 20])
+def test_json_stream_matches_full_parse(tmp_path: Path, chunk_bytes: int):
+    path = _generate(tmp_path, "s.json.gz", n=60)
+    doc = read_json_document(path)
+
+    inst = read_json_stream(path, need_nodes=True, chunk_bytes=chunk_bytes)
+    assert inst.n == 60 and inst.edges.dtype == np.int64
+    np.testing.assert_array_equal(inst.edges, np.asarray(doc["edges"]))
+    np.testing.assert_array_equal(inst.velocities, [nd["velocity"] for nd in doc["nodes"]])
+    assert inst.header["instance_metrics"] == doc["instance_metrics"]
+
+    lean = read_json_stream(path, need_nodes=False, chunk_bytes=chunk_bytes)
+    assert lean.velocities is None and lean.positions is None
+    np.testing.assert_array_equal(lean.edges, inst.edges)
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 2, 3, 7])
+def test_json_stream_small_chunks_match_json_load(tmp_path: Path, chunk_bytes: int):
+    # blocos minúsculos cortam números do cabeçalho (ex.: "epsilon": 50.0) no meio
+    path = _generate(tmp_path, "c.json", n=30)
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    compact = tmp_path / "compact.json"
+    compact.write_text(json.dumps(doc, separators=(",", ":")), encoding="utf-8")
+    edges_first = tmp_path / "edges_first.json"
+    reordered = {"edges": doc["edges"], **{k: v for k, v in doc.items() if k != "edges"}}
+    edges_first.write_text(json.dumps(reordered), encoding="utf-8")
+
+    for p in (path, compact, edges_first):
+        inst = read_json_stream(p, chunk_bytes=chunk_bytes)
+        assert inst.header == {k: v for k, v in doc.items() if k not in ("nodes", "edges")}
+        np.testing.assert_array_equal(inst.edges, np.asarray(doc["edges"]))
+        np.testing.assert_array_equal(inst.velocities, [nd["velocity"] for nd in doc["nodes"]])
+        np.testing.assert_array_equal(inst.positions, [nd["pos"] for nd in doc["nodes"]])
+
+
+def test_json_stream_handles_unusual_layouts(tmp_path: Path):
+    path = tmp_path / "odd.json"
+    doc = {
+        "edges": [[0, 1], [1, 12345678901]],
+        "nodes": [{"id": 1, "velocity": 9.0, "tag": 'a]"}\\'}, {"id": 0, "velocity": 8.5}],
+        "instance_id": "odd",
+        "num_nodes": 2,
+    }
+    path.write_text(json.dumps(doc, separators=(",", ":")), encoding="utf-8")
+    inst = read_json_stream(path, chunk_bytes=5)
+    assert inst.n == 2 and inst.instance_id == "odd"
+    np.testing.assert_array_equal(inst.edges, [[0, 1], [1, 12345678901]])
+    np.testing.assert_array_equal(inst.velocities, [8.5, 9.0])
+
+    path.write_text('{"num_nodes": 2, "edges": [[0, -1]]}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_json_stream(path)
+
+
+@pytest.mark.parametrize(
+    "edges",
+    ["[[0,1,2,3]]", "[0,1,[2,3]]", "[[0],[1,2],[3]]", "[[0,1],[2,3],]", "[[0 1]]", "[[0,1][2,3]]"],
+)
+@pytest.mark.parametrize("chunk_bytes", [1, 4, 1 << 20])
+def test_json_stream_rejects_non_pair_edges(tmp_path: Path, edges: str, chunk_bytes: int):
+    path = tmp_path / "bad.json"
+    path.write_text(f'{{"num_nodes": 4, "edges": {edges}}}', encoding="utf-8")
+    with pytest.raises(ValueError, match=r"\(m,2\)"):
+        read_json_stream(path, chunk_bytes=chunk_bytes)
+    path.write_text('{"num_nodes": 4, "edges": [ [0, 1] ,\n [2,3] ]}', encoding="utf-8")
+    np.testing.assert_array_equal(
+        read_json_stream(path, chunk_bytes=chunk_bytes).edges, [[0, 1], [2, 3]]
+    )
@@ -0,0 +1,54 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+import generator.cli as gen_cli
+from generator.modularity import louvain, modularity, modularity_contributions
+
+
+def _nx_modularity(n: int, edges: np.ndarray, labels: np.ndarray) -> float:
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from(edges.tolist())
+    comms: dict[int, set[int]] = {}
+    for i, lab in enumerate(labels.tolist()):
+        comms.setdefault(lab, set()).add(i)
+    return nx.community.modularity(G, comms.values())
+
+
+@pytest.mark.parametrize("k", [1, 2, 16])
+def test_modularity_matches_networkx(k):
+    rng = np.random.default_rng(k)
+    edges = gen_cli.build_edge_list(rng, 200, 0.08, verbose=False)
+    labels = rng.integers(0, k, size=200)
+    labels[labels == k - 1] = k + 2  # rótulo vazio no meio contribui 0
+
+    q = modularity(edges, labels)
+    contrib = modularity_contributions(edges, labels)
+    assert q == pytest.approx(_nx_modularity(200, edges, labels), abs=1e-12)
+    assert contrib.shape == (labels.max() + 1,) and contrib.sum() == pytest.approx(q)
+    assert contrib[k - 1] == 0.0
+    assert modularity(np.zeros((0, 2), dtype=np.int64), labels) == 0.0
+
+
+def test_louvain_recovers_planted_partition():
+    G = nx.planted_partition_graph(8, 50, 0.3, 0.005, seed=3)
+    edges = np.array(sorted(tuple(sorted(e)) for e in G.edges()))
+    q, labels, truncated = louvain(400, edges)
+
+    assert not truncated and labels.shape == (400,)
+    assert q == pytest.approx(_nx_modularity(400, edges, labels), abs=1e-9)
+    truth = np.repeat(np.arange(8), 50)
+    assert q >= _nx_modularity(400, edges, truth) - 0.01
+
+
+def test_compute_modularity_tags_and_budget(monkeypatch):
+    rng = np.random.default_rng(0)
+    edges = gen_cli.build_edge_list(rng, 300, 0.05, verbose=False)
+
+    assert gen_cli._compute_modularity(edges, 300)[1] == "cnm"
+    monkeypatch.setattr(gen_cli, "MOD_GREEDY_EDGE_LIMIT_ABS", 0)  # força "acima do gate"
+    q, tag = gen_cli._compute_modularity(edges, 300)
+    assert tag == "louvain" and 0.0 < q < 1.0
+    assert gen_cli._compute_modularity(edges, 300, budget_s=0) == (None, None)
+    assert gen_cli._compute_modularity(edges, 300, budget_s=1e-9)[1] == "louvain-truncated"
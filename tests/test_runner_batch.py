@@ -0,0 +1,130 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hpc_framework import runner
+from hpc_framework.cli import main
+from hpc_framework.solvers.common import SolverRun
+
+
+def _toy_instance(tmp_path: Path, n: int = 8) -> Path:
+    p = tmp_path / "toy.json"
+    edges = [[i, i + 1] for i in range(n - 1)]
+    p.write_text(json.dumps({"instance_id": "toy", "num_nodes": n, "edges": edges}))
+    return p
+
+
+def _fake_gpmetis(graph_path: Path, k: int, beta: float, seed: int, timeout_s: float):
+    """Substituto do gpmetis: particiona em blocos contíguos e grava `.part.k`."""
+    n = int(graph_path.read_text().split()[0])
+    part = Path(f"{graph_path}.part.{k}")
+    part.write_text("".join(f"{i * k // n}\n" for i in range(n)))
+    return SolverRun("ok", part, 0, f"seed={seed}", "", 1)
+
+
+def test_run_batch_exports_once_and_writes_each_result(tmp_path: Path, monkeypatch):
+    calls = []
+    real_write = runner.write_metis_graph
+    monkeypatch.setattr(
+        runner, "write_metis_graph", lambda *a, **kw: calls.append(a) or real_write(*a, **kw)
+    )
+    monkeypatch.setattr(runner, "run_gpmetis", _fake_gpmetis)
+
+    configs = [runner.RunConfig("metis", k, 0.03, s, 1000) for k in (2, 4) for s in (1, 2)]
+    configs.append(runner.RunConfig("bogus", 2, 0.03, 1, 1000))
+    arts = runner.run_batch(
+        instance_path=_toy_instance(tmp_path),
+        configs=configs,
+        out_dir=tmp_path / "out",
+        workdir=tmp_path / "work",
+    )
+
+    assert len(calls) == 1
+    assert [a.status for a in arts] == ["ok"] * 4 + ["solver_failed"]
+    assert [a.cut for a in arts[:4]] == [1, 1, 3, 3]
+    parts = {a.part_file for a in arts[:4]}
+    assert len(parts) == 4  # cada config no seu subdiretório
+    outs = sorted((tmp_path / "out").glob("*.json"))
+    assert len(outs) == 5
+    data = json.loads((tmp_path / "out" / f"{configs[0].run_name}.json").read_text())
+    assert data["cutsize_best"] == 1 and data["instance_id"] == "toy"
+    # caminho 0..7 em 2 blocos: Q = 6/7 − 2·(7/14)² = 5/14
+    assert data["modularity"] == pytest.approx(5 / 14)
+
+
+def test_cli_batch_grid(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.setattr(runner, "run_gpmetis", _fake_gpmetis)
+    main(
+        [
+            "batch",
+            "--instance",
+            str(_toy_instance(tmp_path)),
+            "--out-dir",
+            str(tmp_path / "out"),
+            "--workdir",
+            str(tmp_path / "work"),
+            "--k",
+            "2",
+            "4",
+            "--beta",
+            "0.03",
+            "--seed",
+            "1",
+            "2",
+            "3",
+            "--budget-time-ms",
+            "500",
+        ]
+    )
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 6
+    assert all(json.loads(x)["status"] == "ok" for x in lines)
+    assert np.unique([json.loads(x)["cut"] for x in lines]).tolist() == [1, 3]
+
+
+def _fake_gpmetis_affinity(graph_path: Path, k: int, beta: float, seed: int, timeout_s: float):
+    res = _fake_gpmetis(graph_path, k, beta, seed, timeout_s)
+    res.stdout = json.dumps({"cpus": sorted(os.sched_getaffinity(0)), "pid": os.getpid()})
+    return res
+
+
+def test_run_batch_parallel_pinned_workers(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(runner, "run_gpmetis", _fake_gpmetis_affinity)
+    configs = [runner.RunConfig("metis", 2, 0.03, s, 1000) for s in range(6)]
+    arts = runner.run_batch(
+        instance_path=_toy_instance(tmp_path),
+        configs=configs,
+        out_dir=tmp_path / "out",
+        workdir=tmp_path / "work",
+        workers=2,
+        pin_cpus=True,
+    )
+    assert [a.status for a in arts] == ["ok"] * 6
+    assert all(a.cut == 1 for a in arts)
+    pids = set()
+    for cfg in configs:
+        rec = json.loads((tmp_path / "out" / f"{cfg.run_name}.json").read_text())
+        info = json.loads(rec["stdout"])
+        assert len(info["cpus"]) == 1
+        pids.add(info["pid"])
+        assert rec["workdir"].endswith(cfg.run_name)
+    assert os.getpid() not in pids
+
+
+def test_run_batch_gzips_partition_files(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(runner, "run_gpmetis", _fake_gpmetis)
+    cfg = runner.RunConfig("metis", 2, 0.03, 0, 1000)
+    (art,) = runner.run_batch(
+        instance_path=_toy_instance(tmp_path),
+        configs=[cfg],
+        out_dir=tmp_path / "out",
+        workdir=tmp_path / "work",
+        part_files="gzip",
+    )
+    assert art.cut == 1 and art.part_file is not None and art.part_file.suffix == ".gz"
+    assert not art.part_file.with_suffix("").exists()
+    rec = json.loads((tmp_path / "out" / f"{cfg.run_name}.json").read_text())
+    assert rec["part_path"] == str(art.part_file)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from hpc_framework.runner import compute_cutsize_edges_labels, evaluate_partitions, feasible_beta
+
+
+def test_evaluate_partitions_matches_single_label_helpers():
+    rng = np.random.default_rng(7)
+    n, k, beta = 60, 4, 0.1
+    edges = rng.integers(0, n, size=(400, 2))
+    labels = rng.integers(0, k, size=(9, n))
+
+    # chunk_elems pequeno força vários blocos de linhas
+    res = evaluate_partitions(edges, labels, k=k, beta=beta, chunk_elems=1000)
+
+    assert res.cutsize.tolist() == [compute_cutsize_edges_labels(edges, lab) for lab in labels]
+    for i, lab in enumerate(labels):
+        ok, info = feasible_beta(lab, k, beta)
+        assert bool(res.feasible[i]) == ok
+        assert res.counts[i].tolist() == info["counts"]
+        assert res.max_allowed == info["max_allowed"]
+    np.testing.assert_allclose(res.max_imbalance, res.counts.max(axis=1) / (n / k) - 1)
+
+
+def test_evaluate_partitions_single_vector_and_bad_labels():
+    edges = np.array([[0, 1], [1, 2], [2, 3]])
+    res = evaluate_partitions(edges, np.array([0, 0, 1, 1]))
+    assert res.cutsize.tolist() == [1] and res.feasible is None
+    assert res.counts.tolist() == [[2, 2]]
+
+    with pytest.raises(ValueError):
+        evaluate_partitions(edges, np.array([0, 0, 2, 1]), k=2)
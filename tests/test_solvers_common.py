@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hpc_framework.solvers.common import (
+    build_csr,
+    dispose_partition_file,
+    read_partition_labels,
+    write_metis_graph,
+)
+
+
+def _reference_metis_text(n: int, edges: np.ndarray) -> str:
+    """Escrita METIS ingênua (listas Python), usada como oráculo."""
+    adj: list[set[int]] = [set() for _ in range(n)]
+    for u, v in edges.tolist():
+        if u != v:
+            adj[u].add(v + 1)
+            adj[v].add(u + 1)
+    m = sum(len(s) for s in adj) // 2
+    return f"{n} {m}\n" + "".join(" ".join(map(str, sorted(s))) + "\n" for s in adj)
+
+
+@pytest.mark.parametrize("chunk_tokens", [3, 1 << 20])
+def test_write_metis_graph_matches_reference(tmp_path: Path, chunk_tokens: int):
+    rng = np.random.default_rng(5)
+    n = 40
+    edges = rng.integers(0, n, (150, 2))  # inclui laços, duplicatas e (v,u)
+    out = tmp_path / "g.graph"
+    write_metis_graph(out, n, edges, chunk_tokens=chunk_tokens)
+    assert out.read_text(encoding="utf-8") == _reference_metis_text(n, edges)
+
+
+def test_write_metis_graph_with_weights(tmp_path: Path):
+    edges = np.array([[0, 1], [1, 2], [2, 0], [1, 0]])
+    out = tmp_path / "w.graph"
+    write_metis_graph(out, 4, edges, vertex_weights=np.arange(1, 5), edge_weights=[5, 6, 7, 1])
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert lines == ["4 3 011", "1 2 6 3 7", "2 1 6 3 6", "3 1 7 2 6", "4"]
+
+
+def test_build_csr_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        build_csr(3, np.array([[0, 3]]))
+
+
+@pytest.mark.parametrize("k", [4, 300])
+def test_read_partition_labels_bulk(tmp_path: Path, k: int):
+    labels = np.random.default_rng(k).integers(0, k, size=1000)
+    p = tmp_path / "g.graph.part.4"
+    p.write_text("\n".join(map(str, labels)) + "\n\n")  # linha vazia final é tolerada
+    got = read_partition_labels(p, n=labels.size)
+    assert got.dtype == np.int32 and np.array_equal(got, labels)
+
+    with pytest.raises(ValueError, match="expected 999"):
+        read_partition_labels(p, n=999)
+    (tmp_path / "bad").write_text("0\n-1\n")
+    with pytest.raises(ValueError):
+        read_partition_labels(tmp_path / "bad")
+
+
+def test_read_partition_labels_after_modes(tmp_path: Path):
+    p = tmp_path / "g.part"
+    p.write_text("0\n1\n1\n")
+    assert read_partition_labels(p, after="gzip").tolist() == [0, 1, 1]
+    gz = tmp_path / "g.part.gz"
+    assert not p.exists() and gz.exists()
+    assert read_partition_labels(gz, n=3, after="delete").tolist() == [0, 1, 1]
+    assert not gz.exists()
+    with pytest.raises(ValueError):
+        dispose_partition_file(p, "shred")